@@ -16,6 +16,8 @@ from routes.api_fs import bp_api_fs
 from routes.api_kollus import bp_api_kollus
 from routes.api_auth import bp_api_auth  # ✅ 이거 추가
 from routes.api_todaymeta import bp_api_todaymeta
+from routes.api_export import bp_api_export
+from core.autoassign import auto_assigner
 
 def create_app() -> Flask:
     app = Flask(__name__, static_folder="static", static_url_path="")
@@ -91,6 +93,10 @@ def create_app() -> Flask:
     app.register_blueprint(bp_api_kollus)
     app.register_blueprint(bp_api_auth)
     app.register_blueprint(bp_api_todaymeta)
+    app.register_blueprint(bp_api_export)
+
+    # ✅ 오늘 자동배정 스케줄러 (KST 날짜 바뀔 때 / 입력 문서 바뀔 때)
+    auto_assigner.ensure_started()
     return app
 
 
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Tuple
 
+from core.changes import changes, diff_keys, register_doc
+from core.locks import locks
 from core.paths import ABS_PATH
-from core.storage import load, save_atomic
+from core.storage import FrozenDict, doc_signature, freeze, load, save_atomic, thaw
 
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
+# ─────────────────────────────────────────────
+# ✅ 결석 문서: 정규화는 쓸 때 한 번만
+#  - 저장은 항상 표준 포맷 + "v": ABS_FORMAT (날짜순, 빈 날짜 없음, by_date ↔ by_student 정리됨)
+#  - 읽기(load_absent)는 문서 시그니처별 정규화 뷰를 캐시 → /api/today 마다 정규식 돌지 않음
+#    (v 표시가 있으면 파일 그대로 사용, 없으면 예전처럼 한 번 정규화)
+#  - 한 명/한 날짜 결석 처리·해제는 patch_absent (문서 전체 덮어쓰기 대신)
+# ─────────────────────────────────────────────
+ABS_FORMAT = 2
+
 
 def _norm_sid_list(xs: Any) -> List[str]:
     """sid 목록을 문자열 리스트로 정규화 + 중복 제거(순서 유지)"""
@@ -52,14 +64,12 @@ def _norm_by_student(by_student: Any) -> Dict[str, str]:
     return out
 
 
-def load_absent() -> Dict[str, Any]:
+def _normalize(raw: Any) -> Dict[str, Any]:
     """
     저장 포맷 표준:
       {"by_date": {date:[sid,...]}, "by_student": {sid:date}}
     구버전(학생->날짜 단일 dict)도 자동 흡수.
     """
-    raw = load(ABS_PATH)
-
     # 표준 포맷
     if isinstance(raw, dict) and "by_date" in raw and "by_student" in raw:
         return {
@@ -77,6 +87,41 @@ def load_absent() -> Dict[str, Any]:
     return {"by_date": {}, "by_student": {}}
 
 
+def _canonical(by_date: Dict[str, List[str]], by_student: Dict[str, str]) -> Dict[str, Any]:
+    """저장용 표준 문서 (정규화된 입력 기준)"""
+    return {
+        "v": ABS_FORMAT,
+        "by_date": {d: by_date[d] for d in sorted(by_date) if by_date[d]},
+        "by_student": by_student,
+    }
+
+
+_view_mu = threading.Lock()
+_view: Tuple[Any, Any] = (None, None)  # (시그니처, 정규화 뷰)
+
+
+def load_absent() -> FrozenDict:
+    """
+    {"by_date": {date:[sid,...]}, "by_student": {sid:date}} 읽기 전용 뷰.
+    파일이 안 바뀌었으면 캐시 그대로 (수정하려면 thaw).
+    """
+    global _view
+    sig = doc_signature(ABS_PATH)
+    with _view_mu:
+        if _view[0] is not None and _view[0] == sig:
+            return _view[1]
+
+    raw = load(ABS_PATH)
+    if isinstance(raw, dict) and raw.get("v") == ABS_FORMAT:
+        view = freeze({"by_date": raw.get("by_date") or {}, "by_student": raw.get("by_student") or {}})
+    else:
+        view = freeze(_normalize(raw))
+
+    with _view_mu:
+        _view = (sig, view)
+    return view
+
+
 def save_absent(obj: Dict[str, Any]) -> None:
     """
     어떤 형태가 들어와도 표준 포맷으로 정규화해서 저장.
@@ -84,9 +129,84 @@ def save_absent(obj: Dict[str, Any]) -> None:
     if not isinstance(obj, dict):
         obj = {}
 
-    out = {
-        "by_date": _norm_by_date(obj.get("by_date")),
-        "by_student": _norm_by_student(obj.get("by_student")),
-    }
-
-    save_atomic(ABS_PATH, out)
+    out = _canonical(_norm_by_date(obj.get("by_date")), _norm_by_student(obj.get("by_student")))
+
+    with locks.exclusive(ABS_PATH):
+        # 피드에는 결석 목록이 바뀐 날짜만 (값 = 그 날짜 sid 목록, 아래 register_doc 의 read_date)
+        keys = [(d, None) for d, _ in diff_keys(load_absent()["by_date"], out["by_date"])]
+        save_atomic(ABS_PATH, out)
+    changes.record("absent", keys)
+
+
+def parse_flag(v: Any) -> bool | None:
+    """켜짐/꺼짐 값 해석 (켜짐은 dayflags.is_on 과 같은 1/true 만). 알 수 없는 값은 None"""
+    if v is True or v == 1 or str(v) in ("1", "true", "True"):
+        return True
+    if v is None or v is False or v == 0 or str(v) in ("0", "false", "False"):
+        return False
+    return None
+
+
+def _parse_absent_patch(body: Any) -> tuple:
+    """patch 한 건 검증 → ((date, sid, absent), None) / (None, 에러)"""
+    if not isinstance(body, dict):
+        return None, "bad payload"
+    date = str(body.get("date") or "").strip()
+    sid = str(body.get("sid") or "").strip()
+    if not date or not sid:
+        return None, "missing date/sid"
+    if not DATE_RE.match(date):
+        return None, "bad date"
+    absent = parse_flag(body.get("absent", True))
+    if absent is None:
+        return None, "bad absent"
+    return (date, sid, absent), None
+
+
+def patch_absent(items: List[Any]) -> Tuple[List[dict], int]:
+    """
+    한 명/한 날짜씩 결석 처리(absent=true, 기본) / 해제(absent=false).
+      - 처리: by_date[date] 에 추가 + by_student[sid] = date
+      - 해제: by_date[date] 에서 빼고, by_student[sid] 가 그 날짜였으면 남은 결석 중 가장 최근 날짜로 (없으면 삭제)
+      - absent 값을 알 수 없는 항목("false"/"0" 은 해제, 그 밖의 문자열 등)이 있으면 아무것도 안 쓰고 ValueError
+    return: (항목별 결과, 실제로 바뀐 항목 수)
+    """
+    parsed = [_parse_absent_patch(item) for item in items]
+    if any(err == "bad absent" for _, err in parsed):
+        raise ValueError("bad absent")
+
+    results: List[dict] = []
+    applied = 0
+    with locks.exclusive(ABS_PATH):
+        cur = thaw(load_absent())
+        by_date: Dict[str, List[str]] = cur["by_date"]
+        by_student: Dict[str, str] = cur["by_student"]
+        for op, err in parsed:
+            if err:
+                results.append({"ok": False, "error": err})
+                continue
+            date, sid, absent = op
+            ids = by_date.get(date) or []
+            changed = (sid not in ids) if absent else (sid in ids or by_student.get(sid) == date)
+            if changed and absent:
+                by_date[date] = ids + [sid]
+                by_student[sid] = date
+            elif changed:
+                by_date[date] = [x for x in ids if x != sid]
+                if by_student.get(sid) == date:
+                    rest = [d for d, xs in by_date.items() if sid in xs]
+                    if rest:
+                        by_student[sid] = max(rest)
+                    else:
+                        by_student.pop(sid, None)
+            applied += int(changed)
+            results.append({"ok": True, "date": date, "sid": sid, "absent": absent, "changed": changed})
+
+        if applied:
+            save_atomic(ABS_PATH, _canonical(by_date, by_student))
+    if applied:
+        changes.record("absent", sorted({(r["date"], None) for r in results if r.get("changed")}))
+    return results, applied
+
+
+register_doc("absent", load_absent, lambda d: load_absent()["by_date"].get(d))
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gzip
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from core.datestore import DATE_DOCS, DateStore, _in_range, get_store
+from core.paths import BASE
+from core.storage import FrozenDict, doc_signature, freeze, load, save_atomic, thaw, utc_now_isoz
+
+# ─────────────────────────────────────────────
+# ✅ 오래된 날짜 아카이브 (읽기 전용, 연도별 gzip)
+#  - archive/<doc>/YYYY.json.gz  : 그 해 날짜들 {date: 값} (통째로 다시 쓰기만, 부분 수정 X)
+#  - archive/<doc>/index.json    : through(여기까지 아카이브됨), years, deleted(아카이브 날짜 삭제 표시)
+#  - 읽기: 핫 저장소(json/partitioned/sqlite) 먼저, 조회 구간이 through 이전을 걸칠 때만 아카이브 열어봄
+#  - 아카이브된 날짜를 고치면 핫 쪽에 새 값이 들어가고 핫이 우선 (다음 아카이브 때 다시 내려감)
+#  - 실행(크론 등):  python -m core.archive [--days N] [doc ...]
+#    기본 대상 logs / progress / updates, 기본 기준 ARCHIVE_HORIZON_DAYS(365)일 이전
+# ─────────────────────────────────────────────
+ARCHIVE_DIR = BASE / "archive"
+ARCHIVE_HORIZON_DAYS = int(os.environ.get("ARCHIVE_HORIZON_DAYS", "365"))
+ARCHIVE_DOCS = ("logs", "progress", "updates")
+
+_DATE_KEY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _year_path(root, year: str):
+    return root / f"{year}.json.gz"
+
+
+def _stat(path) -> Tuple | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _YearCache:
+    """압축 해제한 연도 파일 캐시 (파일이 바뀌면 다시 읽음)"""
+
+    def __init__(self):
+        self._mu = threading.Lock()
+        self._views: Dict[str, Tuple[Tuple, FrozenDict]] = {}
+
+    def get(self, path) -> FrozenDict:
+        key = os.fspath(path)
+        sig = _stat(key)
+        if sig is None:
+            return FrozenDict()
+        with self._mu:
+            hit = self._views.get(key)
+            if hit is not None and hit[0] == sig:
+                return hit[1]
+        with gzip.open(key, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        view = freeze(data) if isinstance(data, dict) else FrozenDict()
+        with self._mu:
+            self._views[key] = (sig, view)
+        return view
+
+
+_years = _YearCache()
+
+
+def _write_year(path, obj: Dict[str, Any]) -> int:
+    tmp = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+class ArchivedDateStore(DateStore):
+    """핫 저장소 + 읽기 전용 연도 아카이브 (인덱스가 없으면 그냥 통과)"""
+
+    def __init__(self, hot: DateStore, root):
+        self.name = hot.name
+        self.hot = hot
+        self.root = root
+        self.index_path = root / "index.json"
+        self._mu = threading.Lock()
+        self._all_sig = None
+        self._all_view: FrozenDict | None = None
+
+    # ── 인덱스 ───────────────────────────────
+    def _index(self) -> dict:
+        idx = load(self.index_path)
+        return idx if isinstance(idx, dict) else {}
+
+    def _through(self, idx: dict) -> str:
+        return str(idx.get("through") or "")
+
+    def _archived(self, idx: dict, date: str) -> bool:
+        through = self._through(idx)
+        return bool(through) and bool(_DATE_KEY_RE.match(date)) and date <= through and \
+            date[:4] in (idx.get("years") or {})
+
+    def _year(self, idx: dict, year: str) -> Dict[str, Any]:
+        """아카이브 연도 값 (삭제 표시된 날짜 제외)"""
+        if year not in (idx.get("years") or {}):
+            return {}
+        view = _years.get(_year_path(self.root, year))
+        deleted = set(idx.get("deleted") or ())
+        if not deleted:
+            return view
+        return {d: v for d, v in view.items() if d not in deleted}
+
+    def _archive_range(self, idx: dict, start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+        through = self._through(idx)
+        if not through or (start and start > through):
+            return {}
+        out: Dict[str, Any] = {}
+        for year in sorted(idx.get("years") or {}):
+            if (start and year < start[:4]) or (end and year > end[:4]):
+                continue
+            for d, v in self._year(idx, year).items():
+                if _in_range(d, start, end):
+                    out[d] = v
+        return out
+
+    # ── 읽기 ─────────────────────────────────
+    def signature(self) -> Any:
+        return (self.hot.signature(), doc_signature(self.index_path))
+
+    def read_all(self) -> FrozenDict:
+        idx = self._index()
+        if not self._through(idx):
+            return self.hot.read_all()
+        sig = self.signature()
+        with self._mu:
+            if self._all_view is not None and sig == self._all_sig:
+                return self._all_view
+        merged = self._archive_range(idx, None, None)
+        merged.update(self.hot.read_all())
+        view = FrozenDict(merged)
+        with self._mu:
+            self._all_sig = sig
+            self._all_view = view
+        return view
+
+    def read_date(self, date: str) -> Any:
+        v = self.hot.read_date(date)
+        if v is not None:
+            return v
+        idx = self._index()
+        if not self._archived(idx, date):
+            return None
+        return self._year(idx, date[:4]).get(date)
+
+    def read_range(self, start: Optional[str], end: Optional[str]) -> FrozenDict:
+        hot = self.hot.read_range(start, end)
+        old = self._archive_range(self._index(), start, end)
+        if not old:
+            return hot
+        old.update(hot)
+        return FrozenDict(old)
+
+    def read_student(self, sid: str, start: Optional[str] = None, end: Optional[str] = None) -> FrozenDict:
+        hot = self.hot.read_student(sid, start, end)
+        old = self._archive_range(self._index(), start, end)
+        if not old:
+            return hot
+        sid = str(sid)
+        out: Dict[str, Any] = {}
+        for d, day in old.items():
+            if isinstance(day, dict) and sid in day:
+                out[d] = FrozenDict({sid: day[sid]})
+        out.update(hot)
+        return FrozenDict(out)
+
+    # ── 쓰기 (아카이브 파일은 안 건드림: 새 값은 핫으로, 삭제는 인덱스 표시) ──
+    def _save_deleted(self, idx: dict, deleted: Set[str]) -> None:
+        if deleted == set(idx.get("deleted") or ()):
+            return
+        idx = dict(thaw(idx))
+        idx["deleted"] = sorted(deleted)
+        idx["updatedAt"] = utc_now_isoz()
+        save_atomic(self.index_path, idx)
+
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        with self.lock():
+            idx = self._index()
+            deleted = set(idx.get("deleted") or ())
+            for d, v in days.items():
+                if v is None and self._archived(idx, d):
+                    deleted.add(d)
+            self._save_deleted(idx, deleted)
+            return self.hot.write_dates(days)
+
+    def replace_all(self, obj: Any) -> None:
+        obj = obj if isinstance(obj, dict) else {}
+        with self.lock():
+            idx = self._index()
+            if not self._through(idx):
+                self.hot.replace_all(obj)
+                return
+            old = self._archive_range(idx, None, None)
+            cur_hot = self.hot.read_all()
+            # 아카이브 값 그대로인 옛 날짜는 핫으로 다시 올리지 않음
+            hot = {d: v for d, v in obj.items() if d in cur_hot or d not in old or old[d] != v}
+            deleted = set(idx.get("deleted") or ())
+            deleted |= {d for d in old if d not in obj}
+            deleted -= set(obj)
+            self._save_deleted(idx, deleted)
+            self.hot.replace_all(hot)
+
+
+# ─────────────────────────────────────────────
+# 아카이브 실행: 기준일 이전 날짜를 핫 → 연도 파일로 이동
+#  (아카이브 파일/인덱스 먼저 쓰고 핫에서 삭제 → 중간에 죽어도 핫 값이 우선이라 데이터 안 잃음)
+# ─────────────────────────────────────────────
+def archive_old(name: str, horizon_days: int = ARCHIVE_HORIZON_DAYS) -> int:
+    store = get_store(name)
+    if not isinstance(store, ArchivedDateStore):
+        raise SystemExit(f"{name}: archive 미사용 저장소")
+    through = (dt.date.today() - dt.timedelta(days=max(0, horizon_days) + 1)).isoformat()
+
+    with store.lock():
+        old = {
+            d: v for d, v in store.hot.read_range(None, through).items()
+            if _DATE_KEY_RE.match(d)
+        }
+        idx = dict(thaw(store._index()))
+        if not old and store._through(idx) >= through:
+            return 0
+
+        store.root.mkdir(parents=True, exist_ok=True)
+        years = dict(idx.get("years") or {})
+        deleted = set(idx.get("deleted") or ())
+        by_year: Dict[str, Dict[str, Any]] = {}
+        for d, v in old.items():
+            by_year.setdefault(d[:4], {})[d] = v
+
+        for year, days in sorted(by_year.items()):
+            merged = dict(thaw(store._year(idx, year)))
+            merged.update(thaw(days))
+            deleted -= {d for d in deleted if d[:4] == year}  # 다시 쓰는 연도는 삭제 표시를 실제로 반영
+            merged = dict(sorted(merged.items()))
+            years[year] = {"dates": len(merged), "bytes": _write_year(_year_path(store.root, year), merged)}
+
+        idx.update({
+            "doc": name,
+            "through": max(store._through(idx), through),
+            "years": {y: years[y] for y in sorted(years)},
+            "deleted": sorted(deleted),
+            "updatedAt": utc_now_isoz(),
+        })
+        save_atomic(store.index_path, idx)
+        if old:
+            store.hot.write_dates({d: None for d in old}).result()
+    return len(old)
+
+
+def archive_stats() -> dict:
+    out = {}
+    for name in DATE_DOCS:
+        idx = load(ARCHIVE_DIR / name / "index.json")
+        if isinstance(idx, dict) and idx.get("through"):
+            out[name] = {
+                "through": idx["through"],
+                "years": idx.get("years") or {},
+                "deleted": len(idx.get("deleted") or ()),
+            }
+    return out
+
+
+def _main(argv: Iterable[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m core.archive")
+    ap.add_argument("--days", type=int, default=ARCHIVE_HORIZON_DAYS, help="이 일수보다 오래된 날짜를 아카이브")
+    ap.add_argument("docs", nargs="*", default=list(ARCHIVE_DOCS))
+    args = ap.parse_args(argv)
+
+    for name in args.docs:
+        if name not in DATE_DOCS:
+            raise SystemExit(f"unknown doc: {name} (choices: {', '.join(DATE_DOCS)})")
+        n = archive_old(name, args.days)
+        print(f"[ARCHIVE] {name}: {n} dates → {ARCHIVE_DIR / name}")
+
+
+if __name__ == "__main__":
+    _main()
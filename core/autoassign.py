@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from core.changes import changes
+from core.datestore import get_store
+from core.locks import locks
+from core.paths import STU_PATH, VID_PATH
+from core.progressview import latest_progress
+from core.storage import doc_signature, load, thaw
+from core.videoindex import VideoIndex, video_index
+
+# ─────────────────────────────────────────────
+# ✅ updates 오늘 자동배정 (백그라운드 스케줄러)
+#  - 예전엔 하루 첫 GET /api/updates 가 요청 안에서 전 학생 배정 + 저장 → 이제 GET 은 읽기만
+#  - 실행 시점: 프로세스 시작 / KST 날짜 바뀔 때 / students·videos·progress·updates 쓰기 직후(poke)
+#    + AUTOASSIGN_POLL_SEC 마다 입력 시그니처 확인 (다른 워커 쓰기, 파일 직접 수정 대비)
+#  - 입력 (오늘, students, videos, progress, updates) 시그니처가 그대로면 아무것도 안 함
+#  - 오늘 날짜만 updates 락 안에서 다시 읽고 고쳐 씀 → 몇 번을 돌아도 결과 같음
+#  - 워커(프로세스)가 여럿이어도 실제 실행은 하나만: locks.try_claim(LEADER_LOCK) 잡은 프로세스
+#    (나머지는 매 주기 다시 시도 → 주인 프로세스가 죽으면 넘겨받음)
+#  - GET /api/updates 는 기다리지 않음: 지금 데이터를 주고 스케줄러만 깨움
+# ─────────────────────────────────────────────
+AUTOASSIGN_POLL_SEC = float(os.environ.get("AUTOASSIGN_POLL_SEC", "30"))
+LEADER_LOCK = "auto-assign.leader"
+
+# ✅ 서버 날짜가 UTC로 돌아서 프론트(todayLocalKey)랑 하루 어긋나는 거 방지용
+KST = dt.timezone(dt.timedelta(hours=9))
+
+
+def today_kst_iso() -> str:
+    return dt.datetime.now(KST).date().isoformat()
+
+
+def _has_assigned(val) -> bool:
+    if isinstance(val, list):
+        return len(val) > 0
+    if isinstance(val, dict):
+        vids = val.get("videos")
+        return isinstance(vids, list) and len(vids) > 0
+    return False
+
+
+def _normalize_assigned(val):
+    """
+    updates[today][sid] 에 들어있는 값 정규화:
+      - list[str] 형태로 통일
+      - dict(구형) 이면 videos 키 뽑기
+    """
+    if isinstance(val, list):
+        arr = [str(x).strip() for x in val if str(x).strip()]
+        return arr
+    if isinstance(val, dict):
+        vids = val.get("videos")
+        if isinstance(vids, list):
+            arr = [str(x).strip() for x in vids if str(x).strip()]
+            return arr
+    return []
+
+
+def fix_today(
+    day: Any, students, vindex: VideoIndex, last_status, progress_sig: Any = None,
+) -> Tuple[Dict[str, Any], int, int]:
+    """
+    오늘 하루 배정 {sid: [mid...]} 보정.
+    vindex: core.videoindex 커리큘럼 인덱스
+    last_status: {sid: {mid: state}} 최신 진도 (core.progressview.latest_progress)
+    progress_sig: last_status 를 읽기 전 진도 문서 시그니처 (학생별 커서 키, None 이면 커서 안 씀)
+    return: (새 배정, 정리된 학생 수, 새로 배정한 학생 수)
+    """
+    day = dict(day) if isinstance(day, dict) else {}
+    valid_mids = vindex.valid
+    last_status = last_status if isinstance(last_status, dict) else {}
+    cleaned_n = picked_n = 0
+
+    # ✅ 1) 이미 들어있는 오늘 배정부터 "유효 mid만" 남기기 (이게 재발 방지 핵심)
+    for sid, cur in list(day.items()):
+        assigned = _normalize_assigned(cur)
+        if not assigned:
+            continue
+
+        # 존재하는 mid만 남김
+        cleaned = [mid for mid in assigned if mid in valid_mids]
+        if cleaned != assigned:
+            if cleaned:
+                day[sid] = cleaned
+            else:
+                # 다 날아가면 배정 자체 제거(아래 자동배정이 다시 채울 수 있음)
+                day.pop(sid, None)
+            cleaned_n += 1
+
+    # ✅ 2) 이제 자동배정(배정 없을 때만)
+    for stu in students or []:
+        if not isinstance(stu, dict):
+            continue
+
+        sid = str(stu.get("id") or "").strip()
+        if not sid:
+            continue
+
+        cur_key = (stu.get("curriculum") or "").strip()
+        sub_key = (stu.get("subCurriculum") or "").strip()
+
+        # 이미 오늘 배정 있으면 스킵
+        if _has_assigned(day.get(sid)):
+            continue
+
+        # 자동배정 개수
+        sub_norm = sub_key.strip().lower()
+        if sub_norm == "A:ble":
+            max_assign = 1
+        elif sub_norm == "APEX":
+            max_assign = 2
+        else:
+            max_assign = 2
+
+        # 현재 커리/서브커리 챕터순 목록에서 done/skip 아닌 앞쪽 영상 (인덱스 + 학생별 커서)
+        picked = video_index.pick(
+            vindex, sid, cur_key, sub_key, last_status.get(sid) or {}, max_assign, progress_sig=progress_sig,
+        )
+
+        if picked:
+            print("[AUTOASSIGN] PICK sid =", sid, "picked =", picked, flush=True)
+            day[sid] = picked
+            picked_n += 1
+
+    return day, cleaned_n, picked_n
+
+
+class AutoAssigner:
+    def __init__(self):
+        self.store = get_store("updates")
+        self._mu = threading.Lock()
+        self._run_mu = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._version = None  # 마지막 실행 후 입력 시그니처
+        self._pending_reason = "change"
+        self.done_date: str | None = None
+        self._leader = False
+        self._stats = {"runs": 0, "writes": 0, "skipped": 0, "last": None}
+
+    def _inputs(self, today: str) -> tuple:
+        return (
+            today, doc_signature(STU_PATH), doc_signature(VID_PATH),
+            get_store("progress").signature(), self.store.signature(),
+        )
+
+    # ── 실행 (멱등) ───────────────────────────
+    def run(self, reason: str = "manual") -> bool:
+        """오늘 배정 보정. return: updates 를 고쳐 썼는지"""
+        with self._run_mu:
+            today = today_kst_iso()
+            if self._inputs(today) == self._version:
+                with self._mu:
+                    self._stats["skipped"] += 1
+                return False
+
+            t0 = time.perf_counter()
+            with self.store.lock():
+                cur = self.store.read_date(today)
+                progress_sig = get_store("progress").signature()  # 최신 진도보다 먼저 → 커서가 더 새 진도에 붙지 않게
+                fixed, cleaned_n, picked_n = fix_today(
+                    cur, load(STU_PATH), video_index.get(), latest_progress.get(), progress_sig,
+                )
+                wrote = fixed != (thaw(cur) if isinstance(cur, dict) else {})
+                if wrote:
+                    fut = changes.record_after(self.store.write_dates({today: fixed}), "updates", [today])
+            if wrote:
+                fut.result()
+            version = self._inputs(today)
+
+            ms = round((time.perf_counter() - t0) * 1000, 1)
+            if wrote or self.done_date != today:
+                print(
+                    f"[AUTOASSIGN] run date={today} reason={reason} picked={picked_n} cleaned={cleaned_n} "
+                    f"wrote={wrote} ms={ms}",
+                    flush=True,
+                )
+            with self._mu:
+                self._version = version
+                self.done_date = today
+                self._stats["runs"] += 1
+                self._stats["writes"] += int(wrote)
+                self._stats["last"] = {"date": today, "reason": reason, "picked": picked_n, "cleaned": cleaned_n, "ms": ms}
+            return wrote
+
+    # ── 스케줄러 ─────────────────────────────
+    def ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._mu:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            t = threading.Thread(target=self._loop, name="auto-assign", daemon=True)
+            self._thread = t
+            t.start()
+
+    def poke(self, reason: str = "change") -> None:
+        """입력 문서가 바뀜 → 스케줄러가 곧 다시 확인"""
+        self._pending_reason = reason
+        self._wake.set()
+        self.ensure_started()
+
+    def nudge(self) -> None:
+        """읽기 경로용: 오늘 실행이 아직이면 스케줄러만 깨우고 바로 리턴 (쓰기를 기다리지 않음)"""
+        if self.done_date != today_kst_iso():
+            self.poke("read")
+
+    def _seconds_to_rollover(self) -> float:
+        now = dt.datetime.now(KST)
+        nxt = dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time(0, 0, 1), KST)
+        return max(1.0, (nxt - now).total_seconds())
+
+    def _loop(self) -> None:
+        reason = "startup"
+        while True:
+            try:
+                if not self._leader:
+                    self._leader = locks.try_claim(LEADER_LOCK)
+                if self._leader:
+                    self.run(reason)
+            except Exception as e:
+                print("[AUTOASSIGN] run error:", e, flush=True)
+            timeout = min(AUTOASSIGN_POLL_SEC, self._seconds_to_rollover())
+            woke = self._wake.wait(timeout)
+            self._wake.clear()
+            if woke:
+                reason = self._pending_reason
+            elif self.done_date != today_kst_iso():
+                reason = "rollover"
+            else:
+                reason = "poll"
+
+    def stats(self) -> dict:
+        with self._mu:
+            return dict(self._stats, doneDate=self.done_date, leader=self._leader)
+
+
+auto_assigner = AutoAssigner()
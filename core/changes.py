@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.locks import locks
+from core.paths import CHANGES_PATH
+
+# ─────────────────────────────────────────────
+# ✅ 변경 피드 (GET /api/changes?since=<seq>)
+#  - 쓰기 경로마다 (문서, date, sid) 키를 changes.jsonl 에 한 줄씩 append
+#  - seq 는 프로세스 간 락 안에서 +1 (파일이 새로 생기면 ms 시각부터 시작 → 재생성돼도 안 줄어듦)
+#  - 첫 줄은 바닥(floor) 표시: 이 seq 이하 변경은 피드에 없음 → since < floor 면 reset
+#  - 값은 피드에 안 담고 조회 시점의 현재 값으로 채움 (같은 키 여러 번 바뀌면 마지막 한 번만)
+#  - 기록은 쓰기가 디스크(다른 워커도 보이는 상태)에 반영된 뒤에 → 피드를 본 클라이언트는 항상 새 값
+#  - CHANGES_MAX_BYTES 넘으면 뒤쪽 절반만 남기고 정리, 그보다 오래된 since 는 reset=true (전체 다시 받기)
+# ─────────────────────────────────────────────
+CHANGES_MAX_BYTES = int(os.environ.get("CHANGES_MAX_BYTES", str(2 * 1024 * 1024)))
+CHANGES_PAGE_LIMIT = 1000
+
+Key = Tuple[Optional[str], Optional[str]]  # (date, sid) — None = 그 단계 전체
+
+_LOCK_NAME = "changes"
+
+
+# ─────────────────────────────────────────────
+# 문서 등록: 피드 값 채울 때 쓰는 읽기 함수
+#   read_all()        → 문서 전체 (읽기 전용 뷰)
+#   read_date(date)   → (선택) 날짜 하나만 싸게 읽는 함수
+# ─────────────────────────────────────────────
+_docs: Dict[str, Tuple[Callable[[], Any], Optional[Callable[[str], Any]]]] = {}
+
+
+def register_doc(name: str, read_all: Callable[[], Any], read_date: Callable[[str], Any] | None = None) -> None:
+    _docs[name] = (read_all, read_date)
+
+
+def _norm_key(key) -> Key:
+    if key is None:
+        return (None, None)
+    if isinstance(key, str):
+        return (key, None)
+    date, sid = (tuple(key) + (None, None))[:2]
+    return (None if date is None else str(date), None if sid is None else str(sid))
+
+
+def diff_keys(old: Any, new: Any) -> List[Key]:
+    """
+    날짜키 문서 {date: {sid: v}} 두 버전 비교 → 바뀐 (date, sid) 키.
+    통째 저장(POST) 도 문서 전체 대신 바뀐 키만 기록하려고 씀 (날짜 값이 dict 가 아니면 (date, None)).
+    """
+    old = old if isinstance(old, dict) else {}
+    new = new if isinstance(new, dict) else {}
+    out: List[Key] = []
+    for d in sorted(set(old) | set(new), key=str):
+        a, b = old.get(d), new.get(d)
+        if a == b:
+            continue
+        if a is None or b is None:  # 날짜째 생기거나 없어짐 → 있는 쪽 sid 전부
+            a, b = a if a is not None else {}, b if b is not None else {}
+        if isinstance(a, dict) and isinstance(b, dict):
+            out.extend((str(d), str(s)) for s in sorted(set(a) | set(b), key=str) if a.get(s) != b.get(s))
+        else:
+            out.append((str(d), None))
+    return out
+
+
+class ChangeFeed:
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._mu = threading.Lock()
+        # 읽기 캐시: 파일 inode, 읽은 바이트, 바닥 seq, [(seq, doc, date, sid)]
+        self._ino = None
+        self._offset = 0
+        self._floor = 0
+        self._seqs: List[int] = []
+        self._items: List[Tuple[int, str, Optional[str], Optional[str]]] = []
+
+    # ── 읽기 캐시 갱신 (append 는 줄 단위, 정리는 파일 교체) ──
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._ino, self._offset, self._floor, self._seqs, self._items = None, 0, 0, [], []
+            return
+        if st.st_ino != self._ino or st.st_size < self._offset:
+            self._ino, self._offset, self._floor, self._seqs, self._items = st.st_ino, 0, 0, [], []
+        if st.st_size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            raw = f.read()
+        cut = raw.rfind(b"\n") + 1
+        for line in raw[:cut].splitlines():
+            try:
+                rec = json.loads(line.decode("utf-8"))
+                if "floor" in rec:
+                    self._floor = int(rec["floor"])
+                    continue
+                item = (int(rec["q"]), str(rec["doc"]), rec.get("d"), rec.get("s"))
+            except Exception:
+                continue
+            if self._seqs and item[0] <= self._seqs[-1]:
+                continue
+            self._seqs.append(item[0])
+            self._items.append(item)
+        self._offset += cut
+
+    def _last(self) -> int:
+        return self._seqs[-1] if self._seqs else self._floor
+
+    def _ensure_file(self) -> None:
+        # 새 피드: 바닥 seq 를 ms 시각으로 (락 안에서 호출)
+        self._refresh()
+        if self._ino is None:
+            self._append([json.dumps({"floor": int(time.time() * 1000)})])
+            self._refresh()
+
+    def _append(self, lines: List[str]) -> None:
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, ("\n".join(lines) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def last_seq(self) -> int:
+        with self._mu:
+            self._refresh()
+            if self._ino is not None:
+                return self._last()
+        with locks.exclusive(_LOCK_NAME), self._mu:
+            self._ensure_file()
+            return self._last()
+
+    # ── 쓰기 ─────────────────────────────────
+    def record(self, doc: str, keys: Iterable[Any] = (None,)) -> int:
+        """doc 의 keys 가 바뀌었음을 기록. return: 마지막 seq"""
+        keys = list(dict.fromkeys(_norm_key(k) for k in keys))
+        if not keys:
+            return self.last_seq()
+        with locks.exclusive(_LOCK_NAME), self._mu:
+            self._ensure_file()
+            seq = self._last()
+            lines = []
+            for date, sid in keys:
+                seq += 1
+                lines.append(json.dumps(
+                    {"q": seq, "doc": doc, "d": date, "s": sid, "t": round(time.time(), 3)},
+                    ensure_ascii=False, separators=(",", ":"),
+                ))
+            self._append(lines)
+            self._refresh()
+            if self._offset > CHANGES_MAX_BYTES:
+                self._trim()
+            return seq
+
+    def record_after(self, fut: Future, doc: str, keys: Iterable[Any] = (None,)) -> Future:
+        """
+        save_coalesced/write_dates Future 가 성공하면 그때 기록 (디스크 반영 후).
+        return: 기록까지 끝나야 완료되는 Future (쓰기 실패면 그 예외)
+          → result() 뒤에 /api/changes 를 보면 항상 보임 (원래 Future 는 콜백보다 먼저 깨어날 수 있음)
+        """
+        keys = list(keys)
+        out: Future = Future()
+
+        def _done(f: Future) -> None:
+            err = f.exception()
+            if err is not None:
+                out.set_exception(err)
+                return
+            try:
+                self.record(doc, keys)
+            except Exception as e:
+                # 디스크 반영은 끝났으니 쓰기 자체는 성공 처리 (피드만 빠짐)
+                print("[CHANGES] record failed:", e, flush=True)
+            out.set_result(f.result())
+
+        fut.add_done_callback(_done)
+        return out
+
+    def _trim(self) -> None:
+        # 뒤쪽 절반만 남김 (락 안에서 호출)
+        cut = len(self._items) // 2
+        keep = self._items[cut:]
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"floor": self._seqs[cut - 1] if cut else self._floor}) + "\n")
+            for q, doc, d, s in keep:
+                f.write(json.dumps({"q": q, "doc": doc, "d": d, "s": s}, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+        os.replace(tmp, self.path)
+        self._ino = None
+        self._refresh()
+
+    # ── 조회 ─────────────────────────────────
+    def since(self, seq: int, limit: int = CHANGES_PAGE_LIMIT) -> dict:
+        """
+        seq 이후 바뀐 키 + 현재 값.
+        return {"seq": 다음 since 로 쓸 값, "reset": 피드가 이미 잘려 전체 재조회 필요, "more": 남은 변경 있음,
+                "changes": [{"seq", "doc", "date", "sid", "value"}, ...]}
+        """
+        with self._mu:
+            self._refresh()
+            seqs, items = self._seqs, self._items
+            last = self._last()
+            if seq < self._floor:
+                return {"seq": last, "reset": True, "more": False, "changes": []}
+            if seq >= last:
+                return {"seq": last, "reset": False, "more": False, "changes": []}
+            i = bisect_right(seqs, seq)
+            page = items[i:i + max(1, limit)]
+            more = i + len(page) < len(items)
+
+        # 같은 키는 마지막 변경만
+        latest: Dict[Tuple[str, Key], int] = {}
+        for q, doc, d, s in page:
+            latest[(doc, (d, s))] = q
+        out = []
+        views: Dict[str, Any] = {}
+        days: Dict[Tuple[str, str], Any] = {}
+        for (doc, (d, s)), q in sorted(latest.items(), key=lambda kv: kv[1]):
+            out.append({"seq": q, "doc": doc, "date": d, "sid": s, "value": self._value(doc, d, s, views, days)})
+        return {"seq": page[-1][0] if page else last, "reset": False, "more": more, "changes": out}
+
+    def keys_since(self, seq: int, docs: Iterable[str] | None = None) -> Tuple[int, bool, List[Tuple[str, Key]]]:
+        """
+        서버 안에서 쓰는 가벼운 조회: seq 이후 바뀐 (doc, (date, sid)) 키만 (값 안 읽음, 중복 제거).
+        return (마지막 seq, reset, keys) — reset 이면 피드가 잘려 빠진 변경이 있을 수 있음
+        """
+        want = None if docs is None else set(docs)
+        with self._mu:
+            self._refresh()
+            last = self._last()
+            if seq < self._floor:
+                return last, True, []
+            i = bisect_right(self._seqs, seq)
+            items = self._items[i:]
+        keys = dict.fromkeys((doc, (d, s)) for _, doc, d, s in items if want is None or doc in want)
+        return last, False, list(keys)
+
+    @staticmethod
+    def _value(doc: str, date, sid, views: dict, days: dict) -> Any:
+        reader = _docs.get(doc)
+        if reader is None:
+            return None
+        read_all, read_date = reader
+        if date is not None and read_date is not None:
+            if (doc, date) not in days:
+                days[(doc, date)] = read_date(date)
+            cur = days[(doc, date)]
+        else:
+            if doc not in views:
+                views[doc] = read_all()
+            cur = views[doc]
+            if date is not None:
+                cur = cur.get(date) if isinstance(cur, dict) else None
+        if sid is not None:
+            cur = cur.get(sid) if isinstance(cur, dict) else None
+        return cur
+
+
+changes = ChangeFeed(CHANGES_PATH)
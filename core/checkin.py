@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import datetime as dt
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.autoassign import KST
+from core.changes import changes
+from core.datestore import get_store
+from core.dayflags import norm_day
+from core.roster import roster
+from core.storage import all_done
+
+# ─────────────────────────────────────────────
+# ✅ 키오스크 등원 체크인 (POST /api/checkin)
+#  - {sid, ts} 한 건 또는 오프라인에서 모아둔 여러 건 → 출석(attendance) + 등원시간(arrive-time) 함께 반영
+#  - 두 문서를 같은 순서(attendance → arrive-time)로 잠그고 바뀐 날짜만 write_dates
+#    → 둘 다 save_coalesced 라 한 반이 몇 분 안에 몰려 와도 문서당 쓰기 몇 번
+#  - 등원시간은 그 날 첫 체크인 시각만 (같은 학생이 다시 찍으면 중복 처리, 시각 안 바뀜)
+#  - 응답: 건별 결과 + 날짜별 명단 변화 (이번에 온 학생 / 명단에 없던 학생 / 아직 안 온 학생)
+# ─────────────────────────────────────────────
+CHECKIN_DOCS = ("attendance", "arrive-time")  # 잠그는 순서 고정
+
+
+def parse_ts(ts: Any, now: dt.datetime | None = None) -> dt.datetime:
+    """
+    ts → KST datetime.
+    숫자: epoch (1e12 이상이면 ms), 문자열: ISO (시간대 없으면 KST), 없으면 지금.
+    """
+    if ts is None or ts == "":
+        return now or dt.datetime.now(KST)
+    if isinstance(ts, bool):
+        raise ValueError("bad ts")
+    if isinstance(ts, (int, float)):
+        sec = ts / 1000 if ts >= 1e12 else ts
+        return dt.datetime.fromtimestamp(sec, KST)
+    s = str(ts).strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    t = dt.datetime.fromisoformat(s)
+    return t.replace(tzinfo=KST) if t.tzinfo is None else t.astimezone(KST)
+
+
+def _parse_item(body: Any, known: Dict[str, Any], now: dt.datetime) -> tuple:
+    """체크인 한 건 → ((date, sid, "HH:MM", 정렬키), None) / (None, 에러)"""
+    if not isinstance(body, dict):
+        return None, "bad payload"
+    sid = str(body.get("sid") or "").strip()
+    if not sid:
+        return None, "missing sid"
+    if sid not in known:
+        return None, "unknown sid"
+    try:
+        t = parse_ts(body.get("ts"), now)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None, "bad ts"
+    return (t.date().isoformat(), sid, t.strftime("%H:%M"), t), None
+
+
+def checkin(items: Iterable[Any]) -> Tuple[List[dict], Dict[str, dict], Future]:
+    """
+    return: (건별 결과(보낸 순서), {date: 명단 변화}, 디스크 반영 Future)
+      결과: {ok, sid, date, time, status: "checked_in" | "duplicate"} / {ok: False, error}
+      명단 변화: {checkedIn, offRoster, remaining, attended, expected}
+    """
+    known = roster.students().by_sid
+    now = dt.datetime.now(KST)
+
+    parsed: List[Any] = []
+    for item in items:
+        op, err = _parse_item(item, known, now)
+        parsed.append(op or {"ok": False, "error": err})
+
+    # 오프라인 큐는 순서가 섞여 올 수 있음 → 시각순으로 처리해서 첫 체크인이 등원시간이 되게
+    order = sorted((i for i, op in enumerate(parsed) if isinstance(op, tuple)), key=lambda i: parsed[i][3])
+
+    att, arr = (get_store(doc) for doc in CHECKIN_DOCS)
+    results: List[Any] = list(parsed)
+    keys: List[Tuple[str, str]] = []      # 이번에 출석 체크된 (date, sid)
+    arr_keys: List[Tuple[str, str]] = []  # 등원시간을 새로 쓴 (date, sid) — 이미 출석인 학생 포함
+    with att.lock(), arr.lock():
+        att_days: Dict[str, Dict[str, int]] = {}
+        arr_days: Dict[str, Dict[str, str]] = {}
+        for i in order:
+            date, sid, hhmm, _ = parsed[i]
+            if date not in att_days:
+                att_days[date] = norm_day(att.read_date(date))
+                cur = arr.read_date(date)
+                arr_days[date] = dict(cur) if isinstance(cur, dict) else {}
+            day = att_days[date]
+            if sid in day:
+                # 출석만 먼저 체크된 학생(출석 patch 등) → 등원시간은 이 체크인이 첫 기록
+                if not arr_days[date].get(sid):
+                    arr_days[date][sid] = hhmm
+                    arr_keys.append((date, sid))
+                first = arr_days[date][sid]
+                results[i] = {"ok": True, "sid": sid, "date": date, "time": first, "status": "duplicate"}
+                continue
+            day[sid] = 1
+            arr_days[date][sid] = hhmm
+            keys.append((date, sid))
+            arr_keys.append((date, sid))
+            results[i] = {"ok": True, "sid": sid, "date": date, "time": hhmm, "status": "checked_in"}
+
+        att_dirty = sorted({d for d, _ in keys})
+        arr_dirty = sorted({d for d, _ in arr_keys})
+        futs = []
+        if att_dirty:
+            futs.append(changes.record_after(
+                att.write_dates({d: att_days[d] for d in att_dirty}), "attendance", keys))
+        if arr_dirty:
+            futs.append(changes.record_after(
+                arr.write_dates({d: arr_days[d] for d in arr_dirty}), "arrive-time", arr_keys))
+        fut = all_done(futs)
+
+    delta: Dict[str, dict] = {}
+    for date, day in att_days.items():
+        expected = roster.sids_for_date(dt.date.fromisoformat(date))
+        on_roster = set(expected)
+        new = [sid for d, sid in keys if d == date]
+        delta[date] = {
+            "checkedIn": new,
+            "offRoster": [sid for sid in new if sid not in on_roster],
+            "remaining": [sid for sid in expected if sid not in day],
+            "attended": len(day),
+            "expected": len(expected),
+        }
+    return results, delta, fut
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import abc
+import argparse
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from core.changes import register_doc
+from core.locks import locks
+from core.paths import (
+    ARRIVE_DAY_PATH, ATTENDANCE_PATH, BASE, CONTACT_PATH, LOGS_PATH, PRG_PATH, TESTS_PATH, UPD_PATH,
+    WATCH_PATH,
+)
+from core.storage import (
+    FrozenDict, all_done, doc_signature, flush_pending, load, save_atomic, save_coalesced,
+    utc_now_isoz,
+)
+
+# ─────────────────────────────────────────────
+# ✅ 날짜키 문서 저장소 ({date: {sid: ...}} 형태: logs / progress / watch / updates / tests
+#    + 출석/연락 체크 attendance / contact — core/dayflags.py, 등원시간 arrive-time)
+#  - json        : 기존 단일 파일 (기본값) — write_dates 도 문서 전체를 다시 씀(쓰기 합치기만 적용)
+#  - partitioned : parts/<doc>/YYYY-MM.json 월별 파일 + manifest.json
+#                  → 오늘 작업은 이번 달 파일만 다시 씀
+#  - sqlite      : core/sqlstore.py (WAL, date/sid/mid 인덱스)
+#  - STORAGE_BACKEND 환경변수로 시작 시 선택
+#  - 기존 파일 → 월별 분할:  python -m core.datestore migrate [doc ...]
+#  - 오래된 날짜 → 연도별 gzip 아카이브:  python -m core.archive (core/archive.py)
+#  - progress 전이만 저장(PROGRESS_MODE=events):  python -m core.progressevents migrate
+# ─────────────────────────────────────────────
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json").strip().lower()
+
+PARTS_DIR = BASE / "parts"
+
+DATE_DOCS = {
+    "logs": LOGS_PATH,
+    "progress": PRG_PATH,
+    "watch": WATCH_PATH,
+    "updates": UPD_PATH,
+    "tests": TESTS_PATH,
+    "attendance": ATTENDANCE_PATH,
+    "contact": CONTACT_PATH,
+    "arrive-time": ARRIVE_DAY_PATH,
+}
+
+_DATE_KEY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+MISC_PARTITION = "_misc"  # 날짜 형식이 아닌 키(혹시 섞여 있으면) 보관
+
+
+def partition_key(date: str) -> str:
+    d = str(date)
+    return d[:7] if _DATE_KEY_RE.match(d) else MISC_PARTITION
+
+
+def _in_range(date: str, start: Optional[str], end: Optional[str]) -> bool:
+    if start and date < start:
+        return False
+    if end and date > end:
+        return False
+    return True
+
+
+# ─────────────────────────────────────────────
+# ✅ 날짜/학생 조각 조회 (?date= / ?start=&end= / ?sids=a,b)
+#  - 날짜키 문서 GET 공통 필터. 저장소가 지원하면 해당 구간만 읽음(월 파티션 / SQL WHERE)
+#  - sids 가 있으면 각 날짜에서 그 학생 것만 ({sid: ...} 는 키, [sid, ...] 는 원소), 빈 날짜는 뺌
+# ─────────────────────────────────────────────
+class DateSlice(NamedTuple):
+    start: Optional[str]
+    end: Optional[str]
+    sids: Tuple[str, ...]
+
+
+def parse_date_slice(args) -> DateSlice | None:
+    """요청 쿼리 → DateSlice (필터 파라미터 없으면 None, 형식 오류는 ValueError)"""
+    date = str(args.get("date") or "").strip()
+    start = str(args.get("start") or "").strip() or None
+    end = str(args.get("end") or "").strip() or None
+    sids = tuple(sorted({s.strip() for s in str(args.get("sids") or "").split(",") if s.strip()}))
+    if date:
+        start = end = date.split("T")[0]
+    if not (start or end or sids):
+        return None
+    for v in (start, end):
+        if v is not None and not _DATE_KEY_RE.match(v):
+            raise ValueError(f"bad date: {v}")
+    return DateSlice(start, end, sids)
+
+
+def _filter_day(day: Any, sids: Tuple[str, ...]) -> Any:
+    if isinstance(day, dict):
+        return {k: v for k, v in day.items() if str(k) in sids}
+    if isinstance(day, list):
+        return [x for x in day if str(x) in sids]
+    return None
+
+
+def slice_days(view: Any, sl: DateSlice) -> FrozenDict:
+    """메모리에 있는 {date: ...} 뷰에서 조각만"""
+    out: Dict[str, Any] = {}
+    for d, day in (view.items() if isinstance(view, dict) else []):
+        if not _in_range(d, sl.start, sl.end):
+            continue
+        if sl.sids:
+            day = _filter_day(day, sl.sids)
+            if not day:
+                continue
+        out[d] = day
+    return FrozenDict(out)
+
+
+class DateStore(abc.ABC):
+    """날짜키 문서 공통 인터페이스. 읽기 결과는 전부 읽기 전용 뷰."""
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def signature(self) -> Any:
+        """현재 저장 상태 식별자(바뀌면 값이 달라짐)"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_all(self) -> FrozenDict:
+        raise NotImplementedError
+
+    def read_date(self, date: str) -> Any:
+        return self.read_all().get(date)
+
+    def read_range(self, start: Optional[str], end: Optional[str]) -> FrozenDict:
+        """start <= date <= end (ISO 문자열 비교, None = 열린 구간)"""
+        return FrozenDict(
+            (d, v) for d, v in self.read_all().items() if _in_range(d, start, end)
+        )
+
+    def read_student(self, sid: str, start: Optional[str] = None, end: Optional[str] = None) -> FrozenDict:
+        """{date: 값} — 한 학생(sid) 것만"""
+        sid = str(sid)
+        out: Dict[str, Any] = {}
+        for d, day in self.read_range(start, end).items():
+            if isinstance(day, dict) and sid in day:
+                out[d] = FrozenDict({sid: day[sid]})
+        return FrozenDict(out)
+
+    def read_slice(self, sl: DateSlice) -> FrozenDict:
+        """parse_date_slice 결과만큼 (학생 하나면 read_student 로 그 학생 것만 읽음)"""
+        if len(sl.sids) == 1:
+            return slice_days(self.read_student(sl.sids[0], sl.start, sl.end), sl)
+        return slice_days(self.read_range(sl.start, sl.end), sl)
+
+    def lock(self):
+        """
+        이 문서의 쓰기 락(재진입 가능).
+        read_date → 수정 → write_dates 같은 read-modify-write 는 전체를 이 락 안에서.
+        """
+        return locks.exclusive(DATE_DOCS.get(self.name, self.name))
+
+    @abc.abstractmethod
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        """
+        주어진 날짜만 교체 (값이 None 이면 그 날짜 삭제).
+        파일 백엔드는 쓰기를 합쳐서(save_coalesced) 하므로 Future.result() 로 디스크 반영 대기.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def replace_all(self, obj: Any) -> None:
+        """전체 문서 저장(레거시 crud POST)"""
+        raise NotImplementedError
+
+
+class JsonDateStore(DateStore):
+    """기존 단일 JSON 파일"""
+
+    def __init__(self, name: str, path):
+        self.name = name
+        self.path = path
+
+    def signature(self) -> Any:
+        return doc_signature(self.path)
+
+    def read_all(self) -> FrozenDict:
+        view = load(self.path)
+        return view if isinstance(view, dict) else FrozenDict()
+
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        if not days:
+            return all_done([])
+        with self.lock():
+            out = dict(self.read_all())
+            for d, v in days.items():
+                if v is None:
+                    out.pop(d, None)
+                else:
+                    out[d] = v
+            return save_coalesced(self.path, out)
+
+    def replace_all(self, obj: Any) -> None:
+        with self.lock():
+            save_atomic(self.path, obj if isinstance(obj, dict) else {})
+
+
+class PartitionedDateStore(DateStore):
+    """parts/<doc>/YYYY-MM.json + manifest.json"""
+
+    def __init__(self, name: str, root):
+        self.name = name
+        self.root = root
+        self.manifest_path = root / "manifest.json"
+        self._mu = threading.Lock()
+        self._all_sig = None
+        self._all_view: FrozenDict | None = None
+
+    # ── manifest / 파티션 ─────────────────────
+    def _partitions(self) -> list:
+        man = load(self.manifest_path)
+        parts = man.get("partitions") if isinstance(man, dict) else None
+        return sorted(parts.keys()) if isinstance(parts, dict) else []
+
+    def _part_path(self, pkey: str):
+        return self.root / f"{pkey}.json"
+
+    def _load_part(self, pkey: str) -> FrozenDict:
+        view = load(self._part_path(pkey))
+        return view if isinstance(view, dict) else FrozenDict()
+
+    def _write_manifest(self, counts: Dict[str, int]) -> None:
+        save_atomic(self.manifest_path, {
+            "doc": self.name,
+            "granularity": "month",
+            "partitions": {k: {"dates": counts[k]} for k in sorted(counts)},
+            "updatedAt": utc_now_isoz(),
+        })
+
+    def _manifest_counts(self) -> Dict[str, int]:
+        man = load(self.manifest_path)
+        parts = man.get("partitions") if isinstance(man, dict) else None
+        out: Dict[str, int] = {}
+        for k, meta in (parts.items() if isinstance(parts, dict) else []):
+            n = meta.get("dates") if isinstance(meta, dict) else None
+            out[k] = n if isinstance(n, int) else 0
+        return out
+
+    # ── 읽기 ─────────────────────────────────
+    def signature(self) -> Any:
+        parts = self._partitions()
+        return (doc_signature(self.manifest_path),) + tuple(
+            (p, doc_signature(self._part_path(p))) for p in parts
+        )
+
+    def read_all(self) -> FrozenDict:
+        sig = self.signature()
+        with self._mu:
+            if self._all_view is not None and sig == self._all_sig:
+                return self._all_view
+        merged: Dict[str, Any] = {}
+        for pkey in self._partitions():
+            merged.update(self._load_part(pkey))
+        view = FrozenDict(merged)
+        with self._mu:
+            self._all_sig = sig
+            self._all_view = view
+        return view
+
+    def read_date(self, date: str) -> Any:
+        return self._load_part(partition_key(date)).get(date)
+
+    def read_range(self, start: Optional[str], end: Optional[str]) -> FrozenDict:
+        lo = start[:7] if start else None
+        hi = end[:7] if end else None
+        out: Dict[str, Any] = {}
+        for pkey in self._partitions():
+            if pkey != MISC_PARTITION and ((lo and pkey < lo) or (hi and pkey > hi)):
+                continue
+            for d, v in self._load_part(pkey).items():
+                if _in_range(d, start, end):
+                    out[d] = v
+        return FrozenDict(out)
+
+    # ── 쓰기 ─────────────────────────────────
+    def _save_part(self, pkey: str, obj: Dict[str, Any], counts: Dict[str, int]) -> Future:
+        if obj:
+            counts[pkey] = len(obj)
+            return save_coalesced(self._part_path(pkey), obj)
+        flush_pending(self._part_path(pkey))
+        try:
+            os.remove(self._part_path(pkey))
+        except FileNotFoundError:
+            pass
+        counts.pop(pkey, None)
+        return all_done([])
+
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        if not days:
+            return all_done([])
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for d, v in days.items():
+            grouped.setdefault(partition_key(d), {})[d] = v
+
+        with self.lock():
+            counts = self._manifest_counts()
+            before = dict(counts)
+            futs = []
+            for pkey, patch in grouped.items():
+                out = dict(self._load_part(pkey))
+                for d, v in patch.items():
+                    if v is None:
+                        out.pop(d, None)
+                    else:
+                        out[d] = v
+                futs.append(self._save_part(pkey, out, counts))
+            if counts != before:
+                self._write_manifest(counts)
+            fut = all_done(futs)
+            # 파티션 파일 flush 전까지 문서 락(프로세스 간)도 유지
+            locks.hold_until(DATE_DOCS.get(self.name, self.name), fut)
+            return fut
+
+    def replace_all(self, obj: Any) -> None:
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for d, v in (obj.items() if isinstance(obj, dict) else []):
+            grouped.setdefault(partition_key(d), {})[d] = v
+
+        with self.lock():
+            counts = self._manifest_counts()
+            before = dict(counts)
+            futs = []
+            for pkey in set(grouped) | set(counts):
+                new = grouped.get(pkey, {})
+                if pkey in counts and self._load_part(pkey) == new:
+                    continue  # 안 바뀐 달은 건드리지 않음
+                futs.append(self._save_part(pkey, new, counts))
+            if counts != before:
+                self._write_manifest(counts)
+            all_done(futs).result()
+
+
+# ─────────────────────────────────────────────
+# 저장소 선택
+# ─────────────────────────────────────────────
+_stores: Dict[str, DateStore] = {}
+_stores_mu = threading.Lock()
+
+
+def _make_store(name: str) -> DateStore:
+    path = DATE_DOCS[name]
+    if STORAGE_BACKEND == "sqlite":
+        from core.sqlstore import SqliteDateStore
+        return SqliteDateStore(name)
+    if STORAGE_BACKEND == "partitioned":
+        root = PARTS_DIR / name
+        if (root / "manifest.json").exists():
+            return PartitionedDateStore(name, root)
+        print(f"[STORE] {name}: partition manifest 없음 → json 사용 (migrate 먼저 실행)", flush=True)
+    elif STORAGE_BACKEND != "json":
+        print(f"[STORE] unknown STORAGE_BACKEND={STORAGE_BACKEND!r} → json 사용", flush=True)
+    return JsonDateStore(name, path)
+
+
+def get_store(name: str) -> DateStore:
+    with _stores_mu:
+        st = _stores.get(name)
+        if st is None:
+            # 오래된 날짜는 archive/<doc>/ 연도 파일로 (core/archive.py) → 백엔드와 무관하게 감쌈
+            from core.archive import ARCHIVE_DIR, ArchivedDateStore
+            st = ArchivedDateStore(_make_store(name), ARCHIVE_DIR / name)
+            if name == "progress":
+                # PROGRESS_MODE=events 면 쓰기 때 상태 전이만 남김 (core/progressevents.py)
+                from core.progressevents import PROGRESS_MODE, TransitionDateStore
+                if PROGRESS_MODE == "events":
+                    st = TransitionDateStore(st)
+            _stores[name] = st
+        return st
+
+
+def _register_feed_docs() -> None:
+    # 변경 피드 값 조회용 (logs 는 저널 fold 결과가 최신이라 logjournal 에서 등록)
+    for name in DATE_DOCS:
+        if name == "logs":
+            continue
+        register_doc(
+            name,
+            lambda n=name: get_store(n).read_all(),
+            lambda d, n=name: get_store(n).read_date(d),
+        )
+
+
+_register_feed_docs()
+
+
+# ─────────────────────────────────────────────
+# 마이그레이션 도구
+#   python -m core.datestore migrate [doc ...]   단일 파일 → 월별 파티션
+#   python -m core.datestore export  [doc ...]   월별 파티션 → 단일 파일(롤백용)
+# ─────────────────────────────────────────────
+def migrate_to_partitions(name: str) -> int:
+    src = load(DATE_DOCS[name])
+    root = PARTS_DIR / name
+    root.mkdir(parents=True, exist_ok=True)
+    store = PartitionedDateStore(name, root)
+    store.replace_all(src if isinstance(src, dict) else {})
+    if not store.manifest_path.exists():
+        store._write_manifest({})
+    return len(src) if isinstance(src, dict) else 0
+
+
+def export_to_json(name: str) -> int:
+    root = PARTS_DIR / name
+    store = PartitionedDateStore(name, root)
+    data = store.read_all()
+    save_atomic(DATE_DOCS[name], data)
+    return len(data)
+
+
+def _main(argv: Iterable[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m core.datestore")
+    ap.add_argument("command", choices=["migrate", "export"])
+    ap.add_argument("docs", nargs="*", default=list(DATE_DOCS))
+    args = ap.parse_args(argv)
+
+    for name in args.docs:
+        if name not in DATE_DOCS:
+            raise SystemExit(f"unknown doc: {name} (choices: {', '.join(DATE_DOCS)})")
+        if args.command == "migrate":
+            n = migrate_to_partitions(name)
+            print(f"[MIGRATE] {name}: {n} dates → {PARTS_DIR / name}")
+        else:
+            n = export_to_json(name)
+            print(f"[EXPORT] {name}: {n} dates → {DATE_DOCS[name]}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.absent import DATE_RE, parse_flag
+from core.changes import changes
+from core.datestore import get_store
+from core.storage import FrozenDict, all_done
+
+# ─────────────────────────────────────────────
+# ✅ 날짜별 체크 문서 (출석 attendance / 연락 contact) — {date: {sid: 1}}
+#  - 저장은 core.datestore 날짜키 저장소 → 날짜 단위로 읽고 씀
+#    (STORAGE_BACKEND=partitioned 면 그 달 파일만, sqlite 면 (date, sid) 행만)
+#  - 한 명씩 켜기/끄기 patch: {date, sid, on} → 락 안에서 그 날짜만 합쳐 씀
+#    (예전엔 체크 하나마다 문서 전체를 다시 써서 다른 기기 체크를 덮어쓸 수 있었음)
+#  - 쓰기는 save_coalesced 로 합쳐짐 → 수업 시작 때 체크가 몰려도 쓰기 몇 번
+# ─────────────────────────────────────────────
+FLAG_DOCS = ("attendance", "contact")
+
+
+def is_on(v: Any) -> bool:
+    """값은 1/true 만 체크로 인정"""
+    return v is True or v == 1 or str(v) in ("1", "true", "True")
+
+
+def norm_day(day: Any) -> Dict[str, int]:
+    """
+    {sid: 1} 로 정규화 (빈 sid 는 뺌).
+    예전 출석 POST 처럼 키가 있으면 체크 — "Y"/2/시각 같은 값도 1 로 옮김.
+    명시적으로 꺼진 값(false/0/"0"/"false"/null)만 뺌.
+    """
+    if not isinstance(day, dict):
+        return {}
+    return {str(sid).strip(): 1 for sid, v in day.items() if str(sid).strip() and parse_flag(v) is not False}
+
+
+def read_day(doc: str, date: str) -> FrozenDict:
+    """그 날짜 {sid: 1} (날짜 하나만 읽음)"""
+    day = get_store(doc).read_date(date)
+    return day if isinstance(day, dict) else FrozenDict()
+
+
+def replace_days(doc: str, days: Dict[str, Any]) -> Future:
+    """
+    날짜별 맵 통째 저장 (예전 POST 형식). 주어진 날짜만 교체, 빈 맵이면 그 날짜 삭제.
+    return: 디스크 반영 + 변경 피드 기록 Future
+    """
+    store = get_store(doc)
+    out = {d: norm_day(m) or None for d, m in days.items()}
+    if not out:
+        return all_done([])
+    with store.lock():
+        return changes.record_after(store.write_dates(out), doc, list(out))
+
+
+def _parse_op(body: Any) -> tuple:
+    """patch 한 건 검증 → ((date, sid, on), None) / (None, 에러)"""
+    if not isinstance(body, dict):
+        return None, "bad payload"
+    date = str(body.get("date") or "").split("T")[0].strip()
+    sid = str(body.get("sid") or "").strip()
+    if not date or not sid:
+        return None, "missing date/sid"
+    if not DATE_RE.match(date):
+        return None, "bad date"
+    on = not is_on(body["off"]) if "off" in body else is_on(body.get("on", True))
+    return (date, sid, on), None
+
+
+def patch(doc: str, items: Iterable[Any]) -> Tuple[List[dict], Dict[str, FrozenDict], Future]:
+    """
+    한 명씩 켜기/끄기: [{date, sid, on: true|false}] (on 생략 = 켜기, {off: true} 도 됨).
+    return: (항목별 결과, 건드린 날짜의 새 {sid: 1}, 디스크 반영 Future)
+    """
+    store = get_store(doc)
+    results: List[dict] = []
+    keys: List[Tuple[str, str]] = []
+    with store.lock():
+        days: Dict[str, Dict[str, int]] = {}
+        for item in items:
+            op, err = _parse_op(item)
+            if err:
+                results.append({"ok": False, "error": err})
+                continue
+            date, sid, on = op
+            if date not in days:
+                days[date] = norm_day(store.read_date(date))
+            day = days[date]
+            changed = (sid in day) != on
+            if changed:
+                if on:
+                    day[sid] = 1
+                else:
+                    day.pop(sid, None)
+                keys.append((date, sid))
+            results.append({"ok": True, "date": date, "sid": sid, "on": on, "changed": changed})
+
+        dirty = {d for d, _ in keys}
+        fut = all_done([])
+        if dirty:
+            fut = changes.record_after(store.write_dates({d: days[d] or None for d in dirty}), doc, keys)
+    return results, {d: FrozenDict(day) for d, day in days.items()}, fut
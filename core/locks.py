@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterator
+
+from core.paths import BASE
+
+try:
+    import fcntl  # POSIX
+except ImportError:  # Windows: 프로세스 간 락 없음(단일 프로세스 실행 기준), 스레드 락만
+    fcntl = None
+
+# ─────────────────────────────────────────────
+# ✅ 문서 단위 읽기/쓰기 락 매니저
+#  - 문서(파일 경로 or 이름)마다 shared / exclusive
+#  - 스레드 간: 프로세스 내부 RW 락(쓰기 우선)
+#  - 프로세스 간: .locks/<문서>.lock 에 fcntl.flock (블로킹 대기, 폴링 X)
+#    → 워커가 죽으면 커널이 락을 풀어줌 = 죽은 주인 락이 남지 않음
+#  - 같은 스레드 재진입 허용 (exclusive 안에서 shared/exclusive 다시 잡기 OK)
+#  - save_coalesced 로 미뤄진 쓰기는 flush 될 때까지 프로세스 간 락 유지 (hold_until)
+#  - 워커 중 한 프로세스만 돌아야 하는 작업: try_claim (안 기다리고 잡아서 프로세스 끝까지 유지)
+#  - 대기/보유 시간 통계: lock_stats()
+# ─────────────────────────────────────────────
+LOCK_DIR = BASE / ".locks"
+LOCK_DIR.mkdir(exist_ok=True)
+
+SLOW_WAIT_WARN_SEC = float(os.environ.get("LOCK_SLOW_WAIT_WARN_SEC", "2.0"))
+
+
+def lock_name(doc) -> str:
+    """경로 → 락 이름 (BASE 기준 상대경로, 구분자는 '__')"""
+    if isinstance(doc, str) and os.sep not in doc and "/" not in doc:
+        return doc
+    p = os.path.abspath(os.fspath(doc))
+    try:
+        rel = os.path.relpath(p, os.fspath(BASE))
+    except ValueError:
+        rel = p
+    return rel.replace("\\", "/").strip("/").replace("/", "__")
+
+
+def _write_owner(fd: int) -> None:
+    # 진단용: 현재 exclusive 주인 "pid 시각"
+    try:
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f"{os.getpid()} {time.time():.3f}\n".encode("ascii"), 0)
+    except OSError:
+        pass
+
+
+def _read_owner(fd: int):
+    try:
+        raw = os.pread(fd, 64, 0).decode("ascii", "ignore").split()
+        return int(raw[0]), float(raw[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class _RWLock:
+    """프로세스 내부 읽기/쓰기 락 (쓰기 대기자 있으면 새 읽기는 대기)"""
+
+    def __init__(self):
+        self._cv = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire(self, exclusive: bool) -> None:
+        with self._cv:
+            if exclusive:
+                self._waiting_writers += 1
+                try:
+                    while self._writer or self._readers:
+                        self._cv.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = True
+            else:
+                while self._writer or self._waiting_writers:
+                    self._cv.wait()
+                self._readers += 1
+
+    def release(self, exclusive: bool) -> None:
+        with self._cv:
+            if exclusive:
+                self._writer = False
+            else:
+                self._readers -= 1
+            self._cv.notify_all()
+
+
+class _FileLock:
+    """
+    프로세스 단위 flock (참조 카운트).
+    - exclusive 보유자(스레드 + flush 대기 중인 쓰기)가 있으면 LOCK_EX, shared 만 있으면 LOCK_SH
+    - 스레드끼리는 _RWLock 이 이미 배제하므로 여기선 "이 프로세스가 어떤 모드로 잡아야 하나"만 관리
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mu = threading.Lock()
+        self._fd: int | None = None
+        self._mode = 0  # 0 / LOCK_SH / LOCK_EX
+        self._sh = 0
+        self._ex = 0
+
+    def _flock(self, op: int):
+        """op 모드로 전환. 다른 프로세스가 잡고 있어 기다렸다면 그 주인 정보 반환"""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        owner = None
+        try:
+            fcntl.flock(self._fd, op | fcntl.LOCK_NB)
+        except BlockingIOError:
+            owner = _read_owner(self._fd)  # 누가 잡고 있는지 기록 후 블로킹 대기
+            fcntl.flock(self._fd, op)
+        self._mode = op
+        if op == fcntl.LOCK_EX:
+            _write_owner(self._fd)
+        return owner
+
+    def acquire(self, exclusive: bool):
+        if fcntl is None:
+            return None
+        with self._mu:
+            if exclusive:
+                self._ex += 1
+                want = fcntl.LOCK_EX
+            else:
+                self._sh += 1
+                want = fcntl.LOCK_EX if self._ex else fcntl.LOCK_SH
+            if self._mode == want or self._mode == fcntl.LOCK_EX:
+                return None
+            try:
+                return self._flock(want)
+            except BaseException:
+                if exclusive:
+                    self._ex -= 1
+                else:
+                    self._sh -= 1
+                raise
+
+    def release(self, exclusive: bool) -> None:
+        if fcntl is None:
+            return
+        with self._mu:
+            if exclusive:
+                self._ex -= 1
+            else:
+                self._sh -= 1
+            if self._ex:
+                return
+            if self._sh:
+                if self._mode != fcntl.LOCK_SH:
+                    self._flock(fcntl.LOCK_SH)  # EX → SH 강등 (기다릴 일 없음)
+                return
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+            self._mode = 0
+
+
+class _Stat:
+    __slots__ = ("acquires", "shared", "exclusive", "wait_total", "wait_max", "hold_total", "hold_max")
+
+    def __init__(self):
+        self.acquires = self.shared = self.exclusive = 0
+        self.wait_total = self.wait_max = self.hold_total = self.hold_max = 0.0
+
+    def as_dict(self) -> dict:
+        n = max(1, self.acquires)
+        return {
+            "acquires": self.acquires,
+            "shared": self.shared,
+            "exclusive": self.exclusive,
+            "wait_avg_ms": round(self.wait_total / n * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+            "hold_avg_ms": round(self.hold_total / n * 1000, 3),
+            "hold_max_ms": round(self.hold_max * 1000, 3),
+        }
+
+
+class LockManager:
+    def __init__(self, lock_dir):
+        self.lock_dir = lock_dir
+        self._mu = threading.Lock()
+        self._rw: Dict[str, _RWLock] = {}
+        self._files: Dict[str, _FileLock] = {}
+        self._stats: Dict[str, _Stat] = {}
+        self._held = threading.local()  # name -> [mode, depth]
+        self._claims: Dict[str, tuple] = {}  # try_claim: name -> (pid, fd)
+
+    def _get(self, name: str):
+        with self._mu:
+            lk = self._rw.get(name)
+            if lk is None:
+                lk = self._rw[name] = _RWLock()
+                self._files[name] = _FileLock(os.path.join(os.fspath(self.lock_dir), name + ".lock"))
+                self._stats[name] = _Stat()
+            return lk, self._files[name]
+
+    def _held_map(self) -> dict:
+        m = getattr(self._held, "m", None)
+        if m is None:
+            m = self._held.m = {}
+        return m
+
+    @contextlib.contextmanager
+    def _acquire(self, doc, exclusive: bool) -> Iterator[None]:
+        name = lock_name(doc)
+        held = self._held_map()
+        cur = held.get(name)
+        if cur is not None:
+            # 재진입: exclusive 안에서는 뭐든 OK, shared 안에서 exclusive 승격은 교착 → 금지
+            if exclusive and cur[0] != "ex":
+                raise RuntimeError(f"lock upgrade not supported: {name}")
+            cur[1] += 1
+            try:
+                yield
+            finally:
+                cur[1] -= 1
+            return
+
+        rw, fl = self._get(name)
+        t0 = time.monotonic()
+        rw.acquire(exclusive)
+        try:
+            owner = fl.acquire(exclusive)
+        except BaseException:
+            rw.release(exclusive)
+            raise
+
+        t1 = time.monotonic()
+        waited = t1 - t0
+        if waited >= SLOW_WAIT_WARN_SEC:
+            _warn_slow(name, exclusive, waited, owner)
+        held[name] = ["ex" if exclusive else "sh", 1]
+        try:
+            yield
+        finally:
+            del held[name]
+            try:
+                fl.release(exclusive)
+            finally:
+                rw.release(exclusive)
+            self._record(name, exclusive, waited, time.monotonic() - t1)
+
+    def _record(self, name: str, exclusive: bool, waited: float, hold: float) -> None:
+        with self._mu:
+            st = self._stats[name]
+            st.acquires += 1
+            if exclusive:
+                st.exclusive += 1
+            else:
+                st.shared += 1
+            st.wait_total += waited
+            st.wait_max = max(st.wait_max, waited)
+            st.hold_total += hold
+            st.hold_max = max(st.hold_max, hold)
+
+    def shared(self, doc):
+        """읽기 락: 여러 명 동시 보유 가능"""
+        return self._acquire(doc, exclusive=False)
+
+    def exclusive(self, doc):
+        """쓰기 락: read-modify-write 전체를 감쌀 것"""
+        return self._acquire(doc, exclusive=True)
+
+    def held(self, doc) -> bool:
+        """현재 스레드가 이 문서 락을 잡고 있는지"""
+        return lock_name(doc) in self._held_map()
+
+    def hold_until(self, doc, fut: Future) -> None:
+        """
+        fut 이 끝날 때까지 이 프로세스가 문서의 프로세스 간 exclusive 락을 유지.
+        (합쳐진 쓰기가 아직 디스크에 안 내려갔는데 다른 워커가 옛 파일을 읽고 고치는 것 방지)
+        스레드 락은 바로 풀리므로 같은 프로세스 안에서는 기다리지 않음.
+        """
+        if fcntl is None or fut.done():
+            return
+        _, fl = self._get(lock_name(doc))
+        fl.acquire(True)
+        fut.add_done_callback(lambda _f: fl.release(True))
+
+    def try_claim(self, doc) -> bool:
+        """
+        프로세스 간 exclusive 를 기다리지 않고 잡아서 이 프로세스가 끝날 때까지 유지.
+        return: 이 프로세스가 주인인지 (다른 프로세스가 잡고 있으면 False, 그 프로세스가 죽으면 다시 시도해서 넘겨받음)
+        exclusive()/shared() 와 같은 이름을 쓰면 안 됨 (같은 파일에 flock 이 두 개 생김)
+        """
+        if fcntl is None:
+            return True
+        name = lock_name(doc)
+        with self._mu:
+            cur = self._claims.get(name)
+            if cur is not None and cur[0] == os.getpid():
+                return True
+            # fork 로 물려받은 fd 는 부모 것 → 새로 열어서 시도
+            fd = os.open(os.path.join(os.fspath(self.lock_dir), name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            _write_owner(fd)
+            self._claims[name] = (os.getpid(), fd)
+            return True
+
+    def stats(self) -> dict:
+        with self._mu:
+            return {name: st.as_dict() for name, st in sorted(self._stats.items())}
+
+
+def _warn_slow(name: str, exclusive: bool, waited: float, owner) -> None:
+    who = ""
+    if owner is not None:
+        pid, since = owner
+        who = f", owner pid={pid} since={since:.0f}"
+        if not _pid_alive(pid):
+            # flock 은 fd 가 닫혀야 풀림: 주인이 죽었는데 오래 막혔다면 fd 를 물려받은 자식 프로세스 의심
+            who += " (owner dead: fd inherited by another process?)"
+    print(f"[LOCK] slow wait {waited:.2f}s for {name} ({'ex' if exclusive else 'sh'}{who})", flush=True)
+
+
+locks = LockManager(LOCK_DIR)
+
+
+def lock_stats() -> dict:
+    return locks.stats()
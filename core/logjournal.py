@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.changes import changes, register_doc
+from core.datestore import DateStore, get_store
+from core.locks import locks
+from core.paths import LOGS_JOURNAL_DIR
+from core.storage import FrozenDict, freeze, utc_now_isoz
+
+# ─────────────────────────────────────────────
+# ✅ logs 저널 저장소
+#  - logs 날짜 저장소(logs.json 또는 월별 파티션) = 마지막 체크포인트
+#  - 패치는 logs.journal/seg-XXXXXXXX.jsonl 에 한 줄씩 append + fsync
+#    → 쓰기 비용 = 패치 크기 (2.7MB 전체 재작성 X)
+#  - 요청 스레드는 커밋 큐에 넣고 Future 대기, 커밋 스레드 하나가 쌓인 걸 모아 write + fsync 한 번
+#    (몰릴 때 fsync 횟수 = 요청 수가 아니라 디스크가 소화하는 만큼)
+#  - 읽기 = 체크포인트 + 저널 fold (세그먼트가 늘어난 만큼만 증분 적용)
+#  - 백그라운드 컴팩터가 닫힌 세그먼트를 체크포인트로 접고 삭제
+#  - 학생별 인덱스 sid → 정렬된 날짜 목록 (fold 할 때 같이 갱신) → timeline() 은 그 학생 기록 수만큼만
+# ─────────────────────────────────────────────
+Op = Tuple[str, str, dict]  # (date, sid, entry)
+
+COMPACT_INTERVAL_SEC = float(os.environ.get("LOGS_COMPACT_INTERVAL_SEC", "30"))
+COMPACT_MIN_BYTES = int(os.environ.get("LOGS_COMPACT_MIN_BYTES", str(256 * 1024)))
+COMPACT_MAX_AGE_SEC = float(os.environ.get("LOGS_COMPACT_MAX_AGE_SEC", "600"))
+
+_SEG_RE = re.compile(r"^seg-(\d{8})\.jsonl$")
+
+
+# ─────────────────────────────────────────────
+# ✅ logs 안전 merge (날아감 방지)
+# - PATCH가 기본
+# - "빈 값"으로 기존 "유효 값" 덮는 거 금지
+# - 대신 "__clear": ["notes", ...] 로 명시 삭제 지원
+# ─────────────────────────────────────────────
+def is_empty_value(v) -> bool:
+    if v is None:
+        return True
+    if isinstance(v, str) and v.strip() == "":
+        return True
+    if isinstance(v, list) and len(v) == 0:
+        return True
+    if isinstance(v, dict) and len(v) == 0:
+        return True
+    return False
+
+
+def merge_entry_safe(cur: dict, inc: dict) -> dict:
+    if not isinstance(cur, dict):
+        cur = {}
+    if not isinstance(inc, dict):
+        return cur
+
+    out = dict(cur)
+
+    # ✅ 명시 삭제 키
+    clear = inc.get("__clear")
+    if isinstance(clear, list):
+        for k in clear:
+            kk = str(k).strip()
+            if kk:
+                out.pop(kk, None)
+
+    for k, v in inc.items():
+        if k == "__clear":
+            continue
+
+        # None은 "삭제"로 쓰지 말고 __clear로 처리(실수 방지)
+        if v is None:
+            continue
+
+        # ✅ 스테일 전체 업로드/빈값 업로드가 기존값 덮는 거 방지
+        if is_empty_value(v) and not is_empty_value(out.get(k)):
+            continue
+
+        out[k] = v
+
+    return out
+
+
+def apply_ops(view: Any, ops: Iterable[Op]) -> FrozenDict:
+    """
+    읽기 전용 logs 뷰에 ops 를 copy-on-write 로 적용.
+    손대는 날짜만 복사하고 나머지는 기존 frozen 객체 그대로 공유.
+    """
+    out = dict(view) if isinstance(view, dict) else {}
+    days: Dict[str, dict] = {}
+    for date, sid, entry in ops:
+        day = days.get(date)
+        if day is None:
+            cur_day = out.get(date)
+            day = dict(cur_day) if isinstance(cur_day, dict) else {}
+            days[date] = day
+        day[sid] = merge_entry_safe(day.get(sid, {}), entry)
+    out.update(days)
+    return freeze(out)
+
+
+def _index_by_sid(view: Any) -> Dict[str, List[str]]:
+    by_sid: Dict[str, List[str]] = {}
+    for date in sorted(view):
+        day = view[date]
+        if isinstance(day, dict):
+            for sid in day:
+                by_sid.setdefault(str(sid), []).append(date)
+    return by_sid
+
+
+def _parse_lines(raw: bytes) -> List[Op]:
+    ops: List[Op] = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line.decode("utf-8"))
+        except Exception:
+            continue
+        if not isinstance(rec, dict) or not isinstance(rec.get("e"), dict):
+            continue
+        ops.append((str(rec.get("d") or ""), str(rec.get("s") or ""), rec["e"]))
+    return ops
+
+
+class LogJournal:
+    def __init__(self, store: DateStore, journal_dir):
+        self.store = store
+        self.journal_dir = journal_dir
+        # 락 이름: append/rotate 직렬화, 컴팩터끼리 배제, 체크포인트 교체 중 읽기 차단
+        self._append_key = f"{store.name}.journal"
+        self._compact_key = f"{store.name}.compact"
+        self._ckpt_key = f"{store.name}.checkpoint"
+        self._mu = threading.Lock()
+        # fold 캐시: (체크포인트 시그니처, {세그먼트명: 읽은 바이트}, 뷰)
+        self._ckpt_sig = None
+        self._offsets: Dict[str, int] = {}
+        self._view: Any = None
+        self._by_sid: Dict[str, List[str]] = {}
+        # 커밋 큐: [(bytes, keys, Future)]
+        self._queue: deque = deque()
+        self._queue_cv = threading.Condition()
+        self._committer: threading.Thread | None = None
+        # 커밋/컴팩션 카운터 — 백그라운드 스레드가 갱신, /api/storage-stats 가 읽음 → _mu 안에서만
+        self._commit_stats = {"commits": 0, "batches": 0, "ops": 0, "max_group": 0}
+        self._compact_stats = {"compactions": 0, "compacted_ops": 0, "last_compact_at": None}
+        self._compactor: threading.Thread | None = None
+
+    # ── 세그먼트 ──────────────────────────────
+    def _segments(self) -> List[Tuple[int, str]]:
+        out = []
+        try:
+            names = os.listdir(self.journal_dir)
+        except FileNotFoundError:
+            return out
+        for name in names:
+            m = _SEG_RE.match(name)
+            if m:
+                out.append((int(m.group(1)), name))
+        out.sort()
+        return out
+
+    def _seg_path(self, name: str) -> str:
+        return os.path.join(os.fspath(self.journal_dir), name)
+
+    def _active_segment(self) -> str:
+        segs = self._segments()
+        if segs:
+            return segs[-1][1]
+        return f"seg-{1:08d}.jsonl"
+
+    def lock(self):
+        """append/rotate 직렬화용 락 (read-modify-append 하는 호출자도 사용)"""
+        return locks.exclusive(self._append_key)
+
+    # ── 쓰기 ─────────────────────────────────
+    def _encode(self, ops: Iterable[Op]) -> Tuple[bytes, list]:
+        lines = []
+        keys = []
+        for date, sid, entry in ops:
+            keys.append((str(date), str(sid)))
+            rec = {"d": str(date), "s": str(sid), "e": entry, "t": time.time()}
+            lines.append(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+        if not lines:
+            return b"", keys
+        return ("\n".join(lines) + "\n").encode("utf-8"), keys
+
+    def submit(self, ops: Iterable[Op]) -> Future:
+        """
+        커밋 큐에 넣고 바로 Future 반환 (result() = 기록한 줄 수, fsync 끝난 뒤 완료).
+        같은 순간 들어온 것들은 커밋 스레드가 한 번에 씀.
+        """
+        data, keys = self._encode(ops)
+        fut: Future = Future()
+        if not data:
+            fut.set_result(0)
+            return fut
+        with self._queue_cv:
+            self._queue.append((data, keys, fut))
+            self._queue_cv.notify()
+        self._ensure_committer()
+        return fut
+
+    def append(self, ops: Iterable[Op]) -> int:
+        """
+        ops 를 기록하고 fsync 까지 대기.
+        lock() 을 잡고 read-modify-append 하는 호출자는 큐를 거치지 않고 바로 씀
+        (커밋 스레드도 같은 락이 필요하므로 큐에 넣고 기다리면 교착)
+        """
+        if not locks.held(self._append_key):
+            return self.submit(ops).result()
+        data, keys = self._encode(ops)
+        if not data:
+            return 0
+        with self.lock():
+            self._write(data)
+        changes.record(self.store.name, keys)
+        self._ensure_compactor()
+        return len(keys)
+
+    def _ensure_committer(self) -> None:
+        if self._committer is not None and self._committer.is_alive():
+            return
+        with self._queue_cv:
+            if self._committer is not None and self._committer.is_alive():
+                return
+            t = threading.Thread(target=self._commit_loop, name="logs-committer", daemon=True)
+            self._committer = t
+            t.start()
+
+    def _commit_loop(self) -> None:
+        while True:
+            with self._queue_cv:
+                while not self._queue:
+                    self._queue_cv.wait()
+                batch = list(self._queue)
+                self._queue.clear()
+            try:
+                with self.lock():
+                    self._write(b"".join(data for data, _, _ in batch))
+            except BaseException as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            keys = [k for _, ks, _ in batch for k in ks]
+            try:
+                changes.record(self.store.name, keys)
+            except Exception as e:
+                print("[LOGS] change feed record failed:", e, flush=True)
+            with self._mu:
+                st = self._commit_stats
+                st["commits"] += 1
+                st["batches"] += len(batch)
+                st["ops"] += len(keys)
+                st["max_group"] = max(st["max_group"], len(batch))
+            for _, ks, fut in batch:
+                fut.set_result(len(ks))
+            self._ensure_compactor()
+
+    def commit_stats(self) -> dict:
+        with self._mu:
+            st = dict(self._commit_stats)
+            st.update(self._compact_stats)
+        st["avg_group"] = round(st["batches"] / st["commits"], 2) if st["commits"] else 0
+        with self._queue_cv:
+            st["queued"] = len(self._queue)
+        return st
+
+    def _write(self, data: bytes) -> None:
+        path = self._seg_path(self._active_segment())
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            start = os.fstat(fd).st_size
+            buf = memoryview(data)
+            try:
+                # os.write 는 일부만 쓸 수 있음 → 다 쓸 때까지
+                while buf:
+                    buf = buf[os.write(fd, buf):]
+            except BaseException:
+                # 반쯤 쓴 줄이 남으면 다음 append 와 붙어 깨진 줄이 됨 → 쓰기 전 길이로 되돌림
+                os.ftruncate(fd, start)
+                raise
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def patch(self, date: str, sid: str, entry: dict) -> None:
+        self.append([(date, sid, entry)])
+
+    # ── 읽기 ─────────────────────────────────
+    def read(self) -> FrozenDict:
+        """체크포인트 + 저널 fold 결과(읽기 전용 뷰)"""
+        # 체크포인트 저장 ~ 세그먼트 삭제 사이를 보면 같은 패치를 두 번 접게 됨 → shared 로 막음
+        with self._mu, locks.shared(self._ckpt_key):
+            ckpt_sig = self.store.signature()
+            base = self.store.read_all()
+            segs = self._segments()
+            names = {name for _, name in segs}
+
+            incremental = (
+                self._view is not None
+                and ckpt_sig == self._ckpt_sig
+                and all(n in names for n in self._offsets)
+            )
+            if not incremental:
+                view = base if isinstance(base, dict) else FrozenDict()
+                offsets: Dict[str, int] = {}
+                by_sid = _index_by_sid(view)
+            else:
+                view = self._view
+                offsets = dict(self._offsets)
+                by_sid = self._by_sid
+
+            pending: List[Op] = []
+            for _, name in segs:
+                start = offsets.get(name, 0)
+                try:
+                    with open(self._seg_path(name), "rb") as f:
+                        f.seek(start)
+                        raw = f.read()
+                except FileNotFoundError:
+                    continue
+                # 마지막 줄이 쓰는 중(개행 없음)이면 다음 읽기로 미룸
+                cut = raw.rfind(b"\n") + 1
+                if cut:
+                    pending.extend(_parse_lines(raw[:cut]))
+                offsets[name] = start + cut
+
+            if pending:
+                view = apply_ops(view, pending)
+                for date, sid, _ in pending:
+                    dates = by_sid.setdefault(sid, [])
+                    i = bisect_left(dates, date)
+                    if i == len(dates) or dates[i] != date:
+                        insort(dates, date)
+
+            self._ckpt_sig = ckpt_sig
+            self._offsets = offsets
+            self._view = view
+            self._by_sid = by_sid
+            return view
+
+    def timeline(self, sid: str, before: str | None = None, limit: int = 30) -> Tuple[List[Tuple[str, Any]], str | None]:
+        """
+        한 학생 기록 최신순 [(date, entry)] (date < before), 다음 페이지 커서(없으면 None).
+        학생별 인덱스로 그 학생 날짜만 봄 (전체 날짜 순회 X)
+        """
+        view = self.read()
+        with self._mu:
+            dates = self._by_sid.get(str(sid), [])
+            end = bisect_left(dates, before) if before else len(dates)
+            picked = dates[max(0, end - limit):end]
+        items = []
+        for d in reversed(picked):
+            day = view.get(d)
+            if isinstance(day, dict) and str(sid) in day:
+                items.append((d, day[str(sid)]))
+        more = end - len(picked) > 0
+        return items, (picked[0] if more and picked else None)
+
+    def signature(self) -> Any:
+        """read() 결과 버전: 체크포인트 시그니처 + 세그먼트별 크기"""
+        segs = []
+        for _, name in self._segments():
+            try:
+                segs.append((name, os.path.getsize(self._seg_path(name))))
+            except OSError:
+                pass
+        return (self.store.signature(), tuple(segs))
+
+    def journal_bytes(self) -> int:
+        total = 0
+        for _, name in self._segments():
+            try:
+                total += os.path.getsize(self._seg_path(name))
+            except OSError:
+                pass
+        return total
+
+    # ── 컴팩션 ────────────────────────────────
+    def compact(self, force: bool = False) -> int:
+        """
+        닫힌 세그먼트를 체크포인트로 접는다.
+          1) (append 락) 새 빈 세그먼트로 교체 → 이후 append 는 새 세그먼트로
+          2) 체크포인트 + 닫힌 세그먼트 fold → (checkpoint 락) 바뀐 날짜만 저장 → 세그먼트 삭제
+        2) 중간에 죽어도 다음 fold 때 같은 패치를 다시 적용할 뿐 (merge 는 재적용 안전)
+        return: 접은 레코드 수
+        """
+        with locks.exclusive(self._compact_key):
+            segs = self._segments()
+            if not segs:
+                return 0
+            if not force and not self._should_compact(segs):
+                return 0
+
+            with self.lock():
+                segs = self._segments()
+                last_no = segs[-1][0]
+                if os.path.getsize(self._seg_path(segs[-1][1])) > 0:
+                    open(self._seg_path(f"seg-{last_no + 1:08d}.jsonl"), "ab").close()
+                    closed = segs
+                else:
+                    closed = segs[:-1]
+            if not closed:
+                return 0
+
+            ops: List[Op] = []
+            for _, name in closed:
+                with open(self._seg_path(name), "rb") as f:
+                    raw = f.read()
+                ops.extend(_parse_lines(raw))
+
+            with locks.exclusive(self._ckpt_key), self.store.lock():
+                merged = apply_ops(self.store.read_all(), ops)
+                # 체크포인트가 디스크에 반영된 뒤에만 세그먼트 삭제
+                self.store.write_dates({d: merged.get(d) for d in {op[0] for op in ops}}).result()
+
+                for _, name in closed:
+                    try:
+                        os.remove(self._seg_path(name))
+                    except FileNotFoundError:
+                        pass
+
+            with self._mu:
+                self._compact_stats["compactions"] += 1
+                self._compact_stats["compacted_ops"] += len(ops)
+                self._compact_stats["last_compact_at"] = utc_now_isoz()
+            print(f"[LOGS] compacted {len(ops)} ops from {len(closed)} segment(s)", flush=True)
+            return len(ops)
+
+    def _should_compact(self, segs) -> bool:
+        size = 0
+        oldest = None
+        for _, name in segs:
+            try:
+                st = os.stat(self._seg_path(name))
+            except OSError:
+                continue
+            if st.st_size <= 0:
+                continue
+            size += st.st_size
+            oldest = st.st_mtime if oldest is None else min(oldest, st.st_mtime)
+        if size <= 0:
+            return False
+        if size >= COMPACT_MIN_BYTES:
+            return True
+        return oldest is not None and (time.time() - oldest) >= COMPACT_MAX_AGE_SEC
+
+    def _ensure_compactor(self) -> None:
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        with self._mu:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            t = threading.Thread(target=self._compact_loop, name="logs-compactor", daemon=True)
+            self._compactor = t
+            t.start()
+
+    def _compact_loop(self) -> None:
+        while True:
+            time.sleep(COMPACT_INTERVAL_SEC)
+            try:
+                self.compact()
+            except Exception as e:
+                print("[LOGS] compaction error:", e, flush=True)
+
+
+logs_journal = LogJournal(get_store("logs"), LOGS_JOURNAL_DIR)
+register_doc("logs", logs_journal.read)
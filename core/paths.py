@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 import pathlib
 import json
 from typing import Any
 
-BASE = pathlib.Path(__file__).resolve().parents[1]
+# 데이터 루트 — BASE_DIR 환경변수 있으면 거기 (테스트/별도 인스턴스), 없으면 프로젝트 폴더
+BASE = pathlib.Path(os.environ.get("BASE_DIR") or pathlib.Path(__file__).resolve().parents[1])
+BASE.mkdir(parents=True, exist_ok=True)
 FILES_DIR = BASE / "files"
 FILES_DIR.mkdir(exist_ok=True)
 
@@ -35,9 +38,25 @@ WATCH_PATH = ensure_json(BASE / "watch.json", {})
 ATTENDANCE_PATH = ensure_json(BASE / "attendance.json", {})
 ARRIVE_TIME_PATH = ensure_json(BASE / "arrive_time.json", {})
 
+# ✅ 오늘 화면 메타(연락/등원시간/순서) — DATA_DIR 환경변수 있으면 거기, 없으면 data/
+DATA_DIR = pathlib.Path(os.environ.get("DATA_DIR", str(BASE / "data")))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+CONTACT_PATH = ensure_json(DATA_DIR / "contact.json", {})
+ARRIVE_DAY_PATH = ensure_json(DATA_DIR / "arrive_time.json", {})  # 등원시간 {date: {sid: "HH:MM"}} (루트 arrive_time.json 은 구버전)
+
 TESTS_CFG_PATH = ensure_json(BASE / "tests-config.json", {"categories": {}})
 
 PAGE_FOLDERS_PATH = ensure_json(BASE / "page_folders.json", {})
 
 # ✅ 로그인/비번 저장소(별도 파일)
 AUTH_PATH = ensure_json(BASE / "auth.json", {})
+
+# ✅ logs 저널(append-only 세그먼트) 디렉터리 — logs.json 은 체크포인트
+LOGS_JOURNAL_DIR = BASE / "logs.journal"
+LOGS_JOURNAL_DIR.mkdir(exist_ok=True)
+
+# ✅ 변경 피드 (/api/changes) — (문서, date, sid) 키 append-only
+CHANGES_PATH = BASE / "changes.jsonl"
+
+# ✅ progress 최신 상태 뷰 (core/progressview.py) — progress 에서 다시 만들 수 있는 캐시
+PROGRESS_LATEST_PATH = BASE / "progress_latest.json"
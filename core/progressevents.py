@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.changes import changes
+from core.datestore import DateStore, get_store
+from core.storage import FrozenDict, save_atomic, thaw, utc_now_isoz
+
+# ─────────────────────────────────────────────
+# ✅ progress 상태 전이(transition) 저장
+#  - 예전 클라이언트는 날짜마다 학생의 mid→state 전체를 다시 저장 → 같은 "done" 이 매일 반복(파일 대부분)
+#  - 전이만 남김: progress[date][sid][mid] 는 "그 날짜 직전 상태와 다를 때만" 존재
+#    (모든 소비자가 날짜순으로 덮어쓰며 접으므로 결과는 동일)
+#  - PROGRESS_MODE=events : 저장할 때마다 들어온 날짜를 전이만 남기고 씀 (기본 snapshot = 그대로 저장)
+#    옛 날짜를 고치거나 지우면, 그 옛 상태에 기대 생략돼 있던 뒤 날짜에 옛 상태를 다시 적어 둠 (pin_later)
+#    → 그래서 안 바뀐 학생도 {sid: {}} 로 남김 (그 날짜에 기록이 있었다는 표시)
+#    logs 패치의 progress 필드도 서버에서 직전 상태와 달라진 mid 만 남김 (log_progress_changes)
+#  - 날짜별 상태가 필요하면 as-of 조회: (sid, mid) → 날짜/상태 정렬 목록에서 bisect
+#  - 기존 데이터 정리:  python -m core.progressevents migrate [--dry-run]
+#    (progress 문서 + logs 항목의 progress 필드, 원본은 progress.snapshot-<시각>.json 으로 보관)
+# ─────────────────────────────────────────────
+PROGRESS_MODE = os.environ.get("PROGRESS_MODE", "snapshot").strip().lower()
+
+
+def _fold(day: Any, cur: Dict[Tuple[str, str], Any], pairs) -> None:
+    """day 의 (sid, mid) 상태를 cur 에 덮어씀 (pairs 에 든 것만)"""
+    for sid, mids in (day.items() if isinstance(day, dict) else ()):
+        for mid, st in (mids.items() if isinstance(mids, dict) else ()):
+            if (str(sid), str(mid)) in pairs:
+                cur[(str(sid), str(mid))] = st
+
+
+def pin_later(old: Any, days: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], List[Tuple[str, str]]]:
+    """
+    전이 문서 old 에 days(날짜 교체, None = 삭제)를 합친 문서 + 옛 상태를 다시 적은 뒤 날짜들.
+    고친 날짜의 (sid, mid) 마다 다음 명시 전이까지 앞으로 훑어, 저장된 뒤 날짜의 누적 상태가
+    바뀌게 되는 첫 날짜 중 그 학생 기록이 있는 날짜(= 생략된 값이 옛 상태였던 날짜)에 예전 상태를 명시로 넣음
+    → 그 날짜 이후는 고치기 전과 같음. 학생 기록이 없는 날짜는 원래도 앞 날짜 값을 따름.
+    return: (합친 문서, {pin 한 날짜: 새 날짜 값}, pin 한 (date, sid))
+    """
+    old = old if isinstance(old, dict) else {}
+    merged = {d: v for d, v in old.items() if d not in days}
+    merged.update({d: v for d, v in days.items() if v is not None})
+    if not days:
+        return merged, {}, []
+    pairs = set()
+    for d in days:
+        for day in (old.get(d), days[d]):
+            for sid, mids in (day.items() if isinstance(day, dict) else ()):
+                pairs.update((str(sid), str(mid)) for mid in (mids if isinstance(mids, dict) else ()))
+
+    first = min(days)
+    cur_old: Dict[Tuple[str, str], Any] = {}
+    cur_new: Dict[Tuple[str, str], Any] = {}
+    pinned: Dict[str, Any] = {}
+    keys: Dict[Tuple[str, str], None] = {}
+    for d in sorted(set(old) | set(merged)):
+        _fold(old.get(d), cur_old, pairs)
+        if d not in merged:
+            continue
+        if d > first and d not in days:
+            day = merged[d]
+            for pair, st in cur_old.items():
+                if cur_new.get(pair) == st:
+                    continue
+                sid, mid = pair
+                if not isinstance(day.get(sid), dict) or mid in day[sid]:
+                    continue  # 그 날짜 기록 없음(앞 값을 따름) / 명시 전이 있음(양쪽 다 그 값)
+                if d not in pinned:
+                    pinned[d] = thaw(day)
+                pinned[d].setdefault(sid, {})[mid] = st
+                keys[(d, sid)] = None
+            if d in pinned:
+                merged[d] = pinned[d]
+        _fold(merged[d], cur_new, pairs)
+    return merged, pinned, list(keys)
+
+
+def dedup_days(data: Any, only: Iterable[str] | None = None) -> Dict[str, Any]:
+    """
+    {date: {sid: {mid: state}}} → 직전 상태와 같은 항목을 뺀 {date: day}.
+    only 가 있으면 그 날짜들만 정리해서 돌려줌(나머지 날짜는 직전 상태 계산에만 씀). 빈 날짜 값은 None.
+    """
+    data = data if isinstance(data, dict) else {}
+    only = None if only is None else set(only)
+    stop = max(only) if only else None
+    last: Dict[Tuple[str, str], Any] = {}
+    out: Dict[str, Any] = {}
+    for d in sorted(data):
+        if stop is not None and d > stop:
+            break
+        day = data[d]
+        if not isinstance(day, dict):
+            if only is None or d in only:
+                out[d] = day
+            continue
+        keep = only is None or d in only
+        new_day: Dict[str, Any] = {}
+        for sid, mids in day.items():
+            if not isinstance(mids, dict):
+                if keep:
+                    new_day[sid] = mids
+                continue
+            changed = {}
+            for mid, st in mids.items():
+                key = (str(sid), str(mid))
+                if key not in last or last[key] != st:
+                    changed[mid] = st
+                last[key] = st
+            if keep:
+                new_day[sid] = changed  # 안 바뀌었어도 {} 로 — 그 날짜 기록 있음 표시 (pin_later)
+        if keep:
+            out[d] = new_day or None
+    return out
+
+
+# ─────────────────────────────────────────────
+# as-of 인덱스: {sid: {mid: ([날짜...], [상태...])}} (문서 시그니처가 바뀔 때만 다시 만듦)
+# ─────────────────────────────────────────────
+class TransitionIndex:
+    def __init__(self, data: Any):
+        series: Dict[str, Dict[str, Tuple[List[str], List[Any]]]] = {}
+        for d in sorted(data if isinstance(data, dict) else {}):
+            day = data[d]
+            if not isinstance(day, dict):
+                continue
+            for sid, mids in day.items():
+                if not isinstance(mids, dict):
+                    continue
+                per = series.setdefault(str(sid), {})
+                for mid, st in mids.items():
+                    dates, states = per.setdefault(str(mid), ([], []))
+                    if states and states[-1] == st:
+                        continue
+                    dates.append(d)
+                    states.append(st)
+        self.series = series
+
+    def student(self, sid: str, date: str, inclusive: bool = True) -> Dict[str, Any]:
+        """date 시점(inclusive=False 면 그 직전) 학생 상태 {mid: state}"""
+        out = {}
+        pick = bisect_right if inclusive else bisect_left
+        for mid, (dates, states) in (self.series.get(str(sid)) or {}).items():
+            i = pick(dates, date)
+            if i:
+                out[mid] = states[i - 1]
+        return out
+
+    def snapshot(self, date: str, sids: Iterable[str] | None = None) -> Dict[str, Dict[str, Any]]:
+        """date 시점 {sid: {mid: state}} (상태가 하나도 없는 학생은 뺌)"""
+        out = {}
+        for sid in (self.series if sids is None else [str(s) for s in sids]):
+            st = self.student(sid, date)
+            if st:
+                out[sid] = st
+        return out
+
+    def transitions(self) -> int:
+        return sum(len(dates) for per in self.series.values() for dates, _ in per.values())
+
+
+class _IndexCache:
+    def __init__(self, name: str):
+        self.name = name
+        self._mu = threading.Lock()
+        self._sig = None
+        self._index: TransitionIndex | None = None
+
+    def get(self) -> TransitionIndex:
+        store = get_store(self.name)
+        sig = store.signature()
+        with self._mu:
+            if self._index is not None and self._sig == sig:
+                return self._index
+        index = TransitionIndex(store.read_all())
+        with self._mu:
+            self._sig, self._index = sig, index
+        return index
+
+
+progress_index = _IndexCache("progress")
+
+
+def progress_as_of(date: str, sids: Iterable[str] | None = None) -> Dict[str, Dict[str, Any]]:
+    return progress_index.get().snapshot(date, sids)
+
+
+def log_progress_changes(sid: str, date: str, prog: Dict[str, Any]) -> Dict[str, Any]:
+    """logs 항목 progress 필드 → 그 날짜 직전 progress 상태와 다른 mid 만 (migrate 와 같은 기준)"""
+    prior = progress_index.get().student(sid, date, inclusive=False)
+    return {mid: st for mid, st in prog.items() if prior.get(str(mid)) != st}
+
+
+# ─────────────────────────────────────────────
+# 저장소 모드: 쓰기 때 전이만 남김 (읽기는 그대로 통과)
+# ─────────────────────────────────────────────
+class TransitionDateStore(DateStore):
+    def __init__(self, inner: DateStore):
+        self.name = inner.name
+        self.inner = inner
+
+    def signature(self) -> Any:
+        return self.inner.signature()
+
+    def read_all(self) -> FrozenDict:
+        return self.inner.read_all()
+
+    def read_date(self, date: str) -> Any:
+        return self.inner.read_date(date)
+
+    def read_range(self, start: Optional[str], end: Optional[str]) -> FrozenDict:
+        return self.inner.read_range(start, end)
+
+    def read_student(self, sid: str, start: Optional[str] = None, end: Optional[str] = None) -> FrozenDict:
+        return self.inner.read_student(sid, start, end)
+
+    def lock(self):
+        return self.inner.lock()
+
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        with self.lock():
+            merged, pinned, keys = pin_later(self.inner.read_all(), days)
+            touched = [d for d, v in days.items() if v is not None] + list(pinned)
+            out = {d: None for d, v in days.items() if v is None}
+            out.update(dedup_days(merged, touched))
+            fut = self.inner.write_dates(out)
+            if not pinned:
+                return fut
+            # 호출자는 자기가 고친 키만 기록 → 여기서 옛 상태를 다시 적은 뒤 날짜 키도 변경 피드에
+            return changes.record_after(fut, self.name, keys)
+
+    def replace_all(self, obj: Any) -> None:
+        with self.lock():
+            self.inner.replace_all({d: v for d, v in dedup_days(obj).items() if v is not None})
+
+
+# ─────────────────────────────────────────────
+# 마이그레이션: 기존 스냅샷 → 전이만
+# ─────────────────────────────────────────────
+def _size(obj: Any) -> int:
+    return len(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _parse_ms(obj: Any) -> float:
+    raw = json.dumps(obj, ensure_ascii=False)
+    t0 = time.perf_counter()
+    json.loads(raw)
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def migrate(dry_run: bool = False) -> dict:
+    from core.logjournal import logs_journal
+    from core.paths import BASE
+
+    store = get_store("progress")
+    with store.lock():
+        src = thaw(store.read_all())
+        slim = {d: v for d, v in dedup_days(src).items() if v is not None}
+        index = TransitionIndex(slim)
+        report = {
+            "progress": {
+                "dates": [len(src), len(slim)],
+                "bytes": [_size(src), _size(slim)],
+                "parseMs": [_parse_ms(src), _parse_ms(slim)],
+                "transitions": index.transitions(),
+            },
+        }
+        if not dry_run:
+            backup = BASE / f"progress.snapshot-{utc_now_isoz().replace(':', '')[:15]}.json"
+            save_atomic(backup, src)
+            target = store.inner if isinstance(store, TransitionDateStore) else store
+            target.replace_all(slim)
+            report["progress"]["backup"] = str(backup)
+
+    # logs 항목의 progress 필드: 그 날짜 직전 progress 상태와 다른 mid 만
+    ops = []
+    before = after = 0
+    with logs_journal.lock():
+        logs = logs_journal.read()
+        for d, day in logs.items():
+            if not isinstance(day, dict):
+                continue
+            for sid, entry in day.items():
+                prog = entry.get("progress") if isinstance(entry, dict) else None
+                if not isinstance(prog, dict) or not prog:
+                    continue
+                prior = index.student(sid, d, inclusive=False)
+                changed = {mid: st for mid, st in prog.items() if prior.get(str(mid)) != st}
+                before += len(prog)
+                after += len(changed)
+                if changed == thaw(prog):
+                    continue
+                ops.append((d, str(sid), {"progress": changed} if changed else {"__clear": ["progress"]}))
+        if not dry_run and ops:
+            logs_journal.append(ops)
+    report["logs"] = {"entries": len(ops), "mids": [before, after]}
+    return report
+
+
+def _main(argv: Iterable[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m core.progressevents")
+    ap.add_argument("command", choices=["migrate"])
+    ap.add_argument("--dry-run", action="store_true", help="크기/파싱 시간만 계산, 저장 안 함")
+    args = ap.parse_args(argv)
+    report = migrate(dry_run=args.dry_run)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List
+
+from core.datestore import DateStore, get_store
+from core.paths import PROGRESS_LATEST_PATH
+from core.storage import FrozenDict, etag_of, freeze, load, save_coalesced
+
+# ─────────────────────────────────────────────
+# ✅ progress 최신 상태 뷰 {sid: {mid: state}}
+#  - progress 는 {date: {sid: {mid: state}}} 전체 이력 → 매번 전 날짜 fold 하지 않도록 미리 유지
+#  - 내부 형태 {sid: {mid: [date, state]}} (그 상태가 나온 날짜를 같이 들고 있어야 옛 날짜 수정을 걸러냄)
+#  - progress 쓰기 때마다 바뀐 (sid, mid) 만 그 학생 이력(read_student)에서 다시 계산(apply)
+#    (옛 날짜 수정/삭제가 뒤 날짜 값에 영향 줄 수 있음 — PROGRESS_MODE=events 의 pin_later)
+#    못 따라가는 경우(다른 워커가 씀)만 다음 조회 때 전체 재계산
+#  - progress_latest.json 에 (progress 시그니처, 뷰) 저장 → 재시작/다른 워커도 재계산 없이 사용
+# ─────────────────────────────────────────────
+
+
+class LatestProgress:
+    def __init__(self, store: DateStore, path):
+        self.store = store
+        self.path = path
+        self._mu = threading.Lock()
+        self._tag: str | None = None  # 뷰가 반영한 progress 상태 (signature 의 etag)
+        self._dirty = False
+        self._view: Dict[str, Dict[str, List]] = {}
+        self._frozen: FrozenDict | None = None
+        self.rebuilds = 0
+
+    # ── 조회 ─────────────────────────────────
+    def get(self) -> FrozenDict:
+        """{sid: {mid: state}} 최신 상태 (읽기 전용)"""
+        tag = etag_of(self.store.signature())
+        with self._mu:
+            fresh = self._tag == tag and not self._dirty
+        if not fresh:
+            self._load_or_rebuild(tag)
+        with self._mu:
+            if self._frozen is None:
+                self._frozen = freeze({
+                    sid: {mid: ds[1] for mid, ds in mids.items()} for sid, mids in self._view.items()
+                })
+            return self._frozen
+
+    def student(self, sid: str) -> FrozenDict:
+        v = self.get().get(str(sid))
+        return v if isinstance(v, dict) else FrozenDict()
+
+    # ── 쓰기 반영 ─────────────────────────────
+    def apply(self, before: Any, old: Any, new: Any) -> None:
+        """
+        progress 저장 직후(같은 락 안에서) 호출: 저장 전/후 문서를 비교해 바뀐 (sid, mid) 만 반영.
+        before = 저장 전 store.signature(), old/new 는 {date: {sid: {mid: state}}}
+        (new 가 부분이면 바뀐 날짜만 넣어도 됨)
+        """
+        old = old if isinstance(old, dict) else {}
+        new = new if isinstance(new, dict) else {}
+        tag = etag_of(self.store.signature())
+        with self._mu:
+            if self._dirty or self._tag != etag_of(before):
+                return  # 뷰가 저장 전 상태가 아님 → 다음 get() 에서 파일/재계산
+
+        affected: Dict[str, set] = {}
+        for d in set(old) | set(new):
+            if old.get(d) == new.get(d):
+                continue
+            for day in (old.get(d), new.get(d)):
+                for sid, mids in (day.items() if isinstance(day, dict) else ()):
+                    if isinstance(mids, dict):
+                        affected.setdefault(str(sid), set()).update(str(mid) for mid in mids)
+        # 그 날짜 값만 보고 고르면 옛 날짜 수정/삭제 때 재계산과 달라짐 → 학생 이력에서 마지막 상태를 다시 찾음
+        fresh = {sid: self._latest(sid, mids) for sid, mids in affected.items()}
+
+        with self._mu:
+            if self._dirty or self._tag != etag_of(before):
+                return
+            for sid, latest in fresh.items():
+                sm = self._view.setdefault(sid, {})
+                for mid in affected[sid]:
+                    if mid in latest:
+                        sm[mid] = latest[mid]
+                    else:
+                        sm.pop(mid, None)
+            self._tag = tag
+            self._frozen = None
+            self._persist()
+
+    def _latest(self, sid: str, mids: set) -> Dict[str, List]:
+        """학생 이력에서 mids 각각의 마지막 [date, state] (재계산과 같은 기준)"""
+        out: Dict[str, List] = {}
+        hist = self.store.read_student(sid)
+        for d in sorted(hist):
+            entry = hist[d].get(sid) if isinstance(hist[d], dict) else None
+            for mid, st in (entry.items() if isinstance(entry, dict) else ()):
+                if str(mid) in mids:
+                    out[str(mid)] = [d, st]
+        return out
+
+    # ── 내부 ─────────────────────────────────
+    def _persist(self) -> None:
+        save_coalesced(self.path, {"tag": self._tag, "view": self._view})
+
+    def _load_or_rebuild(self, tag: str) -> None:
+        saved = load(self.path)
+        if isinstance(saved, dict) and saved.get("tag") == tag and isinstance(saved.get("view"), dict):
+            view = {sid: {mid: list(ds) for mid, ds in mids.items()} for sid, mids in saved["view"].items()}
+            with self._mu:
+                self._view, self._tag, self._dirty, self._frozen = view, tag, False, None
+            return
+
+        with self.store.lock():
+            tag = etag_of(self.store.signature())
+            with self._mu:
+                if self._tag == tag and not self._dirty:
+                    return  # 다른 스레드가 그새 다시 만듦
+            data = self.store.read_all()
+            view: Dict[str, Dict[str, List]] = {}
+            for d in sorted(data):
+                day = data[d]
+                if not isinstance(day, dict):
+                    continue
+                for sid, mids in day.items():
+                    if not isinstance(mids, dict):
+                        continue
+                    sm = view.setdefault(str(sid), {})
+                    for mid, st in mids.items():
+                        sm[str(mid)] = [d, st]
+            with self._mu:
+                self._view, self._tag, self._dirty, self._frozen = view, tag, False, None
+                self.rebuilds += 1
+                self._persist()
+
+    def stats(self) -> dict:
+        with self._mu:
+            return {
+                "students": len(self._view),
+                "entries": sum(len(m) for m in self._view.values()),
+                "rebuilds": self.rebuilds,
+                "dirty": self._dirty,
+            }
+
+
+latest_progress = LatestProgress(get_store("progress"), PROGRESS_LATEST_PATH)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from core.absent import load_absent
+from core.paths import ABS_PATH, EXTRA_PATH, STU_PATH
+from core.storage import doc_signature, load
+
+# ─────────────────────────────────────────────
+# ✅ 날짜별 수업 명단 인덱스 (/api/today, /api/attend)
+#  - students.json → 요일별 sid 목록(students 순서) + sid → 학생 + sid → 순서
+#  - extra_attend.json → 날짜별 보강 sid 집합 / absent.json → 날짜별 결석 sid 집합
+#  - 문서마다 doc_signature 가 바뀔 때만 다시 만듦 → 명단 계산은 그 날 명단 크기만큼
+# ─────────────────────────────────────────────
+WEEKDAYS = "월화수목금토일"
+DAY_FIELDS = ("day1", "day2", "day3")
+
+
+class _StudentIndex:
+    def __init__(self, students: Any):
+        self.by_sid: Dict[str, dict] = {}
+        self.pos: Dict[str, int] = {}
+        by_wday: Dict[str, List[str]] = {w: [] for w in WEEKDAYS}
+        for s in students if isinstance(students, list) else []:
+            if not isinstance(s, dict) or s.get("id") is None:
+                continue
+            sid = str(s["id"])
+            self.by_sid[sid] = s  # 같은 id 가 또 있으면 뒤엣것 (예전 dict 병합과 동일)
+            if sid in self.pos:
+                continue
+            self.pos[sid] = len(self.pos)
+            for w in {str(s.get(f) or "")[:1] for f in DAY_FIELDS}:
+                if w in by_wday:
+                    by_wday[w].append(sid)
+        self.by_wday: Dict[str, Tuple[str, ...]] = {w: tuple(v) for w, v in by_wday.items()}
+
+
+def _date_sets(raw: Any) -> Dict[str, FrozenSet[str]]:
+    out = {}
+    for d, ids in (raw.items() if isinstance(raw, dict) else []):
+        if isinstance(ids, list):
+            out[str(d)] = frozenset(map(str, ids))
+    return out
+
+
+class RosterIndex:
+    def __init__(self):
+        self._mu = threading.Lock()
+        self._cache: Dict[str, Tuple[Any, Any]] = {}  # 문서 → (시그니처, 인덱스)
+        self.rebuilds = 0
+
+    def _get(self, key: str, path, build):
+        sig = doc_signature(path)
+        with self._mu:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] == sig:
+                return hit[1]
+        val = build()
+        with self._mu:
+            self._cache[key] = (sig, val)
+            self.rebuilds += 1
+        return val
+
+    def students(self) -> _StudentIndex:
+        return self._get("students", STU_PATH, lambda: _StudentIndex(load(STU_PATH)))
+
+    def extras(self) -> Dict[str, FrozenSet[str]]:
+        return self._get("extra", EXTRA_PATH, lambda: _date_sets(load(EXTRA_PATH)))
+
+    def absent(self) -> Dict[str, FrozenSet[str]]:
+        return self._get("absent", ABS_PATH, lambda: _date_sets(load_absent().get("by_date")))
+
+    def version(self, target: dt.date) -> tuple:
+        return (
+            target.isoformat(), doc_signature(STU_PATH), doc_signature(EXTRA_PATH), doc_signature(ABS_PATH),
+        )
+
+    def sids_for_date(self, target: dt.date) -> List[str]:
+        """정규(요일) + 보강 - 결석, students 순서 (정규 먼저, 그다음 보강)"""
+        idx = self.students()
+        key = target.isoformat()
+        regular = idx.by_wday.get(WEEKDAYS[target.weekday()], ())
+        seen = set(regular)
+        extra = sorted(
+            (sid for sid in self.extras().get(key, ()) if sid in idx.pos and sid not in seen),
+            key=idx.pos.__getitem__,
+        )
+        absent = self.absent().get(key, frozenset())
+        return [sid for sid in (*regular, *extra) if sid not in absent]
+
+    def day_parts(self, target: dt.date) -> Dict[str, Any]:
+        """달력용 한 날짜: 정규/보강/결석 sid (각각 원본 그대로) + 실제 인원 수"""
+        idx = self.students()
+        key = target.isoformat()
+        regular = idx.by_wday.get(WEEKDAYS[target.weekday()], ())
+        extra = self.extras().get(key, frozenset())
+        absent = self.absent().get(key, frozenset())
+        return {
+            "regular": list(regular),
+            "extra": sorted(extra, key=lambda sid: idx.pos.get(sid, len(idx.pos))),
+            "absent": sorted(absent),
+            "count": len(self.sids_for_date(target)),
+        }
+
+    def students_for_date(self, target: dt.date) -> List[dict]:
+        by_sid = self.students().by_sid
+        return [by_sid[sid] for sid in self.sids_for_date(target)]
+
+
+roster = RosterIndex()
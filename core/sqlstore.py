@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.datestore import DATE_DOCS, DateStore
+from core.paths import BASE
+from core.storage import FrozenDict, all_done, freeze, load
+
+# ─────────────────────────────────────────────
+# ✅ SQLite 날짜키 저장소 (STORAGE_BACKEND=sqlite)
+#  - WAL 모드, (doc, date, sid) PK + (doc, sid, date) 인덱스
+#  - progress 는 models.py 의 progress 테이블 모양 그대로 정규화
+#      (student_id, date, video_id=mid, status)  + mid 인덱스
+#  - 나머지(logs/watch/updates/tests)는 (date, sid) 단위 JSON 행
+#  - 기존 JSON → DB:  python -m core.sqlstore import [doc ...]
+# ─────────────────────────────────────────────
+SQLITE_PATH = os.environ.get("SQLITE_PATH", str(BASE / "server.db"))
+
+_WHOLE_DAY = ""  # {sid: ...} 모양이 아니거나 빈 날짜값은 sid="" 한 줄로 통째 저장
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS date_docs (
+    doc   TEXT NOT NULL,
+    date  TEXT NOT NULL,
+    sid   TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (doc, date, sid)
+);
+CREATE INDEX IF NOT EXISTS ix_date_docs_sid ON date_docs (doc, sid, date);
+
+CREATE TABLE IF NOT EXISTS progress (
+    student_id TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    video_id   TEXT NOT NULL,
+    status     TEXT,
+    PRIMARY KEY (student_id, date, video_id)
+);
+CREATE INDEX IF NOT EXISTS ix_progress_date ON progress (date);
+CREATE INDEX IF NOT EXISTS ix_progress_mid ON progress (video_id, date);
+
+CREATE TABLE IF NOT EXISTS doc_versions (
+    doc     TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+
+def _dumps(v: Any) -> str:
+    return json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+
+
+class _Db:
+    """스레드별 커넥션 (sqlite3 커넥션은 스레드 간 공유 X)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._init_mu = threading.Lock()
+        self._inited = False
+        self.ident: Tuple = ()  # DB 파일 식별(재생성되면 버전 번호가 다시 1부터라 구분용)
+
+    def conn(self) -> sqlite3.Connection:
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(self.path, timeout=10.0)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = c
+            with self._init_mu:
+                if not self._inited:
+                    c.executescript(_SCHEMA)
+                    st = os.stat(self.path)
+                    self.ident = (st.st_dev, st.st_ino)
+                    self._inited = True
+        return c
+
+
+_db = _Db(SQLITE_PATH)
+
+
+class SqliteDateStore(DateStore):
+    def __init__(self, name: str, db: _Db = _db):
+        self.name = name
+        self.db = db
+        self._mu = threading.Lock()
+        self._all_sig = None
+        self._all_view: FrozenDict | None = None
+
+    # ── 버전 ─────────────────────────────────
+    def signature(self) -> Any:
+        row = self.db.conn().execute(
+            "SELECT version FROM doc_versions WHERE doc = ?", (self.name,)
+        ).fetchone()
+        return (self.db.ident, row[0] if row else 0)
+
+    def _bump(self, c: sqlite3.Connection) -> None:
+        c.execute(
+            "INSERT INTO doc_versions (doc, version) VALUES (?, 1) "
+            "ON CONFLICT(doc) DO UPDATE SET version = version + 1",
+            (self.name,),
+        )
+
+    # ── 행 ↔ 문서 ─────────────────────────────
+    def _select(self, where: str, args: Tuple) -> Dict[str, Any]:
+        c = self.db.conn()
+        out: Dict[str, Any] = {}
+        for date, sid, value in c.execute(
+            f"SELECT date, sid, value FROM date_docs WHERE doc = ? {where} ORDER BY date, rowid",
+            (self.name,) + args,
+        ):
+            v = json.loads(value)
+            if sid == _WHOLE_DAY:
+                out[date] = v
+            else:
+                day = out.setdefault(date, {})
+                if isinstance(day, dict):
+                    day[sid] = v
+        if self.name == "progress":
+            pwhere = where.replace("sid", "student_id")
+            for date, sid, mid, status in c.execute(
+                f"SELECT date, student_id, video_id, status FROM progress WHERE 1=1 {pwhere} "
+                "ORDER BY date, rowid",
+                args,
+            ):
+                day = out.setdefault(date, {})
+                if isinstance(day, dict):
+                    day.setdefault(sid, {})[mid] = status
+        return out
+
+    def _delete_dates(self, c: sqlite3.Connection, dates: List[str]) -> None:
+        for d in dates:
+            c.execute("DELETE FROM date_docs WHERE doc = ? AND date = ?", (self.name, d))
+            if self.name == "progress":
+                c.execute("DELETE FROM progress WHERE date = ?", (d,))
+
+    def _insert_day(self, c: sqlite3.Connection, date: str, day: Any) -> None:
+        if not isinstance(day, dict) or not day:
+            c.execute(
+                "INSERT INTO date_docs (doc, date, sid, value) VALUES (?, ?, ?, ?)",
+                (self.name, date, _WHOLE_DAY, _dumps(day)),
+            )
+            return
+        for sid, v in day.items():
+            sid = str(sid)
+            if (
+                self.name == "progress"
+                and isinstance(v, dict)
+                and all(isinstance(st, str) for st in v.values())
+            ):
+                c.executemany(
+                    "INSERT INTO progress (student_id, date, video_id, status) VALUES (?, ?, ?, ?)",
+                    [(sid, date, str(mid), st) for mid, st in v.items()],
+                )
+                if not v:
+                    c.execute(
+                        "INSERT INTO date_docs (doc, date, sid, value) VALUES (?, ?, ?, ?)",
+                        (self.name, date, sid, "{}"),
+                    )
+                continue
+            c.execute(
+                "INSERT INTO date_docs (doc, date, sid, value) VALUES (?, ?, ?, ?)",
+                (self.name, date, sid, _dumps(v)),
+            )
+
+    # ── 읽기 ─────────────────────────────────
+    def read_all(self) -> FrozenDict:
+        sig = self.signature()
+        with self._mu:
+            if self._all_view is not None and sig == self._all_sig:
+                return self._all_view
+        view = freeze(self._select("", ()))
+        with self._mu:
+            self._all_sig = sig
+            self._all_view = view
+        return view
+
+    def read_date(self, date: str) -> Any:
+        return freeze(self._select("AND date = ?", (date,)).get(date))
+
+    def read_range(self, start: Optional[str], end: Optional[str]) -> FrozenDict:
+        where, args = "", ()
+        if start:
+            where += " AND date >= ?"
+            args += (start,)
+        if end:
+            where += " AND date <= ?"
+            args += (end,)
+        return freeze(self._select(where, args))
+
+    def read_student(self, sid: str, start: Optional[str] = None, end: Optional[str] = None) -> FrozenDict:
+        where, args = " AND sid = ?", (str(sid),)
+        if start:
+            where += " AND date >= ?"
+            args += (start,)
+        if end:
+            where += " AND date <= ?"
+            args += (end,)
+        return freeze(self._select(where, args))
+
+    # ── 쓰기 ─────────────────────────────────
+    def write_dates(self, days: Dict[str, Any]) -> Future:
+        # 트랜잭션 커밋 = 반영 완료 → 이미 끝난 Future 반환
+        if not days:
+            return all_done([])
+        c = self.db.conn()
+        with c:
+            self._delete_dates(c, list(days))
+            for d, v in days.items():
+                if v is not None:
+                    self._insert_day(c, d, v)
+            self._bump(c)
+        return all_done([])
+
+    def replace_all(self, obj: Any) -> None:
+        obj = obj if isinstance(obj, dict) else {}
+        with self.lock():
+            cur = self.read_all()
+            changed = {d: v for d, v in obj.items() if cur.get(d) != v}
+            for d in cur:
+                if d not in obj:
+                    changed[d] = None
+            self.write_dates(changed)
+
+
+# ─────────────────────────────────────────────
+# 1회성 임포트 도구
+#   python -m core.sqlstore import [doc ...]
+#   (현재 JSON 파일 내용으로 해당 doc 을 통째로 교체)
+# ─────────────────────────────────────────────
+def import_json(name: str) -> int:
+    src = load(DATE_DOCS[name])
+    src = src if isinstance(src, dict) else {}
+    store = SqliteDateStore(name)
+    c = store.db.conn()
+    with c:
+        c.execute("DELETE FROM date_docs WHERE doc = ?", (name,))
+        if name == "progress":
+            c.execute("DELETE FROM progress")
+        for d, v in src.items():
+            store._insert_day(c, str(d), v)
+        store._bump(c)
+    return len(src)
+
+
+def _main(argv: Iterable[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m core.sqlstore")
+    ap.add_argument("command", choices=["import"])
+    ap.add_argument("docs", nargs="*", default=list(DATE_DOCS))
+    args = ap.parse_args(argv)
+
+    for name in args.docs:
+        if name not in DATE_DOCS:
+            raise SystemExit(f"unknown doc: {name} (choices: {', '.join(DATE_DOCS)})")
+        n = import_json(name)
+        print(f"[IMPORT] {name}: {n} dates → {SQLITE_PATH}")
+
+
+if __name__ == "__main__":
+    _main()
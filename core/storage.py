@@ -1,24 +1,209 @@
 from __future__ import annotations
 
+import atexit
 import datetime as dt
+import hashlib
 import json
 import os
+import threading
 import time
 import uuid
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List
 
-from flask import jsonify, make_response
+from flask import jsonify, make_response, request
+
+from core.locks import locks
 
 
 def utc_now_isoz() -> str:
     return dt.datetime.now(dt.timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+# ─────────────────────────────────────────────
+# ✅ 읽기 전용 뷰 (캐시 공유 객체 보호)
+#  - dict/list 서브클래스라 isinstance/jsonify/json.dumps 그대로 동작
+#  - 수정 시도하면 TypeError → 수정할 거면 load_copy() 사용
+# ─────────────────────────────────────────────
+def _readonly(self, *_a, **_kw):
+    raise TypeError("read-only document view (use load_copy() to modify)")
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    setdefault = update = pop = popitem = clear = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+class FrozenList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+
+def freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        if isinstance(obj, FrozenDict):
+            return obj
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        if isinstance(obj, FrozenList):
+            return obj
+        return FrozenList(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """읽기 전용 뷰 → 일반 dict/list 깊은 복사"""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# ─────────────────────────────────────────────
+# ✅ 프로세스 공용 문서 캐시
+#  - key: 경로, 검증: (mtime_ns, size, inode) → 안 바뀌었으면 stat 한 번으로 끝
+#  - save_atomic 하면 새 값으로 갱신
+#  - 파일 크기 합(바이트 예산) 넘으면 오래 안 쓴 것부터 제거(LRU)
+# ─────────────────────────────────────────────
+DOC_CACHE_MAX_BYTES = int(os.environ.get("DOC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def _stat_sig(path) -> tuple | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class _DocCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (sig, view, nbytes)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, sig: tuple):
+        with self._lock:
+            ent = self._entries.get(key)
+            if ent is None or ent[0] != sig:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ent[1]
+
+    def put(self, key: str, sig: tuple, view: Any) -> None:
+        nbytes = sig[1]
+        with self._lock:
+            self._drop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (sig, view, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        ent = self._entries.pop(key, None)
+        if ent is not None:
+            self._bytes -= ent[2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_doc_cache = _DocCache(DOC_CACHE_MAX_BYTES)
+
+
+def _cache_key(path) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def _empty_for(path) -> Any:
+    return FrozenDict() if str(path).endswith(".json") else None
+
+
 def load(path) -> Any:
+    """
+    읽기 전용 뷰 반환(캐시 공유 객체). 파일이 안 바뀌었으면 재파싱 없음.
+    ❗ 수정하면 TypeError → read-modify-write 는 load_copy() 사용
+    """
+    key = _cache_key(path)
+    pending = _write_behind.peek(key)
+    if pending is not None:
+        return pending  # 아직 flush 안 된 최신 값 (같은 프로세스 read-your-writes)
+
+    sig = _stat_sig(path)
+    if sig is None:
+        _doc_cache.invalidate(key)
+        return _empty_for(path)
+
+    view = _doc_cache.get(key, sig)
+    if view is not None:
+        return view
+
     try:
-        return json.loads(path.read_text("utf-8"))
+        with open(path, "rb") as f:
+            raw = f.read()
+            # 읽는 사이에 교체됐을 수 있으니 읽은 fd 기준 시그니처로 저장
+            st = os.fstat(f.fileno())
+        view = freeze(json.loads(raw.decode("utf-8")))
     except Exception:
-        return {} if str(path).endswith(".json") else None
+        return _empty_for(path)
+
+    _doc_cache.put(key, (st.st_mtime_ns, st.st_size, st.st_ino), view)
+    return view
+
+
+def load_copy(path) -> Any:
+    """수정용 깊은 복사본 (캐시된 뷰에서 복사 → 파일 재파싱 없음)"""
+    return thaw(load(path))
+
+
+# 세대 번호는 프로세스마다 0부터 → 재시작/다른 워커와 안 겹치게 프로세스 식별자 붙임
+_PROCESS_ID = uuid.uuid4().hex[:12]
+
+
+def doc_signature(path) -> Any:
+    """문서 상태 식별자: 보류 중인 쓰기가 있으면 그 세대, 아니면 파일 시그니처"""
+    gen = _write_behind.generation(_cache_key(path))
+    if gen is not None:
+        return ("pending", _PROCESS_ID, gen)
+    return _stat_sig(path)
+
+
+def doc_cache_stats() -> dict:
+    return _doc_cache.stats()
 
 
 def save_atomic(path, obj: Any) -> None:
@@ -27,14 +212,39 @@ def save_atomic(path, obj: Any) -> None:
     Windows에서 WinError 32(다른 프로세스가 파일 사용 중) 뜨는 케이스가 있어:
     - tmp 파일명을 고유하게 만들고
     - os.replace를 짧게 몇 번 재시도
+    교체 성공하면 문서 캐시도 새 값으로 갱신.
+    같은 파일에 보류 중인 save_coalesced 가 있으면 이 쓰기가 대신한다.
     """
+    superseded = _write_behind.take(_cache_key(path))
+    try:
+        _write_file_atomic(path, obj)
+    except BaseException as e:
+        _resolve(superseded, e)
+        raise
+    _resolve(superseded, None)
+
+
+def _write_file_atomic(path, obj: Any, fsync: bool = False) -> None:
+    key = _cache_key(path)
     tmp = path.with_suffix(path.suffix + f".{uuid.uuid4().hex}.tmp")
-    tmp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), "utf-8")
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    # os.replace는 inode/mtime을 그대로 옮기므로 tmp 시그니처 = 교체 후 시그니처
+    sig = _stat_sig(tmp)
 
     last_err = None
     for _ in range(10):
         try:
             os.replace(tmp, path)
+            if sig is None:
+                _doc_cache.invalidate(key)
+            else:
+                # obj 그대로가 아니라 쓴 JSON 을 다시 읽은 값으로 캐시 (int 키·tuple 등이 디스크 읽기와 같게)
+                _doc_cache.put(key, sig, freeze(json.loads(text)))
             return
         except PermissionError as e:
             last_err = e
@@ -54,6 +264,215 @@ def save_atomic(path, obj: Any) -> None:
         raise last_err
 
 
+# ─────────────────────────────────────────────
+# ✅ 쓰기 합치기(group commit)
+#  - save_coalesced(path, obj) → Future (파일에 fsync 까지 끝나면 완료)
+#  - 같은 파일은 WRITE_COALESCE_MS 창마다 최대 1번만 다시 씀
+#    (직전 flush 후 창이 지났으면 바로 씀 → 단발 쓰기는 지연 없음)
+#  - 보류 중인 값은 load() 가 바로 돌려줌, 종료 시 전부 flush
+# ─────────────────────────────────────────────
+WRITE_COALESCE_MS = int(os.environ.get("WRITE_COALESCE_MS", "200"))
+
+
+def _resolve(futures: List[Future], err: BaseException | None) -> None:
+    for fut in futures:
+        if fut.done() or not fut.set_running_or_notify_cancel():
+            continue  # 이미 끝났거나 호출 쪽에서 cancel 한 Future
+        if err is None:
+            fut.set_result(True)
+        else:
+            fut.set_exception(err)
+
+
+class _WriteBehind:
+    def __init__(self, window_sec: float):
+        self.window_sec = window_sec
+        self._cv = threading.Condition()
+        # key -> {"path", "view", "futures", "due", "gen"}
+        self._pending: Dict[str, dict] = {}
+        self._inflight: Dict[str, dict] = {}  # 쓰는 중인 값 (파일 교체 전까지 load() 가 봐야 함)
+        self._last_flush: Dict[str, float] = {}
+        self._gen = 0
+        self._thread: threading.Thread | None = None
+        self.flushes = 0
+        self.submits = 0
+
+    def submit(self, path, obj: Any) -> Future:
+        key = _cache_key(path)
+        fut: Future = Future()
+        view = freeze(obj)
+        with self._cv:
+            self._gen += 1
+            self.submits += 1
+            ent = self._pending.get(key)
+            if ent is None:
+                due = max(time.monotonic(), self._last_flush.get(key, 0.0) + self.window_sec)
+                ent = {"path": path, "futures": [], "due": due}
+                self._pending[key] = ent
+            ent["view"] = view
+            ent["gen"] = self._gen
+            ent["futures"].append(fut)
+            self._ensure_thread()
+            self._cv.notify()
+        return fut
+
+    def peek(self, key: str) -> Any:
+        with self._cv:
+            ent = self._pending.get(key) or self._inflight.get(key)
+            return ent["view"] if ent is not None else None
+
+    def generation(self, key: str) -> int | None:
+        with self._cv:
+            ent = self._pending.get(key) or self._inflight.get(key)
+            return ent["gen"] if ent is not None else None
+
+    def take(self, key: str) -> List[Future]:
+        """보류 중인 쓰기를 꺼냄(직접 save_atomic 이 대신 쓸 때)"""
+        with self._cv:
+            ent = self._pending.pop(key, None)
+            return ent["futures"] if ent is not None else []
+
+    def flush(self, key: str | None = None) -> None:
+        """보류 중인 쓰기를 지금 바로 flush (key=None 이면 전부)"""
+        with self._cv:
+            keys = [key] if key is not None else list(self._pending)
+            batch = [self._pop_locked(k) for k in keys if k in self._pending]
+        self._write_batch(batch)
+
+    def _pop_locked(self, key: str):
+        ent = self._pending.pop(key)
+        self._inflight[key] = ent
+        return key, ent
+
+    def _write_batch(self, batch) -> None:
+        for key, ent in batch:
+            err = None
+            try:
+                _write_file_atomic(ent["path"], ent["view"], fsync=True)
+            except BaseException as e:
+                # 실패는 Future 예외로 전달 (result()/all_done/record_after 에서 그대로 받음)
+                err = e
+                print("[STORAGE] coalesced write failed:", ent["path"], e, flush=True)
+            with self._cv:
+                if self._inflight.get(key) is ent:
+                    del self._inflight[key]
+                self._last_flush[key] = time.monotonic()
+                self.flushes += 1
+            _resolve(ent["futures"], err)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                now = time.monotonic()
+                due = min(ent["due"] for ent in self._pending.values())
+                if due > now:
+                    self._cv.wait(due - now)
+                    continue
+                batch = [self._pop_locked(k) for k, ent in list(self._pending.items())
+                         if ent["due"] <= now]
+            self._write_batch(batch)
+
+    def stats(self) -> dict:
+        with self._cv:
+            return {
+                "pending": len(self._pending),
+                "submits": self.submits,
+                "flushes": self.flushes,
+                "window_ms": int(self.window_sec * 1000),
+            }
+
+
+_write_behind = _WriteBehind(WRITE_COALESCE_MS / 1000.0)
+atexit.register(_write_behind.flush)
+
+
+def save_coalesced(path, obj: Any) -> Future:
+    """
+    save_atomic 의 합치기 버전. 반환 Future.result() 로 디스크 반영까지 기다릴 수 있음.
+    WRITE_COALESCE_MS=0 이면 즉시 동기 저장.
+    """
+    if _write_behind.window_sec <= 0:
+        fut: Future = Future()
+        try:
+            save_atomic(path, obj)
+            fut.set_result(True)
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+    fut = _write_behind.submit(path, obj)
+    # 디스크 반영 전까지 다른 워커(프로세스)가 옛 파일로 read-modify-write 하지 않게
+    locks.hold_until(path, fut)
+    return fut
+
+
+def all_done(futures: List[Future]) -> Future:
+    """여러 저장 Future 를 하나로 묶음 (전부 끝나면 완료, 하나라도 실패하면 그 예외)"""
+    out: Future = Future()
+    futures = list(futures)
+    if not futures:
+        out.set_result(True)
+        return out
+    remaining = [len(futures)]
+    mu = threading.Lock()
+
+    def _done(f: Future) -> None:
+        with mu:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if out.done():
+            return
+        err = f.exception()
+        if err is not None:
+            out.set_exception(err)
+        elif last:
+            out.set_result(True)
+
+    for f in futures:
+        f.add_done_callback(_done)
+    return out
+
+
+def flush_pending(path=None) -> None:
+    _write_behind.flush(_cache_key(path) if path is not None else None)
+
+
+def write_behind_stats() -> dict:
+    return _write_behind.stats()
+
+
+# ─────────────────────────────────────────────
+# ✅ 조건부 GET (ETag / If-None-Match)
+#  - ETag = 문서 버전(doc_signature / store.signature 등) 해시
+#  - 버전이 같으면 본문 안 만들고 304 → 바뀐 게 없으면 헤더 왕복 한 번
+#  - Cache-Control: no-cache = 브라우저가 저장은 하되 매번 서버에 재검증(항상 최신)
+# ─────────────────────────────────────────────
+def etag_of(version: Any) -> str:
+    return hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:24]
+
+
+def conditional_resp(version: Any, build):
+    """
+    version: 응답 내용을 결정하는 모든 입력의 버전(같으면 본문도 같아야 함)
+    build: 본문 값 또는 본문을 만드는 함수(304 면 호출 안 함)
+    """
+    tag = etag_of(version)
+    if request.if_none_match.contains(tag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(jsonify(build() if callable(build) else build))
+    resp.set_etag(tag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
 def nocache_resp(payload):
     resp = make_response(jsonify(payload))
     resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
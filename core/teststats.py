@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import datetime as dt
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.changes import changes
+from core.datestore import get_store
+from core.logjournal import logs_journal
+from core.paths import STU_PATH
+from core.storage import doc_signature, load
+
+# ─────────────────────────────────────────────
+# ✅ 테스트 통계 집계 (/api/tests-stats)
+#  - 예전엔 호출마다 logs 전체 + tests 를 훑어 시험별 리스트를 만들고 정렬(median/p90)
+#  - (정규화 시험명, 날짜, 레벨 band) 단위 집계를 메모리에 유지 → 조회는 기간 안 날짜 집계만 합침
+#  - 집계 하나: 건수, 정답/문항 합, (정답, 문항) → 건수 (median/p90/min/max 정확히 그대로), 틀린 번호 → 건수
+#  - 갱신: 변경 피드(core.changes)의 logs / tests 키 → 바뀐 (날짜, 학생) 칸만 다시 읽어 빼고 더함
+#    (submit_test, /api/tests, 로그 저장 모두 피드에 남음 — 다른 워커 쓰기도 같이 반영)
+#  - 피드가 잘렸으면(reset) 전체 다시 만듦 / students 레벨이 바뀌면 band 만 다시 계산(기록은 그대로)
+# ─────────────────────────────────────────────
+SOURCES = ("logs", "tests")  # 같은 기록이 둘 다 있으면 앞쪽(logs) + 이른 날짜 것 하나만
+BANDS = ("상", "중상", "중", "하")
+PCT_BUCKETS = ("0-49", "50-59", "60-69", "70-79", "80-89", "90-100")
+
+Cell = Tuple[str, str, str]          # (source, date, sid)
+RecKey = Tuple[str, str, str]        # (sid, 원래 시험명, createdAt) — 예전 중복 제거 키
+Rec = Tuple[str, str, int, int, Tuple[Any, ...]]  # (date, 정규화 시험명, 정답, 문항, 틀린 번호)
+
+
+def canon_test_name(name: str) -> str:
+    s = str(name or "").strip()
+    if not s:
+        return ""
+    if " / " in s:
+        s = s.split(" / ", 1)[1].strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def cell_records(val: Any) -> List[dict]:
+    """한 칸(date, sid) 값에서 시험 기록 목록: tests 는 [rec...], logs 는 {"tests": [rec...]}"""
+    if isinstance(val, list):
+        arr = val
+    elif isinstance(val, dict):
+        arr = val.get("tests", [])
+    else:
+        return []
+    return [rec for rec in arr if isinstance(rec, dict)] if isinstance(arr, list) else []
+
+
+def parse_score(rec: dict) -> Tuple[int, int] | None:
+    """"정답/문항" → (정답, 문항) (형식이 아니거나 문항 0 이면 None)"""
+    score = str(rec.get("score", "")).strip()
+    if "/" not in score:
+        return None
+    try:
+        correct_s, total_s = score.split("/", 1)
+        correct = int(str(correct_s).strip())
+        total = int(str(total_s).strip())
+    except Exception:
+        return None
+    return (correct, total) if total > 0 else None
+
+
+def _is_date(s: str) -> bool:
+    try:
+        dt.date.fromisoformat(s)
+        return True
+    except Exception:
+        return False
+
+
+def level_band(level: Any) -> str:
+    lv = str(level or "").strip()
+    if lv in BANDS:
+        return lv
+    return "하"
+
+
+def pct_bucket(pct: float) -> str:
+    if pct < 50: return "0-49"
+    if pct < 60: return "50-59"
+    if pct < 70: return "60-69"
+    if pct < 80: return "70-79"
+    if pct < 90: return "80-89"
+    return "90-100"
+
+
+class _Agg:
+    __slots__ = ("count", "correct", "total", "scores", "wrong")
+
+    def __init__(self):
+        self.count = 0
+        self.correct = 0
+        self.total = 0
+        self.scores: Dict[Tuple[int, int], int] = {}
+        self.wrong: Dict[int, int] = {}
+
+    def add(self, correct: int, total: int, wrong: Iterable[Any], sign: int = 1) -> None:
+        self.count += sign
+        self.correct += sign * correct
+        self.total += sign * total
+        k = (correct, total)
+        self.scores[k] = self.scores.get(k, 0) + sign
+        if not self.scores[k]:
+            del self.scores[k]
+        for n in wrong:
+            try:
+                n = int(n)
+            except Exception:
+                continue
+            self.wrong[n] = self.wrong.get(n, 0) + sign
+            if not self.wrong[n]:
+                del self.wrong[n]
+
+    def merge(self, other: "_Agg") -> None:
+        self.count += other.count
+        self.correct += other.correct
+        self.total += other.total
+        for k, c in other.scores.items():
+            self.scores[k] = self.scores.get(k, 0) + c
+        for k, c in other.wrong.items():
+            self.wrong[k] = self.wrong.get(k, 0) + c
+
+    def summary(self) -> dict | None:
+        if not self.count:
+            return None
+        pcts: List[float] = []
+        for (c, t), n in sorted(self.scores.items(), key=lambda kv: kv[0][0] / kv[0][1]):
+            pcts.extend([(c / t) * 100.0] * n)
+        hist = {k: 0 for k in PCT_BUCKETS}
+        for p in pcts:
+            hist[pct_bucket(p)] += 1
+        p90_idx = max(0, int(len(pcts) * 0.9) - 1)
+        return {
+            "count": self.count,
+            "avg_pct": round(sum(pcts) / len(pcts), 2),
+            "median_pct": round(median(pcts), 2),
+            "p90_pct": round(pcts[p90_idx], 2),
+            "min_pct": round(pcts[0], 2),
+            "max_pct": round(pcts[-1], 2),
+            "avg_correct": round(self.correct / self.count, 2),
+            "avg_total": round(self.total / self.count, 2),
+            "pct_hist": hist,
+        }
+
+
+class TestStatsIndex:
+    def __init__(self):
+        self._mu = threading.Lock()
+        self._seq: Optional[int] = None
+        self._stu_sig = None
+        self._band: Dict[str, str] = {}
+        self._cells: Dict[Cell, Dict[RecKey, Rec]] = {}
+        self._owners: Dict[RecKey, set] = {}       # 기록 → 그 기록이 들어있는 칸들
+        self._eff: Dict[RecKey, Rec] = {}          # 집계에 실제로 들어간 버전
+        self._by_date: Dict[str, Dict[Tuple[str, str], _Agg]] = {}  # date → (시험명, band) → 집계
+        self._dates: List[str] = []
+        self._stats = {"rebuilds": 0, "cellUpdates": 0, "bandRebuilds": 0, "lastRebuildMs": None}
+
+    # ── 집계 반영 ─────────────────────────────
+    def _agg_apply(self, key: RecKey, rec: Rec, sign: int) -> None:
+        date, name, correct, total, wrong = rec
+        per = self._by_date.get(date)
+        if per is None:
+            per = self._by_date[date] = {}
+            insort(self._dates, date)
+        agg_key = (name, self._band.get(key[0], ""))
+        a = per.get(agg_key)
+        if a is None:
+            a = per[agg_key] = _Agg()
+        a.add(correct, total, wrong, sign)
+        if not a.count:
+            del per[agg_key]
+            if not per:
+                del self._by_date[date]
+                self._dates.pop(bisect_left(self._dates, date))
+
+    def _pick(self, key: RecKey) -> Rec | None:
+        cells = self._owners.get(key)
+        if not cells:
+            return None
+        first = min(cells, key=lambda c: (c[1], SOURCES.index(c[0])))
+        return self._cells[first][key]
+
+    def _set_cell(self, cell: Cell, val: Any) -> None:
+        src, date, sid = cell
+        new: Dict[RecKey, Rec] = {}
+        if _is_date(date):
+            for rec in cell_records(val):
+                name = str(rec.get("name", "")).strip()
+                score = parse_score(rec)
+                canon = canon_test_name(name)
+                if not name or score is None or not canon:
+                    continue
+                key = (sid, name, str(rec.get("createdAt") or ""))
+                if key in new:
+                    continue
+                wrong = rec.get("wrong") if isinstance(rec.get("wrong"), list) else []
+                new[key] = (date, canon, score[0], score[1], tuple(wrong))
+        old = self._cells.pop(cell, {})
+        if new:
+            self._cells[cell] = new
+        for key in set(old) | set(new):
+            owners = self._owners.setdefault(key, set())
+            if key in new:
+                owners.add(cell)
+            else:
+                owners.discard(cell)
+            if not owners:
+                del self._owners[key]
+            before, after = self._eff.get(key), self._pick(key)
+            if before == after:
+                continue
+            if before is not None:
+                self._agg_apply(key, before, -1)
+                del self._eff[key]
+            if after is not None:
+                self._agg_apply(key, after, 1)
+                self._eff[key] = after
+
+    def _load_bands(self) -> None:
+        band: Dict[str, str] = {}
+        students = load(STU_PATH)
+        for s in students if isinstance(students, list) else []:
+            sid = str(s.get("id") or "").strip() if isinstance(s, dict) else ""
+            if sid:
+                band[sid] = level_band(s.get("level", ""))
+        self._band = band
+
+    def _regroup(self) -> None:
+        self._by_date, self._dates = {}, []
+        for key, rec in self._eff.items():
+            self._agg_apply(key, rec, 1)
+
+    def _rebuild(self) -> None:
+        t0 = time.perf_counter()
+        seq = changes.last_seq()  # 읽기 전에 잡아둠 → 그 사이 변경은 다음 refresh 에서 다시 반영
+        self._stu_sig = doc_signature(STU_PATH)
+        self._load_bands()
+        self._cells, self._owners, self._eff = {}, {}, {}
+        self._by_date, self._dates = {}, []
+        for src, view in (("logs", logs_journal.read()), ("tests", get_store("tests").read_all())):
+            for date, by_sid in view.items():
+                if not isinstance(by_sid, dict):
+                    continue
+                for sid, val in by_sid.items():
+                    self._set_cell((src, str(date), str(sid)), val)
+        self._seq = seq
+        self._stats["rebuilds"] += 1
+        self._stats["lastRebuildMs"] = round((time.perf_counter() - t0) * 1000, 1)
+
+    def _refresh(self) -> None:
+        if self._seq is None:
+            self._rebuild()
+            return
+        last, reset, keys = changes.keys_since(self._seq, SOURCES)
+        if reset or any(date is None for _, (date, _sid) in keys):
+            self._rebuild()
+            return
+        days: Dict[Tuple[str, str], Any] = {}
+        for src, (date, sid) in keys:
+            if (src, date) not in days:
+                day = logs_journal.read().get(date) if src == "logs" else get_store("tests").read_date(date)
+                days[(src, date)] = day if isinstance(day, dict) else {}
+            day = days[(src, date)]
+            if sid is None:
+                # 날짜 통째로 바뀜 → 그 날짜에 있던 칸 + 지금 있는 칸 전부
+                sids = {c[2] for c in self._cells if c[0] == src and c[1] == date} | {str(k) for k in day}
+            else:
+                sids = {sid}
+            for s in sids:
+                self._set_cell((src, date, s), day.get(s))
+                self._stats["cellUpdates"] += 1
+        self._seq = last
+        stu_sig = doc_signature(STU_PATH)
+        if stu_sig != self._stu_sig:
+            self._stu_sig = stu_sig
+            self._load_bands()
+            self._regroup()
+            self._stats["bandRebuilds"] += 1
+
+    # ── 조회 ─────────────────────────────────
+    def query(self, start: str, end: str, include_wrong: bool = False) -> Dict[str, dict]:
+        """start <= date <= end 집계를 합쳐 /api/tests-stats 의 by_test 모양으로"""
+        with self._mu:
+            self._refresh()
+            lo = bisect_left(self._dates, start)
+            hi = bisect_right(self._dates, end)
+            overall: Dict[str, _Agg] = {}
+            banded: Dict[str, Dict[str, _Agg]] = {}
+            for date in self._dates[lo:hi]:
+                for (name, band), a in self._by_date[date].items():
+                    overall.setdefault(name, _Agg()).merge(a)
+                    if band:
+                        banded.setdefault(name, {}).setdefault(band, _Agg()).merge(a)
+
+        out: Dict[str, dict] = {}
+        for name, a in overall.items():
+            base = a.summary()
+            if base is None:
+                continue
+            bands_out = {}
+            for band in BANDS:
+                ba = banded.get(name, {}).get(band)
+                summary = ba.summary() if ba is not None else None
+                if summary is not None:
+                    bands_out[band] = summary
+            if bands_out:
+                base["bands"] = bands_out
+            if include_wrong:
+                base["wrong_freq"] = {str(k): a.wrong[k] for k in sorted(a.wrong)}
+            out[name] = base
+        return out
+
+    def stats(self) -> dict:
+        with self._mu:
+            return dict(self._stats, records=len(self._eff), dates=len(self._dates), seq=self._seq)
+
+
+test_stats = TestStatsIndex()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Tuple
+
+from core.paths import VID_PATH
+from core.storage import doc_signature, load
+
+# ─────────────────────────────────────────────
+# ✅ 커리큘럼별 영상 인덱스 (자동배정용)
+#  - (curriculum, subCurriculum) → 챕터순 mid 튜플 + 등록된 mid 집합
+#  - videos.json 이 바뀔 때만 다시 만듦 (doc_signature 비교)
+#  - 학생별 커서: 앞쪽 done/skip 구간을 건너뛴 위치를 기억
+#    (인덱스 버전 + 진도 문서 시그니처가 같을 때만 재사용 → 진도가 바뀌면 처음부터 한 번 다시 훑음)
+# ─────────────────────────────────────────────
+CurKey = Tuple[str, str]
+
+BLOCKED_STATES = ("done", "skip")
+
+
+def chap_num(v: dict) -> float:
+    c = v.get("chapter", 0)
+    try:
+        return float(c)
+    except Exception:
+        s = re.sub(r"[^0-9.]", "", str(c))
+        return float(s) if s else 0.0
+
+
+class VideoIndex(NamedTuple):
+    version: Any
+    by_cur: Dict[CurKey, Tuple[str, ...]]
+    valid: FrozenSet[str]
+
+    def mids(self, curriculum: str, sub: str) -> Tuple[str, ...]:
+        return self.by_cur.get(((curriculum or "").strip(), (sub or "").strip()), ())
+
+
+def _build(version: Any, videos: Any) -> VideoIndex:
+    groups: Dict[CurKey, List[Tuple[float, str]]] = {}
+    valid = set()
+    for v in videos if isinstance(videos, list) else []:
+        if not isinstance(v, dict):
+            continue
+        mid = str(v.get("mid") or "").strip()
+        if not mid:
+            continue
+        valid.add(mid)
+        key = ((v.get("curriculum") or "").strip(), (v.get("subCurriculum") or "").strip())
+        groups.setdefault(key, []).append((chap_num(v), mid))
+    by_cur = {k: tuple(mid for _, mid in sorted(items)) for k, items in groups.items()}
+    return VideoIndex(version, by_cur, frozenset(valid))
+
+
+class VideoIndexCache:
+    def __init__(self, path):
+        self.path = path
+        self._mu = threading.Lock()
+        self._index: VideoIndex | None = None
+        # (sid, curKey) → (인덱스 버전, 진도 시그니처, 첫 미차단 위치)
+        self._cursors: Dict[Tuple[str, CurKey], Tuple[Any, Any, int]] = {}
+        self.rebuilds = 0
+
+    def get(self) -> VideoIndex:
+        sig = doc_signature(self.path)
+        with self._mu:
+            if self._index is not None and self._index.version == sig:
+                return self._index
+        index = _build(sig, load(self.path))
+        with self._mu:
+            self._index = index
+            self._cursors.clear()
+            self.rebuilds += 1
+        return index
+
+    def pick(
+        self,
+        index: VideoIndex,
+        sid: str,
+        curriculum: str,
+        sub: str,
+        status: Mapping[str, Any],
+        n: int,
+        progress_sig: Any = None,
+    ) -> List[str]:
+        """
+        커리큘럼 영상 중 status 가 done/skip 아닌 것 앞에서 n 개.
+        progress_sig: status 를 읽기 *전에* 잡은 진도 문서 시그니처 (get_store("progress").signature())
+                      — 같을 때만 커서 재사용, None 이면 커서 안 씀
+        """
+        mids = index.mids(curriculum, sub)
+        key = (str(sid), ((curriculum or "").strip(), (sub or "").strip()))
+        start = 0
+        if progress_sig is not None:
+            with self._mu:
+                cur = self._cursors.get(key)
+            if cur is not None and cur[0] == index.version and cur[1] == progress_sig:
+                start = cur[2]
+
+        picked: List[str] = []
+        first = None
+        for i in range(start, len(mids)):
+            if status.get(mids[i]) in BLOCKED_STATES:
+                continue
+            if first is None:
+                first = i
+            picked.append(mids[i])
+            if len(picked) >= n:
+                break
+
+        if progress_sig is not None:
+            with self._mu:
+                self._cursors[key] = (index.version, progress_sig, len(mids) if first is None else first)
+        return picked
+
+    def stats(self) -> dict:
+        with self._mu:
+            idx = self._index
+            return {
+                "curricula": len(idx.by_cur) if idx else 0,
+                "videos": len(idx.valid) if idx else 0,
+                "cursors": len(self._cursors),
+                "rebuilds": self.rebuilds,
+            }
+
+
+video_index = VideoIndexCache(VID_PATH)
@@ -9,9 +9,13 @@ from typing import Any
 from flask import Blueprint, jsonify, request
 
 from core.paths import ANNS_PATH, ANN_STATUS_PATH
-from core.storage import load, save_atomic
+from core.changes import changes, register_doc
+from core.locks import locks
+from core.storage import conditional_resp, doc_signature, load, load_copy, save_atomic
 
 bp_api_announcements = Blueprint("api_announcements", __name__)
+register_doc("announcements", lambda: load(ANNS_PATH))
+register_doc("announce-status", lambda: load(ANN_STATUS_PATH))
 
 
 def _get_payload_json_or_form():
@@ -33,16 +37,17 @@ def _try_json(val):
 @bp_api_announcements.route("/api/announcements", methods=["GET", "POST"])
 def api_announcements():
     if request.method == "GET":
-        anns = load(ANNS_PATH)
-        sid = request.args.get("sid")
-        if sid:
-            _sid = str(sid)
-            def targeted(a: dict) -> bool:
-                t = a.get("targets", "all")
-                return t == "all" or (isinstance(t, list) and _sid in map(str, t))
-            anns = [a for a in anns if targeted(a)]
-        anns.sort(key=lambda x: x.get("createdAt", ""), reverse=True)
-        return jsonify(anns)
+        def build():
+            anns = load(ANNS_PATH)
+            sid = request.args.get("sid")
+            if sid:
+                _sid = str(sid)
+                def targeted(a: dict) -> bool:
+                    t = a.get("targets", "all")
+                    return t == "all" or (isinstance(t, list) and _sid in map(str, t))
+                anns = [a for a in anns if targeted(a)]
+            return sorted(anns, key=lambda x: x.get("createdAt", ""), reverse=True)
+        return conditional_resp((request.args.get("sid"), doc_signature(ANNS_PATH)), build)
 
     body = _get_payload_json_or_form()
     title = (body.get("title") or "").strip()
@@ -64,37 +69,43 @@ def api_announcements():
         "survey": survey,
         "requireCompletion": bool(body.get("requireCompletion", False)),
     }
-    anns = load(ANNS_PATH)
-    anns.append(ann)
-    save_atomic(ANNS_PATH, anns)
+    with locks.exclusive(ANNS_PATH):
+        anns = load_copy(ANNS_PATH)
+        anns.append(ann)
+        save_atomic(ANNS_PATH, anns)
+    changes.record("announcements")
     return jsonify(ann), 201
 
 @bp_api_announcements.delete("/api/announcements/<aid>")
 def api_announcement_delete(aid: str):
-    anns = load(ANNS_PATH)
-    new_anns = [a for a in anns if str(a.get("id")) != str(aid)]
-    if len(new_anns) == len(anns):
-        return jsonify({"ok": False, "error": "not found"}), 404
-    save_atomic(ANNS_PATH, new_anns)
-
-    stat = load(ANN_STATUS_PATH)
-    changed = False
-    for sid in list(stat.keys()):
-        if aid in stat[sid]:
-            del stat[sid][aid]
-            changed = True
-        if not stat[sid]:
-            del stat[sid]
-            changed = True
+    with locks.exclusive(ANNS_PATH):
+        anns = load(ANNS_PATH)
+        new_anns = [a for a in anns if str(a.get("id")) != str(aid)]
+        if len(new_anns) == len(anns):
+            return jsonify({"ok": False, "error": "not found"}), 404
+        save_atomic(ANNS_PATH, new_anns)
+    changes.record("announcements")
+
+    with locks.exclusive(ANN_STATUS_PATH):
+        stat = load_copy(ANN_STATUS_PATH)
+        changed = False
+        for sid in list(stat.keys()):
+            if aid in stat[sid]:
+                del stat[sid][aid]
+                changed = True
+            if not stat[sid]:
+                del stat[sid]
+                changed = True
+        if changed:
+            save_atomic(ANN_STATUS_PATH, stat)
     if changed:
-        save_atomic(ANN_STATUS_PATH, stat)
+        changes.record("announce-status")
     return jsonify({"ok": True})
 
 @bp_api_announcements.get("/api/announce-status")
 def api_announce_status():
     sid = str(request.args.get("sid", ""))
-    stat = load(ANN_STATUS_PATH)
-    return jsonify(stat.get(sid, {}))
+    return conditional_resp((sid, doc_signature(ANN_STATUS_PATH)), lambda: load(ANN_STATUS_PATH).get(sid, {}))
 
 @bp_api_announcements.post("/api/announce-ack")
 def api_announce_ack():
@@ -103,10 +114,12 @@ def api_announce_ack():
     aid = str(body.get("id") or "")
     if not sid or not aid:
         return jsonify({"ok": False, "error": "missing sid/id"}), 400
-    stat = load(ANN_STATUS_PATH)
-    stat.setdefault(sid, {}).setdefault(aid, {})
-    stat[sid][aid]["acked"] = True
-    save_atomic(ANN_STATUS_PATH, stat)
+    with locks.exclusive(ANN_STATUS_PATH):
+        stat = load_copy(ANN_STATUS_PATH)
+        stat.setdefault(sid, {}).setdefault(aid, {})
+        stat[sid][aid]["acked"] = True
+        save_atomic(ANN_STATUS_PATH, stat)
+    changes.record("announce-status", [(None, sid)])
     return jsonify({"ok": True})
 
 @bp_api_announcements.post("/api/announce-submit")
@@ -117,37 +130,39 @@ def api_announce_submit():
     if not sid or not aid:
         return jsonify({"ok": False, "error": "missing sid/id"}), 400
 
-    stat = load(ANN_STATUS_PATH)
-    entry = stat.setdefault(sid, {}).setdefault(aid, {})
-
-    if "pollAnswer" in body and body["pollAnswer"] is not None:
-        entry["poll"] = body["pollAnswer"]
-    if "surveyAnswers" in body and body["surveyAnswers"] is not None:
-        entry["survey"] = body["surveyAnswers"]
-
-    save_atomic(ANN_STATUS_PATH, stat)
-
-    anns = load(ANNS_PATH)
-    ann = next((a for a in anns if str(a.get("id")) == aid), None)
-    if ann and ann.get("requireCompletion"):
-        has_poll = bool(ann.get("poll") and isinstance(ann["poll"].get("options"), list))
-        has_survey = bool(ann.get("survey") and isinstance(ann["survey"], list) and len(ann["survey"]) > 0)
-
-        done = True
-        if has_poll:
-            ans = entry.get("poll")
-            if ans is None or (isinstance(ans, list) and len(ans) == 0):
-                done = False
-        if has_survey:
-            sv = entry.get("survey", {})
-            for q in ann["survey"]:
-                v = sv.get(q.get("id"))
-                if v is None or (isinstance(v, list) and len(v) == 0) or (isinstance(v, str) and not v.strip()):
+    with locks.exclusive(ANN_STATUS_PATH):
+        stat = load_copy(ANN_STATUS_PATH)
+        entry = stat.setdefault(sid, {}).setdefault(aid, {})
+
+        if "pollAnswer" in body and body["pollAnswer"] is not None:
+            entry["poll"] = body["pollAnswer"]
+        if "surveyAnswers" in body and body["surveyAnswers"] is not None:
+            entry["survey"] = body["surveyAnswers"]
+
+        save_atomic(ANN_STATUS_PATH, stat)
+
+        anns = load(ANNS_PATH)
+        ann = next((a for a in anns if str(a.get("id")) == aid), None)
+        if ann and ann.get("requireCompletion"):
+            has_poll = bool(ann.get("poll") and isinstance(ann["poll"].get("options"), list))
+            has_survey = bool(ann.get("survey") and isinstance(ann["survey"], list) and len(ann["survey"]) > 0)
+
+            done = True
+            if has_poll:
+                ans = entry.get("poll")
+                if ans is None or (isinstance(ans, list) and len(ans) == 0):
                     done = False
-                    break
-        if done:
-            stat.setdefault(sid, {}).setdefault(aid, {})["acked"] = True
-            save_atomic(ANN_STATUS_PATH, stat)
+            if has_survey:
+                sv = entry.get("survey", {})
+                for q in ann["survey"]:
+                    v = sv.get(q.get("id"))
+                    if v is None or (isinstance(v, list) and len(v) == 0) or (isinstance(v, str) and not v.strip()):
+                        done = False
+                        break
+            if done:
+                stat.setdefault(sid, {}).setdefault(aid, {})["acked"] = True
+                save_atomic(ANN_STATUS_PATH, stat)
+    changes.record("announce-status", [(None, sid)])
 
     return jsonify({"ok": True})
     
\ No newline at end of file
@@ -2,14 +2,18 @@
 from __future__ import annotations
 
 import datetime as dt
-import json
+from concurrent.futures import Future
 from typing import Dict, List, Any
 
 from flask import Blueprint, abort, jsonify, request
 
-from core.paths import STU_PATH, EXTRA_PATH, ATTENDANCE_PATH
-from core.storage import load
-from core.absent import load_absent, save_absent
+from core.paths import ABS_PATH, WEEKEND_SLOTS_PATH
+from core.storage import conditional_resp, doc_signature, load
+from core.absent import load_absent, patch_absent, save_absent
+from core.checkin import checkin
+from core.datestore import get_store
+from core.dayflags import norm_day, patch as patch_flags, read_day, replace_days
+from core.roster import roster
 
 bp_api_attend = Blueprint("api_attend", __name__)
 
@@ -29,102 +33,73 @@ def _date_key_from_query(default: dt.date | None = None) -> str:
     return date_str
 
 
-def _load_attendance_all() -> Dict[str, Dict[str, int]]:
-    """
-    attendance.json schema:
-      {
-        "YYYY-MM-DD": { "sid": 1, ... }
-      }
-    """
+def _wait_saved(fut: Future, what: str = "attendance") -> None:
     try:
-        data = load(ATTENDANCE_PATH)
-        if isinstance(data, dict):
-            out: Dict[str, Dict[str, int]] = {}
-            for dk, mp in data.items():
-                if isinstance(dk, str) and isinstance(mp, dict):
-                    out[dk] = {str(sid): 1 for sid in mp.keys()}
-            return out
-    except Exception:
-        pass
-    return {}
-
-
-def _save_attendance_all(data: Dict[str, Dict[str, int]]) -> None:
-    try:
-        ATTENDANCE_PATH.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            "utf-8"
-        )
+        fut.result()
     except Exception as e:
-        abort(500, description=f"Failed to save attendance: {e}")
+        abort(500, description=f"Failed to save {what}: {e}")
 
 
 # ──────────────────────────────────────────────
 # 오늘 학생 / 특정 날짜 학생
 # ──────────────────────────────────────────────
-@bp_api_attend.get("/api/today")
-def api_today():
-    today = dt.date.today()
-    wchr = "월화수목금토일"[today.weekday()]
-    students_arr: List[dict] = load(STU_PATH)
-
-    # 정규 수업
-    regular = [
-        s for s in students_arr
-        if any(((s.get(d, "") or "").startswith(wchr) for d in ("day1", "day2", "day3")))
-    ]
+def _students_for_date(target: dt.date) -> List[dict]:
+    # 정규(요일) + 보강 - 결석 → core.roster 인덱스 (문서 바뀔 때만 다시 만듦)
+    return roster.students_for_date(target)
 
-    # 보강
-    extra_ids = load(EXTRA_PATH).get(today.isoformat(), [])
-    extra_students = [
-        s for s in students_arr
-        if str(s.get("id")) in map(str, extra_ids)
-    ]
 
-    all_today = {str(s["id"]): s for s in (regular + extra_students)}
+def _students_for_date_resp(target: dt.date):
+    # 명단은 (날짜, students, extra-attend, absent) 로 결정 → 안 바뀌었으면 304
+    return conditional_resp(roster.version(target), lambda: _students_for_date(target))
 
-    # 결석 제거
-    abs_all = load_absent()
-    absent_ids = set(map(str, abs_all.get("by_date", {}).get(today.isoformat(), [])))
-    for sid in list(all_today.keys()):
-        if sid in absent_ids:
-            del all_today[sid]
 
-    return jsonify(list(all_today.values()))
+@bp_api_attend.get("/api/today")
+def api_today():
+    return _students_for_date_resp(dt.date.today())
 
 
 @bp_api_attend.get("/api/attend")
 def api_attend():
     date_str = _date_key_from_query()
-    target = dt.date.fromisoformat(date_str)
-    wchr = "월화수목금토일"[target.weekday()]
-
-    students_arr: List[dict] = load(STU_PATH)
+    return _students_for_date_resp(dt.date.fromisoformat(date_str))
 
-    regular = [
-        s for s in students_arr
-        if any(((s.get(d, "") or "").startswith(wchr) for d in ("day1", "day2", "day3")))
-    ]
 
-    extra_ids = load(EXTRA_PATH).get(target.isoformat(), [])
-    extra_students = [
-        s for s in students_arr
-        if str(s.get("id")) in map(str, extra_ids)
-    ]
+ATTEND_RANGE_MAX_DAYS = 62
 
-    all_today = {str(s["id"]): s for s in (regular + extra_students)}
 
-    abs_all = load_absent()
-    absent_ids = set(map(str, abs_all.get("by_date", {}).get(target.isoformat(), [])))
-    for sid in list(all_today.keys()):
-        if sid in absent_ids:
-            del all_today[sid]
-
-    return jsonify(list(all_today.values()))
+@bp_api_attend.get("/api/attend-range")
+def api_attend_range():
+    """
+    GET /api/attend-range?start=YYYY-MM-DD&end=YYYY-MM-DD  (end 포함, 최대 ATTEND_RANGE_MAX_DAYS 일)
+    -> { "start", "end", "days": { date: {regular, extra, absent, count, slots} } }
+    달력 한 화면을 요청 하나로 (slots = 그 날 weekend-slots 값)
+    """
+    try:
+        start = dt.date.fromisoformat(str(request.args.get("start") or ""))
+        end = dt.date.fromisoformat(str(request.args.get("end") or ""))
+    except ValueError:
+        abort(400, description="start/end (YYYY-MM-DD) required")
+    n = (end - start).days + 1
+    if n < 1 or n > ATTEND_RANGE_MAX_DAYS:
+        abort(400, description=f"range must be 1..{ATTEND_RANGE_MAX_DAYS} days")
+
+    def build():
+        slots_all = load(WEEKEND_SLOTS_PATH)
+        slots_all = slots_all if isinstance(slots_all, dict) else {}
+        days = {}
+        for i in range(n):
+            d = start + dt.timedelta(days=i)
+            day = roster.day_parts(d)
+            day["slots"] = slots_all.get(d.isoformat()) or {}
+            days[d.isoformat()] = day
+        return {"start": start.isoformat(), "end": end.isoformat(), "days": days}
+
+    version = roster.version(start) + (end.isoformat(), doc_signature(WEEKEND_SLOTS_PATH))
+    return conditional_resp(version, build)
 
 
 # ──────────────────────────────────────────────
-# ✅ 결석(absent) — overwrite 전용 (핵심)
+# ✅ 결석(absent) — 전체 덮어쓰기(POST) + 한 명씩 처리/해제(patch)
 # ──────────────────────────────────────────────
 @bp_api_attend.get("/api/absent")
 def api_absent_get():
@@ -132,7 +107,7 @@ def api_absent_get():
     GET /api/absent
     -> { by_date: {...}, by_student: {...} }
     """
-    return jsonify(load_absent())
+    return conditional_resp(doc_signature(ABS_PATH), load_absent)
 
 
 @bp_api_attend.post("/api/absent")
@@ -145,54 +120,142 @@ def api_absent_post():
     return jsonify(load_absent())
 
 
+@bp_api_attend.post("/api/absent/patch")
+def api_absent_patch():
+    """
+    POST /api/absent/patch
+    body: { "ops": [ {date, sid, absent}, ... ] }  (리스트 / 한 건만 보내도 됨, absent 기본 true, false/"false"/0 이면 해제, 그 밖의 값은 400)
+    - 락 안에서 현재 문서에 합쳐 표준 포맷으로 저장 → 다른 기기 결석 처리와 안 겹침
+    -> {"ok", "applied", "results": [...], "by_date", "by_student"}
+    """
+    body = request.get_json(silent=True)
+    items = body.get("ops", [body]) if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "ops list required"}), 400
+
+    try:
+        results, applied = patch_absent(items)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    return jsonify({"ok": all(r["ok"] for r in results), "applied": applied, "results": results, **load_absent()})
+
+
 # ──────────────────────────────────────────────
-# 출석(attendance.json) — 기기간 공유
+# 출석(attendance) / 연락(contact) 체크 — 기기간 공유 (core/dayflags.py)
 # ──────────────────────────────────────────────
+def _day_maps_from_body(payload: Any) -> Dict[str, Any]:
+    """
+    POST 본문 → {date: {sid: 1}}
+      1) { "YYYY-MM-DD": { "sid": 1 }, ... }
+      2) { "date": "YYYY-MM-DD", "map": { "sid": 1 } }
+    """
+    if not isinstance(payload, dict) or not payload:
+        abort(400, description="Invalid JSON body")
+    if "date" in payload and "map" in payload:
+        payload = {str(payload.get("date") or ""): payload.get("map")}
+
+    out: Dict[str, Any] = {}
+    for k, day_map in payload.items():
+        date_key = str(k).split("T")[0]
+        try:
+            dt.date.fromisoformat(date_key)
+        except Exception:
+            abort(400, description="Invalid date format")
+        if not isinstance(day_map, dict):
+            abort(400, description="Day map must be an object")
+        out[date_key] = day_map
+    return out
+
+
+def _flag_get(doc: str, date_key: str | None):
+    store = get_store(doc)
+    if date_key is None:
+        return conditional_resp(store.signature(), store.read_all)
+    # ?date= 생략 시 오늘 → 버전에 날짜도 넣어야 자정 지나 어제 ETag 로 304 안 남
+    return conditional_resp((date_key, store.signature()), lambda: read_day(doc, date_key))
+
+
+def _flag_post(doc: str):
+    """❗ 보낸 날짜만 overwrite (나머지 날짜는 안 건드림)"""
+    days = _day_maps_from_body(request.get_json(silent=True))
+    _wait_saved(replace_days(doc, days), doc)
+    return jsonify({"ok": True, "dates": {d: len(norm_day(m)) for d, m in days.items()}})
+
+
+def _flag_patch(doc: str):
+    """
+    body: { "ops": [ {date, sid, on}, ... ] }  (리스트 / 한 건만 보내도 됨, on 기본 true, false 면 해제)
+    -> {"ok", "applied", "results": [...], "days": {date: {sid: 1}}}  (건드린 날짜만)
+    """
+    body = request.get_json(silent=True)
+    items = body.get("ops", [body]) if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "ops list required"}), 400
+
+    results, days, fut = patch_flags(doc, items)
+    _wait_saved(fut, doc)
+    return jsonify({
+        "ok": all(r["ok"] for r in results),
+        "applied": sum(1 for r in results if r.get("changed")),
+        "results": results,
+        "days": days,
+    })
+
+
 @bp_api_attend.get("/api/attendance")
 def api_attendance_get():
     """
-    GET /api/attendance?date=YYYY-MM-DD
+    GET /api/attendance?date=YYYY-MM-DD  (없으면 오늘)
     -> { "sid": 1, ... }
     """
-    date_key = _date_key_from_query()
-    all_map = _load_attendance_all()
-    return jsonify(all_map.get(date_key, {}))
+    return _flag_get("attendance", _date_key_from_query())
 
 
 @bp_api_attend.post("/api/attendance")
 def api_attendance_post():
-    """
-    POST 지원:
-      1) { "YYYY-MM-DD": { "sid": 1 } }
-      2) { "date": "YYYY-MM-DD", "map": { "sid": 1 } }
+    return _flag_post("attendance")
 
-    ❗ 해당 날짜만 overwrite
+
+@bp_api_attend.post("/api/attendance/patch")
+def api_attendance_patch():
+    return _flag_patch("attendance")
+
+
+@bp_api_attend.get("/api/contact")
+def api_contact_get():
     """
-    payload: Any = request.get_json(silent=True)
-    if not isinstance(payload, dict):
-        abort(400, description="Invalid JSON body")
+    GET /api/contact?date=YYYY-MM-DD -> { "sid": 1, ... }
+    GET /api/contact                 -> 전체 { date: {sid: 1} }
+    """
+    date_q = (request.args.get("date") or "").strip()
+    return _flag_get("contact", _date_key_from_query() if date_q else None)
 
-    if "date" in payload and "map" in payload:
-        date_key = str(payload.get("date") or "").split("T")[0]
-        day_map = payload.get("map")
-    else:
-        if len(payload) != 1:
-            abort(400, description="Body must contain exactly one date key")
-        date_key = str(next(iter(payload.keys()))).split("T")[0]
-        day_map = payload.get(date_key)
 
-    try:
-        dt.date.fromisoformat(date_key)
-    except Exception:
-        abort(400, description="Invalid date format")
+@bp_api_attend.post("/api/contact")
+def api_contact_post():
+    return _flag_post("contact")
 
-    if not isinstance(day_map, dict):
-        abort(400, description="Attendance map must be an object")
 
-    normalized = {str(sid): 1 for sid in day_map.keys() if str(sid).strip()}
+@bp_api_attend.post("/api/contact/patch")
+def api_contact_patch():
+    return _flag_patch("contact")
 
-    all_map = _load_attendance_all()
-    all_map[date_key] = normalized
-    _save_attendance_all(all_map)
 
-    return jsonify({"ok": True, "date": date_key, "count": len(normalized)})
+# ──────────────────────────────────────────────
+# ✅ 키오스크 체크인 — 출석 + 등원시간 한 번에 (core/checkin.py)
+# ──────────────────────────────────────────────
+@bp_api_attend.post("/api/checkin")
+def api_checkin():
+    """
+    POST /api/checkin
+    body: {sid, ts} / [{sid, ts}, ...] / {"items": [...]}  (ts: ISO 또는 epoch(ms), 없으면 지금)
+    -> {"ok", "results": [...], "days": {date: {checkedIn, offRoster, remaining, attended, expected}}}
+    """
+    body = request.get_json(silent=True)
+    items = body.get("items", [body]) if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "items list required"}), 400
+
+    results, days, fut = checkin(items)
+    _wait_saved(fut, "checkin")
+    return jsonify({"ok": all(r["ok"] for r in results), "results": results, "days": days})
@@ -12,6 +12,8 @@ import jwt
 from flask import Blueprint, request, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from core.locks import locks
+
 bp_api_auth = Blueprint("api_auth", __name__, url_prefix="/api/auth")
 
 BASE = pathlib.Path(__file__).resolve().parents[1]  # project root (routes/..)
@@ -190,22 +192,23 @@ def _ensure_account(aid: str, *, base_sid_for_link: Optional[str] = None) -> Non
     if not aid:
         return
 
-    m = _load_acct_map()
-    if aid in m:
-        if not isinstance(m[aid].get("sids"), list):
-            m[aid]["sids"] = []
-            _save_acct_map(m)
-        return
+    with locks.exclusive(ACCT_PATH):
+        m = _load_acct_map()
+        if aid in m:
+            if not isinstance(m[aid].get("sids"), list):
+                m[aid]["sids"] = []
+                _save_acct_map(m)
+            return
 
-    sids: List[str] = []
-    if base_sid_for_link:
-        sids = _group_sids_for_same_person(base_sid_for_link)
+        sids: List[str] = []
+        if base_sid_for_link:
+            sids = _group_sids_for_same_person(base_sid_for_link)
 
-    m[aid] = {
-        "pw_hash": generate_password_hash("1234"),
-        "sids": sids,
-    }
-    _save_acct_map(m)
+        m[aid] = {
+            "pw_hash": generate_password_hash("1234"),
+            "sids": sids,
+        }
+        _save_acct_map(m)
 
 
 def _find_account_by_sid(m: dict, sid: str) -> Optional[str]:
@@ -329,26 +332,27 @@ def login():
             "curris": _curris_payload_from_sids(sids),
         })
 
-    # ✅ 계정ID는 "입력한 이름" 그대로 생성
-    _ensure_account(login_id, base_sid_for_link=base_sid)
-    m = _load_acct_map()
+    with locks.exclusive(ACCT_PATH):
+        # ✅ 계정ID는 "입력한 이름" 그대로 생성
+        _ensure_account(login_id, base_sid_for_link=base_sid)
+        m = _load_acct_map()
 
-    pw_hash = (m.get(login_id) or {}).get("pw_hash", "")
-    if not pw_hash or not check_password_hash(pw_hash, pw):
-        return jsonify({"ok": False, "error": "bad password"}), 401
+        pw_hash = (m.get(login_id) or {}).get("pw_hash", "")
+        if not pw_hash or not check_password_hash(pw_hash, pw):
+            return jsonify({"ok": False, "error": "bad password"}), 401
 
-    sids = (m.get(login_id) or {}).get("sids") or []
-    if not isinstance(sids, list):
-        sids = []
-    sids = [sid for sid in sids if _student_exists(sid)]
-    if not sids:
-        # 혹시라도 비면 dedup으로 다시 구성
-        sids = _group_sids_for_same_person(base_sid)
+        sids = (m.get(login_id) or {}).get("sids") or []
+        if not isinstance(sids, list):
+            sids = []
+        sids = [sid for sid in sids if _student_exists(sid)]
+        if not sids:
+            # 혹시라도 비면 dedup으로 다시 구성
+            sids = _group_sids_for_same_person(base_sid)
 
-    sid = base_sid if base_sid in sids else (sids[0] if sids else base_sid)
+        sid = base_sid if base_sid in sids else (sids[0] if sids else base_sid)
 
-    _prune_duplicate_accounts(m, keep_aid=login_id, sids=sids)
-    _save_acct_map(m)
+        _prune_duplicate_accounts(m, keep_aid=login_id, sids=sids)
+        _save_acct_map(m)
 
     token = _issue_token(sid=sid, aid=login_id, sids=sids)
     return jsonify({
@@ -431,36 +435,37 @@ def change():
     if not cur_pw:
         return jsonify({"ok": False, "error": "missing curPw"}), 400
 
-    m = _load_acct_map()
-    if aid not in m:
-        # 보통은 없어야 함. 그래도 복구
-        _ensure_account(aid, base_sid_for_link=sid)
+    with locks.exclusive(ACCT_PATH):
         m = _load_acct_map()
+        if aid not in m:
+            # 보통은 없어야 함. 그래도 복구
+            _ensure_account(aid, base_sid_for_link=sid)
+            m = _load_acct_map()
+
+        cur_hash = (m.get(aid) or {}).get("pw_hash", "")
+        if not cur_hash or not check_password_hash(cur_hash, cur_pw):
+            return jsonify({"ok": False, "error": "bad password"}), 401
 
-    cur_hash = (m.get(aid) or {}).get("pw_hash", "")
-    if not cur_hash or not check_password_hash(cur_hash, cur_pw):
-        return jsonify({"ok": False, "error": "bad password"}), 401
-
-    # 계정 아이디 변경
-    if new_id and new_id != aid:
-        if new_id in m:
-            return jsonify({"ok": False, "error": "id taken"}), 409
-        m[new_id] = m.pop(aid)
-        aid = new_id
-
-    # 비번 변경
-    if new_pw:
-        m.setdefault(aid, {})
-        m[aid]["pw_hash"] = generate_password_hash(new_pw)
-
-    # sids 보정
-    if not isinstance(m.get(aid, {}).get("sids"), list) or not m[aid]["sids"]:
-        m[aid]["sids"] = [x for x in sids if _student_exists(x)]
-        if sid not in m[aid]["sids"]:
-            m[aid]["sids"].insert(0, sid)
-
-    _prune_duplicate_accounts(m, keep_aid=aid, sids=m[aid]["sids"])
-    _save_acct_map(m)
+        # 계정 아이디 변경
+        if new_id and new_id != aid:
+            if new_id in m:
+                return jsonify({"ok": False, "error": "id taken"}), 409
+            m[new_id] = m.pop(aid)
+            aid = new_id
+
+        # 비번 변경
+        if new_pw:
+            m.setdefault(aid, {})
+            m[aid]["pw_hash"] = generate_password_hash(new_pw)
+
+        # sids 보정
+        if not isinstance(m.get(aid, {}).get("sids"), list) or not m[aid]["sids"]:
+            m[aid]["sids"] = [x for x in sids if _student_exists(x)]
+            if sid not in m[aid]["sids"]:
+                m[aid]["sids"].insert(0, sid)
+
+        _prune_duplicate_accounts(m, keep_aid=aid, sids=m[aid]["sids"])
+        _save_acct_map(m)
 
     token = _issue_token(sid=sid, aid=aid, sids=m[aid]["sids"])
     return jsonify({"ok": True, "sid": sid, "aid": aid, "token": token})
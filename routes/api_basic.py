@@ -1,20 +1,30 @@
 from __future__ import annotations
 
-import datetime as dt
 import random
 import re
-import time
-import os
 from typing import List
 
 from flask import Blueprint, abort, jsonify, request
 
 from core.paths import (
-    STU_PATH, VID_PATH, PRG_PATH, UPD_PATH, ASN_PATH, MAT_PATH, CAL_PATH,
-    EXTRA_PATH, LOGS_PATH, CLINIC_PATH, TODAY_ORDER_PATH, WEEKEND_SLOTS_PATH
+    STU_PATH, VID_PATH, ASN_PATH, MAT_PATH, CAL_PATH,
+    EXTRA_PATH, CLINIC_PATH, TODAY_ORDER_PATH, WEEKEND_SLOTS_PATH
+)
+from core.locks import locks, lock_stats
+from core.storage import (
+    load, load_copy, save_atomic, save_coalesced, nocache_resp, conditional_resp, doc_signature,
+    doc_cache_stats, write_behind_stats, etag_of, thaw,
 )
-from core.storage import load, save_atomic, nocache_resp
 from core.absent import load_absent, save_absent, DATE_RE
+from core.archive import archive_stats
+from core.changes import CHANGES_PAGE_LIMIT, changes, diff_keys, register_doc
+from core.datestore import get_store, parse_date_slice, slice_days
+from core.logjournal import logs_journal, merge_entry_safe
+from core.autoassign import auto_assigner
+from core.progressevents import PROGRESS_MODE, log_progress_changes, progress_as_of
+from core.progressview import latest_progress
+from core.teststats import test_stats
+from core.videoindex import video_index
 
 bp_api_basic = Blueprint("api_basic", __name__)
 
@@ -22,287 +32,31 @@ bp_api_basic = Blueprint("api_basic", __name__)
 # ─────────────────────────────────────────────
 # 공통 CRUD
 # ─────────────────────────────────────────────
-def crud(path):
+def crud(path, doc: str):
     if request.method == "GET":
-        return jsonify(load(path))
+        return conditional_resp(doc_signature(path), lambda: load(path))
     obj = request.get_json(force=True)
-    save_atomic(path, obj)
+    # 전체 교체도 락 안에서: 다른 read-modify-write 중간에 끼어들어 덮이지 않게
+    with locks.exclusive(path):
+        save_atomic(path, obj)
+    changes.record(doc)
     return "", 204
 
 
-# ─────────────────────────────────────────────
-# ✅ 프로세스 간 파일 락 (멀티워커/동시 저장 방어)
-#  - lock 파일을 O_EXCL로 만들고, 해제 시 삭제
-# ─────────────────────────────────────────────
-class _InterProcessFileLock:
-    def __init__(self, lock_path: str, timeout_sec: float = 4.0, poll_sec: float = 0.05):
-        self.lock_path = lock_path
-        self.timeout_sec = timeout_sec
-        self.poll_sec = poll_sec
-        self._fd = None
-
-    def acquire(self):
-        deadline = time.time() + self.timeout_sec
-        while True:
-            try:
-                # O_EXCL: 이미 있으면 실패 → 누가 잡고 있는 중
-                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
-                self._fd = fd
-                # 디버그용 정보
-                os.write(fd, f"pid={os.getpid()} time={time.time()}".encode("utf-8"))
-                return
-            except FileExistsError:
-                if time.time() > deadline:
-                    raise TimeoutError(f"lock timeout: {self.lock_path}")
-                time.sleep(self.poll_sec)
-
-    def release(self):
-        try:
-            if self._fd is not None:
-                try:
-                    os.close(self._fd)
-                except Exception:
-                    pass
-            self._fd = None
-            try:
-                os.remove(self.lock_path)
-            except FileNotFoundError:
-                pass
-        except Exception:
-            pass
-
-    def __enter__(self):
-        self.acquire()
-        return self
-
-    def __exit__(self, *_):
-        self.release()
-
-
-def _logs_lock():
-    lp = str(getattr(LOGS_PATH, "__fspath__", lambda: str(LOGS_PATH))())
-    return _InterProcessFileLock(lp + ".lock", timeout_sec=6.0, poll_sec=0.05)
-
-
-# ─────────────────────────────────────────────
-# ✅ logs 안전 merge (날아감 방지)
-# - PATCH가 기본
-# - "빈 값"으로 기존 "유효 값" 덮는 거 금지
-# - 대신 "__clear": ["notes", ...] 로 명시 삭제 지원
-# ─────────────────────────────────────────────
-def _is_empty_value(v) -> bool:
-    if v is None:
-        return True
-    if isinstance(v, str) and v.strip() == "":
-        return True
-    if isinstance(v, list) and len(v) == 0:
-        return True
-    if isinstance(v, dict) and len(v) == 0:
-        return True
-    return False
-
-
-def _merge_entry_safe(cur: dict, inc: dict) -> dict:
-    if not isinstance(cur, dict):
-        cur = {}
-    if not isinstance(inc, dict):
-        return cur
+# 변경 피드(/api/changes) 값 조회용 문서 등록
+for _doc, _path in (
+    ("students", STU_PATH), ("videos", VID_PATH), ("mat-assign", ASN_PATH), ("materials", MAT_PATH),
+    ("school-calendar", CAL_PATH), ("extra-attend", EXTRA_PATH), ("weekend-slots", WEEKEND_SLOTS_PATH),
+):
+    register_doc(_doc, lambda p=_path: load(p))
 
-    out = dict(cur)
 
-    # ✅ 명시 삭제 키
-    clear = inc.get("__clear")
-    if isinstance(clear, list):
-        for k in clear:
-            kk = str(k).strip()
-            if kk:
-                out.pop(kk, None)
-
-    for k, v in inc.items():
-        if k == "__clear":
-            continue
-
-        # None은 "삭제"로 쓰지 말고 __clear로 처리(실수 방지)
-        if v is None:
-            continue
-
-        # ✅ 스테일 전체 업로드/빈값 업로드가 기존값 덮는 거 방지
-        if _is_empty_value(v) and not _is_empty_value(out.get(k)):
-            continue
-
-        out[k] = v
-
-    return out
-
-
-# ─────────────────────────────────────────────
-# updates 자동배정 보정 (핵심)
-# ─────────────────────────────────────────────
-def _chap_num(v: dict) -> float:
-    c = v.get("chapter", 0)
+def _date_slice_arg():
+    """?date= / ?start=&end= / ?sids= (없으면 None = 전체)"""
     try:
-        return float(c)
-    except Exception:
-        s = re.sub(r"[^0-9.]", "", str(c))
-        return float(s) if s else 0.0
-
-
-def _has_assigned(val) -> bool:
-    if isinstance(val, list):
-        return len(val) > 0
-    if isinstance(val, dict):
-        vids = val.get("videos")
-        return isinstance(vids, list) and len(vids) > 0
-    return False
-
-
-def _build_latest_status_by_sid(progress: dict) -> dict:
-    """
-    progress: {date: {sid: {mid: state}}}
-    return: {sid: {mid: state}} 최신 상태
-    """
-    out = {}
-    if not isinstance(progress, dict):
-        return out
-
-    for d in sorted(progress.keys()):
-        day = progress.get(d) or {}
-        if not isinstance(day, dict):
-            continue
-        for sid, mids in day.items():
-            if not isinstance(mids, dict):
-                continue
-            sm = out.setdefault(str(sid), {})
-            for mid, st in mids.items():
-                sm[str(mid)] = st
-    return out
-
-
-# ✅ 서버 날짜가 UTC로 돌아서 프론트(todayLocalKey)랑 하루 어긋나는 거 방지용
-KST = dt.timezone(dt.timedelta(hours=9))
-
-
-def _today_kst_iso() -> str:
-    return dt.datetime.now(KST).date().isoformat()
-
-
-def _ensure_today_auto_assign(updates, students, videos, progress):
-
-    # ✅ 프론트(todayLocalKey)가 KST 기준이면 서버도 KST로 맞춰야 함
-    today = _today_kst_iso()
-
-    if not isinstance(updates, dict):
-        updates = {}
-    updates.setdefault(today, {})
-    if not isinstance(updates[today], dict):
-        updates[today] = {}
-
-    # ✅ 현재 등록된 video mid 집합 (존재 검증)
-    valid_mids = set()
-    for v in (videos or []):
-        if isinstance(v, dict):
-            mid = str(v.get("mid") or "").strip()
-            if mid:
-                valid_mids.add(mid)
-
-    last_status = _build_latest_status_by_sid(progress)
-
-    def _normalize_assigned(val):
-        """
-        updates[today][sid] 에 들어있는 값 정규화:
-          - list[str] 형태로 통일
-          - dict(구형) 이면 videos 키 뽑기
-        """
-        if isinstance(val, list):
-            arr = [str(x).strip() for x in val if str(x).strip()]
-            return arr
-        if isinstance(val, dict):
-            vids = val.get("videos")
-            if isinstance(vids, list):
-                arr = [str(x).strip() for x in vids if str(x).strip()]
-                return arr
-        return []
-
-    changed = False
-
-    # ✅ 1) 이미 들어있는 오늘 배정부터 "유효 mid만" 남기기 (이게 재발 방지 핵심)
-    for sid, cur in list(updates[today].items()):
-        assigned = _normalize_assigned(cur)
-        if not assigned:
-            continue
-
-        # 존재하는 mid만 남김
-        cleaned = [mid for mid in assigned if mid in valid_mids]
-        if cleaned != assigned:
-            if cleaned:
-                updates[today][sid] = cleaned
-            else:
-                # 다 날아가면 배정 자체 제거(아래 자동배정이 다시 채울 수 있음)
-                updates[today].pop(sid, None)
-            changed = True
-
-    # ✅ 2) 이제 자동배정(배정 없을 때만)
-    for stu in students or []:
-        if not isinstance(stu, dict):
-            continue
-
-        sid = str(stu.get("id") or "").strip()
-        if not sid:
-            continue
-
-        cur_key = (stu.get("curriculum") or "").strip()
-        sub_key = (stu.get("subCurriculum") or "").strip()
-
-        # 이미 오늘 배정 있으면 스킵
-        cur = updates[today].get(sid)
-        if _has_assigned(cur):
-            continue
-
-        # 현재 커리/서브커리의 영상만 모으기
-        cur_vids = [
-            v for v in (videos or [])
-            if isinstance(v, dict)
-            and (v.get("curriculum") or "").strip() == cur_key
-            and (v.get("subCurriculum") or "").strip() == sub_key
-        ]
-        cur_vids.sort(key=lambda v: (_chap_num(v), str(v.get("mid") or "")))
-
-        blocked = {
-            str(mid)
-            for mid, st in (last_status.get(sid) or {}).items()
-            if st in ("done", "skip")
-        }
-
-        # 자동배정 개수
-        sub_norm = sub_key.strip().lower()
-        if sub_norm == "A:ble":
-            max_assign = 1
-        elif sub_norm == "APEX":
-            max_assign = 2
-        else:
-            max_assign = 2
-
-        picked = []
-        for v in cur_vids:
-            mid = str(v.get("mid") or "").strip()
-            if not mid:
-                continue
-            # ✅ 등록된 mid만 (이중 안전)
-            if mid not in valid_mids:
-                continue
-            if mid in blocked:
-                continue
-            picked.append(mid)
-            if len(picked) >= max_assign:
-                break
-
-        if picked:
-            print("[AUTOASSIGN] PICK sid =", sid, "picked =", picked, flush=True)
-            updates[today][sid] = picked
-            changed = True
-
-    return updates
-
+        return parse_date_slice(request.args)
+    except ValueError as e:
+        abort(400, description=str(e))
 
 
 # ─────────────────────────────────────────────
@@ -310,68 +64,175 @@ def _ensure_today_auto_assign(updates, students, videos, progress):
 # ─────────────────────────────────────────────
 @bp_api_basic.route("/api/students", methods=["GET", "POST"])
 def api_students():
-    return crud(STU_PATH)
+    resp = crud(STU_PATH, "students")
+    if request.method == "POST":
+        auto_assigner.poke("students")
+    return resp
 
 
 @bp_api_basic.route("/api/videos", methods=["GET", "POST"])
 def api_videos():
-    return crud(VID_PATH)
+    resp = crud(VID_PATH, "videos")
+    if request.method == "POST":
+        auto_assigner.poke("videos")
+    return resp
 
 
 @bp_api_basic.route("/api/progress", methods=["GET", "POST"])
 def api_progress():
-    return crud(PRG_PATH)
+    store = get_store("progress")
+    if request.method == "GET":
+        # ?asOf=YYYY-MM-DD[&sids=a,b] → 그 날짜 시점 {sid: {mid: state}} (core.progressevents as-of 인덱스)
+        as_of = str(request.args.get("asOf") or "").strip()
+        if as_of:
+            if not DATE_RE.match(as_of):
+                abort(400, description="bad asOf")
+            sids = [s for s in str(request.args.get("sids") or "").split(",") if s.strip()] or None
+            return conditional_resp(
+                (store.signature(), as_of, sids), lambda: progress_as_of(as_of, sids),
+            )
+        return conditional_resp(store.signature(), store.read_all)
+    body = request.get_json(force=True)
+    with store.lock():
+        before, old = store.signature(), store.read_all()
+        store.replace_all(body)
+        # 저장소가 값을 줄여 쓸 수 있음(PROGRESS_MODE=events) → 실제 저장된 걸로 뷰 갱신
+        new = store.read_all()
+        latest_progress.apply(before, old, new)
+    changes.record("progress", diff_keys(old, new))
+    auto_assigner.poke("progress")
+    return "", 204
+
+
+def _parse_progress_patch(body) -> tuple:
+    """progress patch 한 건 검증 → ((date, sid, mid, state), None) / (None, 에러)  (state=None 이면 삭제)"""
+    if not isinstance(body, dict):
+        return None, "bad payload"
+    date = str(body.get("date") or "").strip()
+    sid = str(body.get("sid") or "").strip()
+    mid = str(body.get("mid") or "").strip()
+    if not date or not sid or not mid or "state" not in body:
+        return None, "missing date/sid/mid/state"
+    if not DATE_RE.match(date):
+        return None, "bad date"
+    return (date, sid, mid, body.get("state")), None
+
+
+@bp_api_basic.post("/api/progress/patch")
+def api_progress_patch():
+    """
+    ✅ progress 부분 저장 (전체 POST 대신)
+    body: { "ops": [ {date, sid, mid, state}, ... ] }  (리스트 / 한 건만 보내도 됨, state=null 이면 그 mid 삭제)
+    - 락 안에서 바뀌는 날짜만 읽고 써서 합침 → 다른 기기 저장과 안 겹침
+    - 최신 진도 뷰(latest_progress)도 그 날짜만 반영
+    -> {"ok", "applied", "results": [...], "version": GET /api/progress 의 ETag}
+    """
+    body = request.get_json(force=True)
+    items = body.get("ops", [body]) if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "ops list required"}), 400
+
+    store = get_store("progress")
+    results = []
+    keys = []
+    with store.lock():
+        before = store.signature()
+        old: dict = {}
+        new: dict = {}
+        for item in items:
+            op, err = _parse_progress_patch(item)
+            if err:
+                results.append({"ok": False, "error": err})
+                continue
+            date, sid, mid, st = op
+            if date not in new:
+                old[date] = store.read_date(date)
+                new[date] = thaw(old[date]) if isinstance(old[date], dict) else {}
+            day = new[date]
+            mids = day.get(sid) if isinstance(day.get(sid), dict) else {}
+            changed = mids.get(mid) != st or (st is None and mid in mids)
+            if changed:
+                mids = dict(mids)
+                if st is None:
+                    mids.pop(mid, None)
+                else:
+                    mids[mid] = st
+                day[sid] = mids
+                keys.append((date, sid))
+            results.append({"ok": True, "date": date, "sid": sid, "mid": mid, "changed": changed})
+
+        dirty = {d for d, _ in keys}
+        if dirty:
+            store.write_dates({d: new[d] or None for d in dirty}).result()
+            latest_progress.apply(before, {d: old[d] for d in dirty}, {d: store.read_date(d) for d in dirty})
+        version = etag_of(store.signature())
+
+    if keys:
+        changes.record("progress", keys)
+        auto_assigner.poke("progress")
+    return jsonify({
+        "ok": all(r["ok"] for r in results), "applied": len(keys), "results": results, "version": version,
+    })
 
 
 @bp_api_basic.route("/api/updates", methods=["GET", "POST"])
 def api_updates():
+    store = get_store("updates")
     if request.method == "GET":
-        updates = load(UPD_PATH)
-        fixed = _ensure_today_auto_assign(
-            updates,
-            load(STU_PATH),
-            load(VID_PATH),
-            load(PRG_PATH)
-        )
-        if fixed != updates:
-            save_atomic(UPD_PATH, fixed)
-        return nocache_resp(fixed)
-
-    save_atomic(UPD_PATH, request.get_json(force=True))
+        # 오늘 자동배정은 core.autoassign 스케줄러가 함 → 여기선 지금 데이터만 읽고 스케줄러는 깨우기만
+        auto_assigner.nudge()
+        sl = _date_slice_arg()
+        if sl is not None:
+            return conditional_resp((store.signature(), sl), lambda: store.read_slice(sl))
+        return conditional_resp(store.signature(), store.read_all)
+
+    with store.lock():
+        old = store.read_all()
+        store.replace_all(request.get_json(force=True))
+        keys = diff_keys(old, store.read_all())
+    changes.record("updates", keys)
+    auto_assigner.poke("updates")
     return "", 204
 
 
 @bp_api_basic.route("/api/mat-assign", methods=["GET", "POST"])
 def api_mat_assign():
-    return crud(ASN_PATH)
+    return crud(ASN_PATH, "mat-assign")
 
 
 @bp_api_basic.route("/api/materials", methods=["GET", "POST"])
 def api_materials():
     if request.method == "GET":
-        return jsonify(load(MAT_PATH))
-    save_atomic(MAT_PATH, request.get_json(force=True))
+        return conditional_resp(doc_signature(MAT_PATH), lambda: load(MAT_PATH))
+    with locks.exclusive(MAT_PATH):
+        save_atomic(MAT_PATH, request.get_json(force=True))
+    changes.record("materials")
     return "", 204
 
 
 @bp_api_basic.route("/api/school-calendar", methods=["GET", "POST"])
 def api_school_calendar():
     if request.method == "GET":
-        return jsonify(load(CAL_PATH))
+        return conditional_resp(doc_signature(CAL_PATH), lambda: load(CAL_PATH))
     data = request.get_json(force=True) or {}
-    save_atomic(CAL_PATH, data)
+    with locks.exclusive(CAL_PATH):
+        save_atomic(CAL_PATH, data)
+    changes.record("school-calendar")
     return jsonify(data)
 
 
 @bp_api_basic.post("/api/add-student")
 def api_add_student():
-    students: List[dict] = load(STU_PATH)
     data = request.get_json(force=True) or {}
     raw_name = str(data.get("name", "user"))
     name_slug = re.sub(r"[^0-9A-Za-z가-힣]", "", raw_name)
     data["id"] = f"{name_slug}{random.randint(0, 999):03d}"
-    students.append(data)
-    save_atomic(STU_PATH, students)
+    with locks.exclusive(STU_PATH):
+        students: List[dict] = load_copy(STU_PATH)
+        students.append(data)
+        save_atomic(STU_PATH, students)
+    changes.record("students")
+    auto_assigner.poke("students")
     return jsonify({"id": data["id"]})
 
 
@@ -388,28 +249,40 @@ def api_feedback():
 
 @bp_api_basic.route("/api/extra-attend", methods=["GET", "POST"])
 def api_extra_attend():
-    return crud(EXTRA_PATH)
+    sl = _date_slice_arg() if request.method == "GET" else None
+    if sl is not None:
+        return conditional_resp((doc_signature(EXTRA_PATH), sl), lambda: slice_days(load(EXTRA_PATH), sl))
+    return crud(EXTRA_PATH, "extra-attend")
 
 
 @bp_api_basic.route("/api/weekend-slots", methods=["GET", "POST"])
 def api_weekend_slots():
     if request.method == "GET":
-        return jsonify(load(WEEKEND_SLOTS_PATH))
+        sl = _date_slice_arg()
+        if sl is not None:
+            return conditional_resp(
+                (doc_signature(WEEKEND_SLOTS_PATH), sl), lambda: slice_days(load(WEEKEND_SLOTS_PATH), sl)
+            )
+        return conditional_resp(doc_signature(WEEKEND_SLOTS_PATH), lambda: load(WEEKEND_SLOTS_PATH))
     body = request.get_json(force=True) or {}
-    cur = load(WEEKEND_SLOTS_PATH)
-    for date, mapping in (body.items() if isinstance(body, dict) else []):
-        if not isinstance(mapping, dict):
-            continue
-
-        def norm(v):
-            if isinstance(v, list):
-                return [int(x) for x in v if str(x).isdigit()]
-            if str(v).isdigit():
-                return int(v)
-            return v
-
-        cur.setdefault(date, {}).update({str(k): norm(v) for k, v in mapping.items()})
-    save_atomic(WEEKEND_SLOTS_PATH, cur)
+
+    def norm(v):
+        if isinstance(v, list):
+            return [int(x) for x in v if str(x).isdigit()]
+        if str(v).isdigit():
+            return int(v)
+        return v
+
+    keys = []
+    with locks.exclusive(WEEKEND_SLOTS_PATH):
+        cur = load_copy(WEEKEND_SLOTS_PATH)
+        for date, mapping in (body.items() if isinstance(body, dict) else []):
+            if not isinstance(mapping, dict):
+                continue
+            cur.setdefault(date, {}).update({str(k): norm(v) for k, v in mapping.items()})
+            keys.extend((date, str(k)) for k in mapping)
+        fut = changes.record_after(save_coalesced(WEEKEND_SLOTS_PATH, cur), "weekend-slots", keys)
+    fut.result()
     return "", 204
 
 
@@ -421,31 +294,35 @@ def api_weekend_slots():
 @bp_api_basic.route("/api/logs", methods=["GET", "POST"])
 def api_logs():
     if request.method == "GET":
-        return nocache_resp(load(LOGS_PATH))
+        sl = _date_slice_arg()
+        if sl is not None:
+            return conditional_resp((logs_journal.signature(), sl), lambda: slice_days(logs_journal.read(), sl))
+        return conditional_resp(logs_journal.signature(), logs_journal.read)
 
-    # 레거시 전체 업로드: 그래도 "안전 merge" + 락은 적용
+    # 레거시 전체 업로드: 그래도 "안전 merge" 적용
+    # → 실제로 바뀌는 (date, sid) 만 저널에 기록 (전체 재작성 X)
     incoming = request.get_json(force=True) or {}
-    with _logs_lock():
-        current = load(LOGS_PATH) or {}
-
-        if not isinstance(incoming, dict):
-            incoming = {}
+    if not isinstance(incoming, dict):
+        incoming = {}
 
+    with logs_journal.lock():
+        current = logs_journal.read()
+        ops = []
         for date, by_sid in incoming.items():
             if not isinstance(by_sid, dict):
                 continue
-            cur_day = current.setdefault(date, {})
+            cur_day = current.get(date)
             if not isinstance(cur_day, dict):
-                current[date] = {}
-                cur_day = current[date]
+                cur_day = {}
 
             for sid, entry in by_sid.items():
                 if not isinstance(entry, dict):
                     continue
-                cur_entry = cur_day.get(sid, {})
-                cur_day[str(sid)] = _merge_entry_safe(cur_entry, entry)
+                cur_entry = cur_day.get(str(sid), {})
+                if merge_entry_safe(cur_entry, entry) != cur_entry:
+                    ops.append((str(date), str(sid), entry))
 
-        save_atomic(LOGS_PATH, current)
+        logs_journal.append(ops)
 
     return "", 204
 
@@ -462,8 +339,22 @@ def api_logs_patch():
         "__clear": ["notes", ...]  # (옵션) 명시 삭제
       }
     - entry 안에 "__clear" 넣어도 되고, 최상단 "__clear"도 지원
+    - logs.json 재작성 없이 저널에 한 줄 append (merge 는 읽을 때 fold)
     """
     body = request.get_json(force=True) or {}
+    op, err = _parse_log_patch(body)
+    if err:
+        return jsonify({"ok": False, "error": err}), 400
+
+    logs_journal.patch(*op)
+
+    return jsonify({"ok": True})
+
+
+def _parse_log_patch(body) -> tuple:
+    """patch 한 건 검증 → ((date, sid, entry), None) / (None, 에러)"""
+    if not isinstance(body, dict):
+        return None, "bad payload"
     date = str(body.get("date") or "").strip()
     sid = str(body.get("sid") or "").strip()
     entry = body.get("entry") or {}
@@ -474,22 +365,77 @@ def api_logs_patch():
         entry["__clear"] = top_clear
 
     if not date or not sid or not isinstance(entry, dict):
-        return jsonify({"ok": False, "error": "bad payload"}), 400
+        return None, "bad payload"
     if not DATE_RE.match(date):
-        return jsonify({"ok": False, "error": "bad date"}), 400
+        return None, "bad date"
+    if PROGRESS_MODE == "events" and isinstance(entry.get("progress"), dict):
+        # 전이 저장 모드: logs 항목에도 직전 상태와 달라진 mid 만 (기본 snapshot 모드는 클라이언트가 보낸 전체 그대로)
+        entry = dict(entry)
+        entry["progress"] = log_progress_changes(sid, date, entry["progress"])
+    return (date, sid, entry), None
 
-    with _logs_lock():
-        current = load(LOGS_PATH) or {}
-        day = current.setdefault(date, {})
-        if not isinstance(day, dict):
-            current[date] = {}
-            day = current[date]
 
-        cur_entry = day.get(sid, {})
-        day[sid] = _merge_entry_safe(cur_entry, entry)
-        save_atomic(LOGS_PATH, current)
+@bp_api_basic.post("/api/logs/patch-batch")
+def api_logs_patch_batch():
+    """
+    ✅ 여러 (date, sid) 부분 저장을 한 번에
+    body: { "ops": [ {date, sid, entry, __clear}, ... ] }  (리스트만 보내도 됨)
+    - 락 한 번 + 저널 append 한 번 (merge 는 /api/logs/patch 와 동일: merge_entry_safe)
+    - 결과는 ops 순서대로: {"ok": true, "changed": bool} / {"ok": false, "error": ...}
+      (잘못된 op 만 실패, 나머지는 저장됨 / 바뀌는 게 없는 op 는 저널에 안 씀)
+    """
+    body = request.get_json(force=True)
+    items = body.get("ops") if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        return jsonify({"ok": False, "error": "ops list required"}), 400
+
+    results = []
+    ops = []
+    with logs_journal.lock():
+        current = logs_journal.read()
+        pending: dict = {}  # 같은 배치 안에서 같은 (date, sid) 를 여러 번 고치는 경우
+        for item in items:
+            op, err = _parse_log_patch(item)
+            if err:
+                results.append({"ok": False, "error": err})
+                continue
+            date, sid, entry = op
+            key = (date, sid)
+            if key in pending:
+                cur = pending[key]
+            else:
+                day = current.get(date)
+                cur = day.get(sid, {}) if isinstance(day, dict) else {}
+            nxt = merge_entry_safe(cur, entry)
+            changed = nxt != cur
+            pending[key] = nxt
+            if changed:
+                ops.append(op)
+            results.append({"ok": True, "date": date, "sid": sid, "changed": changed})
+        logs_journal.append(ops)
 
-    return jsonify({"ok": True})
+    return jsonify({"ok": all(r["ok"] for r in results), "applied": len(ops), "results": results})
+
+
+@bp_api_basic.get("/api/students/<string:sid>/timeline")
+def api_student_timeline(sid: str):
+    """
+    한 학생 logs 기록 최신순: ?before=YYYY-MM-DD(커서, 그 날짜 미만) &limit=N(기본 30, 최대 365)
+    -> { "sid", "items": [{"date", "entry"}], "next": 다음 before 값 | null }
+    """
+    before = str(request.args.get("before") or "").strip() or None
+    if before and not DATE_RE.match(before):
+        return jsonify({"ok": False, "error": "bad before"}), 400
+    try:
+        limit = max(1, min(int(request.args.get("limit") or 30), 365))
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad limit"}), 400
+
+    def build():
+        items, nxt = logs_journal.timeline(sid, before, limit)
+        return {"sid": sid, "items": [{"date": d, "entry": e} for d, e in items], "next": nxt}
+
+    return conditional_resp((logs_journal.signature(), sid, before, limit), build)
 
 
 # 결석(통합)
@@ -497,12 +443,15 @@ def api_logs_patch():
 
 @bp_api_basic.delete("/api/students/<string:sid>")
 def api_delete_student(sid: str):
-    students: List[dict] = load(STU_PATH)
-    for i, s in enumerate(students):
-        if str(s.get("id")) == str(sid):
-            del students[i]
-            save_atomic(STU_PATH, students)
-            return "", 204
+    with locks.exclusive(STU_PATH):
+        students: List[dict] = load_copy(STU_PATH)
+        for i, s in enumerate(students):
+            if str(s.get("id")) == str(sid):
+                del students[i]
+                save_atomic(STU_PATH, students)
+                changes.record("students")
+                auto_assigner.poke("students")
+                return "", 204
     abort(404, description="학생을 찾을 수 없습니다.")
 
 
@@ -516,15 +465,52 @@ def api_update_student_field():
     if not sid or not field:
         abort(400)
 
-    students: List[dict] = load(STU_PATH)
-    for s in students:
-        if str(s.get("id")) == str(sid):
-            s[field] = value
-            save_atomic(STU_PATH, students)
-            return "OK"
+    with locks.exclusive(STU_PATH):
+        students: List[dict] = load_copy(STU_PATH)
+        for s in students:
+            if str(s.get("id")) == str(sid):
+                s[field] = value
+                save_atomic(STU_PATH, students)
+                changes.record("students")
+                auto_assigner.poke("students")
+                return "OK"
     abort(404)
 
 
 @bp_api_basic.get("/api/ping")
 def api_ping():
     return "ok"
+
+
+@bp_api_basic.get("/api/storage-stats")
+def api_storage_stats():
+    # 운영 점검용: 문서 캐시 / 쓰기 합치기 / 락 대기·보유 시간
+    return nocache_resp({
+        "docCache": doc_cache_stats(),
+        "writeBehind": write_behind_stats(),
+        "locks": lock_stats(),
+        "archive": archive_stats(),
+        "logsCommit": logs_journal.commit_stats(),
+        "progressLatest": latest_progress.stats(),
+        "videoIndex": video_index.stats(),
+        "autoAssign": auto_assigner.stats(),
+        "testStats": test_stats.stats(),
+    })
+
+
+@bp_api_basic.get("/api/changes")
+def api_changes():
+    """
+    변경 피드: ?since=<seq>[&limit=N]
+    - since 없으면 현재 seq 만 (처음 붙는 클라이언트는 전체 GET 후 이 seq 부터 폴링)
+    - reset=true 면 피드가 잘려 빠진 변경이 있을 수 있음 → 전체 다시 받기
+    """
+    since = request.args.get("since", "").strip()
+    if not since:
+        return nocache_resp({"seq": changes.last_seq(), "reset": False, "more": False, "changes": []})
+    try:
+        seq = int(since)
+        limit = int(request.args.get("limit") or CHANGES_PAGE_LIMIT)
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad since/limit"}), 400
+    return nocache_resp(changes.since(seq, max(1, min(limit, 5000))))
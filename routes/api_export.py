@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import io
+import string
+import urllib.parse
+from typing import Any, Dict, Iterator, List, Tuple
+
+from flask import Blueprint, Response, abort, request, stream_with_context
+
+from core.datestore import get_store, parse_date_slice, slice_days
+from core.logjournal import logs_journal
+from core.progressevents import progress_index
+from core.paths import STU_PATH, VID_PATH
+from core.storage import load
+from core.videoindex import chap_num
+
+bp_api_export = Blueprint("api_export", __name__)
+
+# ─────────────────────────────────────────────
+# ✅ 수업 기록 내보내기 (GET /api/logs/export) — 예전 exportLogs.js 가 브라우저에서 하던 일
+#  - 날짜 파라미터 없음 : "done=true && archived!=true" 기록 중 학생별 최신 1건 (기존 버튼 동작)
+#  - ?date= / ?start=&end= : 그 구간의 done 기록 전부 (?sids= 로 학생 제한 가능)
+#  - ?format=txt(기본) | csv,  ?template= 로 TXT 학생 블록 모양 변경
+#    ({필드} 만 허용 — _TXT_FIELDS 이름, 서식(:...)/변환(!r)/속성·인덱스 접근은 400)
+#  - 진도: 그 날 바뀐 것만, skip/none 제외, chap_num 챕터순 / 테스트: logs + tests 문서 합침
+#  - 학생 하나씩 만들어서 바로 흘려보냄(generator) → 메모리는 구간 크기만큼만
+# ─────────────────────────────────────────────
+HW_HEADER_LINE = "교재 / 이번 숙제 / 진행률 / 코멘트 / 다음숙제"
+
+_TXT_TEMPLATE = "({md}) {name}\n{special}{tests}진도 ({curriculum}) : {progress}\n\n{homework}\n\n\n"
+_TXT_FIELDS = frozenset({"date", "md", "sid", "name", "curriculum", "progress", "tests", "special", "homework"})
+_CSV_COLUMNS = ["date", "sid", "name", "curriculum", "progress", "tests", "special", "homework"]
+
+
+def _s(v) -> str:
+    return "" if v is None else str(v).strip()
+
+
+def _first(row: dict, *keys) -> str:
+    for k in keys:
+        v = row.get(k)
+        if v is not None and _s(v):
+            return _s(v)
+    return ""
+
+
+def _hw_line(r: Any) -> str:
+    if not isinstance(r, dict):
+        return ""
+    book = _first(r, "book", "textbook", "name", "교재")
+    this_hw = _first(r, "thisHw", "this", "current", "unit", "이번숙제", "이번", "숙제")
+    pct = _first(r, "pct", "progress", "percent", "진행률")
+    if pct and "%" not in pct:
+        pct = f"{pct}%"
+    comment = _first(r, "comment", "memo", "note", "코멘트", "비고")
+    next_hw = _first(r, "nextHw", "next", "nextHomework", "다음숙제", "다음")
+    if not (book or this_hw or pct or comment or next_hw):
+        return ""
+    return f"{book} / {this_hw} / {pct} / {comment} / {next_hw}"
+
+
+def _hw_lines(entry: dict) -> List[str]:
+    table = entry.get("homeworkTable")
+    if isinstance(table, list) and table:
+        return [ln for ln in map(_hw_line, table) if ln]
+    legacy = _s(entry.get("homework")).replace("\r", " ").replace("\n", " ")
+    return [f" / {legacy} /  /  / "] if legacy else []
+
+
+def _special(entry: dict) -> str:
+    for k in ("notes", "note", "memo", "special", "specialNote", "remark", "특이사항"):
+        v = entry.get(k)
+        if isinstance(v, list):
+            s = " / ".join(x for x in map(_s, v) if x)
+        elif isinstance(v, (str, int, float)) and not isinstance(v, bool):
+            s = _s(v)
+        else:
+            continue
+        if s:
+            return s
+    return ""
+
+
+def _test_lines(entry: dict, extra: Any) -> List[str]:
+    # logs.tests + tests 문서 같은 날 기록 (submit-test 는 양쪽에 씀 → 중복 제거)
+    seen = set()
+    out = []
+    recs = list(entry.get("tests") or []) + (list(extra) if isinstance(extra, list) else [])
+    for t in recs:
+        if not isinstance(t, dict):
+            continue
+        key = (_s(t.get("name")), _s(t.get("score")), _s(t.get("createdAt")))
+        if key in seen:
+            continue
+        seen.add(key)
+        wrong = ", ".join(map(str, t.get("wrong"))) if isinstance(t.get("wrong"), list) else ""
+        memo = _s(t.get("memo"))
+        line = f"{key[0]} {key[1]}" + (f" (오답: {wrong})" if wrong else "") + (f" – {memo}" if memo else "")
+        if line.strip():
+            out.append(line.strip())
+    return out
+
+
+def _progress_labels(sid: str, date: str, videos: Dict[str, dict]) -> List[str]:
+    """그 날 진도 중 이전 누적과 달라진 것만, 챕터순"""
+    prior = progress_index.get().student(sid, date, inclusive=False)
+    day = get_store("progress").read_date(date)
+    that_day = day.get(sid) if isinstance(day, dict) else None
+    that_day = that_day if isinstance(that_day, dict) else {}
+    diffs = []
+    for mid, st in that_day.items():
+        if prior.get(mid) == st or st in ("none", "skip"):
+            continue
+        v = videos.get(str(mid))
+        if v is None or st not in ("done", "interrupted"):
+            continue
+        diffs.append((chap_num(v), f"{v.get('chapter')}차시" + ("(중단)" if st == "interrupted" else "")))
+    diffs.sort(key=lambda x: x[0])
+    return [label for _, label in diffs]
+
+
+def _is_true(v) -> bool:
+    return v is True or v == "true"
+
+
+def _targets(sl) -> List[Tuple[str, str, dict]]:
+    """[(date, sid, entry)] — 날짜 구간 없으면 미정리 완료 기록 학생별 최신 1건"""
+    logs = logs_journal.read()
+    if sl is None:
+        latest: Dict[str, Tuple[str, dict]] = {}
+        for date in sorted(logs):
+            day = logs[date]
+            for sid, e in (day.items() if isinstance(day, dict) else []):
+                if isinstance(e, dict) and _is_true(e.get("done")) and not _is_true(e.get("archived")):
+                    latest[str(sid)] = (date, e)
+        return [(d, sid, e) for sid, (d, e) in latest.items()]
+    out = []
+    for date, day in slice_days(logs, sl).items():
+        for sid, e in (day.items() if isinstance(day, dict) else []):
+            if isinstance(e, dict) and _is_true(e.get("done")):
+                out.append((date, str(sid), e))
+    return out
+
+
+def _records(sl) -> Iterator[dict]:
+    students = {str(s.get("id")): s for s in load(STU_PATH) if isinstance(s, dict)}
+    videos = {str(v.get("mid")): v for v in load(VID_PATH) if isinstance(v, dict)}
+    tests_store = get_store("tests")
+
+    targets = [t for t in _targets(sl) if t[1] in students]
+    targets.sort(key=lambda t: (str(students[t[1]].get("name") or ""), t[0]))
+
+    for date, sid, entry in targets:
+        stu = students[sid]
+        special = _special(entry)
+        day_tests = tests_store.read_date(date)
+        tests = _test_lines(entry, day_tests.get(sid) if isinstance(day_tests, dict) else None)
+        progress = _progress_labels(sid, date, videos)
+        hw = _hw_lines(entry)
+        # 진도/숙제/테스트/특이사항 다 비면 제외
+        if not (progress or hw or tests or special):
+            continue
+        try:
+            md = f"{int(date[5:7])}/{int(date[8:10])}"
+        except ValueError:
+            md = date
+        yield {
+            "date": date,
+            "md": md,
+            "sid": sid,
+            "name": _s(stu.get("name")),
+            "curriculum": _s(stu.get("curriculum")) + (f" {_s(stu.get('subCurriculum'))}" if _s(stu.get("subCurriculum")) else ""),
+            "progress": progress,
+            "tests": tests,
+            "special": special,
+            "homework": hw,
+        }
+
+
+def _check_template(template: str) -> None:
+    """?template= 검증: {필드} 이름만 (_TXT_FIELDS), 서식/변환/속성·인덱스 접근 불가 → ValueError"""
+    for _, field, spec, conv in string.Formatter().parse(template):
+        if field is None:
+            continue
+        if field not in _TXT_FIELDS:
+            raise ValueError(f"unknown field {{{field}}}")
+        if spec or conv:
+            raise ValueError(f"format spec/conversion not allowed in {{{field}}}")
+
+
+def _txt(records: Iterator[dict], template: str) -> Iterator[str]:
+    for r in records:
+        yield template.format_map(dict(
+            r,
+            progress=", ".join(r["progress"]),
+            special=f"특이사항 : {r['special']}\n\n" if r["special"] else "",
+            tests=f"테스트 : {' / '.join(r['tests'])}\n\n" if r["tests"] else "",
+            homework="\n".join(["숙제 :", HW_HEADER_LINE] + r["homework"]),
+        ))
+
+
+def _csv(records: Iterator[dict]) -> Iterator[str]:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(_CSV_COLUMNS)
+    yield "\ufeff" + buf.getvalue()  # 엑셀에서 한글 안 깨지게 BOM
+    for r in records:
+        buf.seek(0)
+        buf.truncate()
+        w.writerow([
+            r["date"], r["sid"], r["name"], r["curriculum"], ", ".join(r["progress"]),
+            " / ".join(r["tests"]), r["special"], " | ".join(r["homework"]),
+        ])
+        yield buf.getvalue()
+
+
+@bp_api_export.get("/api/logs/export")
+def api_logs_export():
+    try:
+        sl = parse_date_slice(request.args)
+    except ValueError as e:
+        abort(400, description=str(e))
+    fmt = _s(request.args.get("format")).lower() or "txt"
+    if fmt not in ("txt", "csv"):
+        abort(400, description="format must be txt or csv")
+
+    template = request.args.get("template") or _TXT_TEMPLATE
+    try:
+        _check_template(template)
+    except ValueError as e:
+        abort(400, description=f"bad template: {e}")
+
+    if sl is None:
+        label = "완료미정리"
+    elif sl.start == sl.end:
+        label = sl.start
+    else:
+        label = f"{sl.start or ''}~{sl.end or ''}"
+    stamp = dt.date.today().isoformat()
+    filename = f"수업기록_{label}_{stamp}.{fmt}"
+
+    records = _records(sl)
+    body = _csv(records) if fmt == "csv" else _txt(records, template)
+    mimetype = "text/csv" if fmt == "csv" else "text/plain"
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(filename)}",
+            "Cache-Control": "no-store",
+        },
+    )
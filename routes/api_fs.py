@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import os
 import pathlib
 import re
@@ -10,9 +11,12 @@ from flask import Blueprint, abort, jsonify, make_response, request, send_from_d
 from werkzeug.utils import secure_filename
 
 from core.paths import FILES_DIR, MAT_PATH, ASN_PATH, PAGE_FOLDERS_PATH
-from core.storage import load, save_atomic
+from core.changes import changes, register_doc
+from core.locks import locks
+from core.storage import conditional_resp, doc_signature, load, load_copy, save_atomic
 
 bp_api_fs = Blueprint("api_fs", __name__)
+register_doc("page-folders", lambda: load(PAGE_FOLDERS_PATH))
 
 def json_or_form() -> dict:
     data = request.get_json(silent=True)
@@ -77,15 +81,23 @@ def _rel_from_url(url: str) -> str | None:
         return None
 
 def _load_mats_and_assigns():
-    mats = load(MAT_PATH)
+    mats = load_copy(MAT_PATH)
     if not isinstance(mats, dict): mats = {}
-    assigns = load(ASN_PATH)
+    assigns = load_copy(ASN_PATH)
     if not isinstance(assigns, dict): assigns = {}
     return mats, assigns
 
 def _save_mats_and_assigns(mats, assigns):
     save_atomic(MAT_PATH, mats)
     save_atomic(ASN_PATH, assigns)
+    changes.record("materials")
+    changes.record("mat-assign")
+
+@contextlib.contextmanager
+def _mats_and_assigns_locked():
+    # 두 문서를 같이 고치는 곳: 항상 materials → mat_assign 순서로 잡음(교착 방지)
+    with locks.exclusive(MAT_PATH), locks.exclusive(ASN_PATH):
+        yield
 
 def _ensure_dir(rel_dir: str):
     p = _safe_join(rel_dir)
@@ -151,29 +163,30 @@ def api_fs_rename():
         old_rel = src.replace("\\", "/")
         new_rel = _rel_from_abs(abs_dst)
 
-        mats, assigns = _load_mats_and_assigns()
-        old_url = _url_for_rel(old_rel)
-        new_url = _url_for_rel(new_rel)
+        with _mats_and_assigns_locked():
+            mats, assigns = _load_mats_and_assigns()
+            old_url = _url_for_rel(old_rel)
+            new_url = _url_for_rel(new_rel)
 
-        for mid, meta in list(mats.items()):
-            if isinstance(meta, dict) and meta.get("url") == old_url:
-                meta["url"] = new_url
-                mats[mid] = meta
+            for mid, meta in list(mats.items()):
+                if isinstance(meta, dict) and meta.get("url") == old_url:
+                    meta["url"] = new_url
+                    mats[mid] = meta
 
-        for sid, arr in list(assigns.items()):
-            if not isinstance(arr, list):
-                continue
-            changed = False
-            for i, v in enumerate(arr):
-                sval = str(v)
-                if sval == old_url:
-                    arr[i] = new_url; changed = True
-                elif sval.lstrip("/").replace("\\", "/") == old_rel:
-                    arr[i] = new_rel; changed = True
-            if changed:
-                assigns[sid] = arr
-
-        _save_mats_and_assigns(mats, assigns)
+            for sid, arr in list(assigns.items()):
+                if not isinstance(arr, list):
+                    continue
+                changed = False
+                for i, v in enumerate(arr):
+                    sval = str(v)
+                    if sval == old_url:
+                        arr[i] = new_url; changed = True
+                    elif sval.lstrip("/").replace("\\", "/") == old_rel:
+                        arr[i] = new_rel; changed = True
+                if changed:
+                    assigns[sid] = arr
+
+            _save_mats_and_assigns(mats, assigns)
 
         return jsonify({"ok": True, "path": new_rel})
     except Exception as e:
@@ -202,33 +215,34 @@ def api_fs_delete():
             errors.append({"path": rel, "error": str(e)})
 
     if rel_set:
-        mats, assigns = _load_mats_and_assigns()
+        with _mats_and_assigns_locked():
+            mats, assigns = _load_mats_and_assigns()
 
-        ids_to_remove = []
-        for mid, meta in list(mats.items()):
-            url = (meta or {}).get("url")
-            rel = _rel_from_url(url)
-            if rel and rel in rel_set:
-                ids_to_remove.append(str(mid))
+            ids_to_remove = []
+            for mid, meta in list(mats.items()):
+                url = (meta or {}).get("url")
+                rel = _rel_from_url(url)
+                if rel and rel in rel_set:
+                    ids_to_remove.append(str(mid))
 
-        for mid in ids_to_remove:
-            mats.pop(mid, None)
+            for mid in ids_to_remove:
+                mats.pop(mid, None)
 
-        for sid, arr in list(assigns.items()):
-            if not isinstance(arr, list):
-                continue
-            new_arr = []
-            for v in arr:
-                sval = str(v)
-                if sval in ids_to_remove:
-                    continue
-                rel = _rel_from_url(sval) or sval.lstrip("/").replace("\\", "/")
-                if rel in rel_set:
+            for sid, arr in list(assigns.items()):
+                if not isinstance(arr, list):
                     continue
-                new_arr.append(v)
-            assigns[sid] = new_arr
+                new_arr = []
+                for v in arr:
+                    sval = str(v)
+                    if sval in ids_to_remove:
+                        continue
+                    rel = _rel_from_url(sval) or sval.lstrip("/").replace("\\", "/")
+                    if rel in rel_set:
+                        continue
+                    new_arr.append(v)
+                assigns[sid] = new_arr
 
-        _save_mats_and_assigns(mats, assigns)
+            _save_mats_and_assigns(mats, assigns)
 
     return jsonify({"ok": True, "deleted": deleted, "errors": errors})
 
@@ -265,30 +279,31 @@ def api_fs_move():
             renames.append((old_rel, new_rel))
 
         if renames:
-            mats, assigns = _load_mats_and_assigns()
-            for old_rel, new_rel in renames:
-                old_url = _url_for_rel(old_rel)
-                new_url = _url_for_rel(new_rel)
-
-                for mid, meta in list(mats.items()):
-                    if isinstance(meta, dict) and meta.get("url") == old_url:
-                        meta["url"] = new_url
-                        mats[mid] = meta
-
-                for sid, arr in list(assigns.items()):
-                    if not isinstance(arr, list):
-                        continue
-                    changed = False
-                    for i, v in enumerate(arr):
-                        sval = str(v)
-                        if sval == old_url:
-                            arr[i] = new_url; changed = True
-                        elif sval.lstrip("/").replace("\\", "/") == old_rel:
-                            arr[i] = new_rel; changed = True
-                    if changed:
-                        assigns[sid] = arr
-
-            _save_mats_and_assigns(mats, assigns)
+            with _mats_and_assigns_locked():
+                mats, assigns = _load_mats_and_assigns()
+                for old_rel, new_rel in renames:
+                    old_url = _url_for_rel(old_rel)
+                    new_url = _url_for_rel(new_rel)
+
+                    for mid, meta in list(mats.items()):
+                        if isinstance(meta, dict) and meta.get("url") == old_url:
+                            meta["url"] = new_url
+                            mats[mid] = meta
+
+                    for sid, arr in list(assigns.items()):
+                        if not isinstance(arr, list):
+                            continue
+                        changed = False
+                        for i, v in enumerate(arr):
+                            sval = str(v)
+                            if sval == old_url:
+                                arr[i] = new_url; changed = True
+                            elif sval.lstrip("/").replace("\\", "/") == old_rel:
+                                arr[i] = new_rel; changed = True
+                        if changed:
+                            assigns[sid] = arr
+
+                _save_mats_and_assigns(mats, assigns)
 
         return jsonify({"ok": True, "moved": moved})
     except Exception as e:
@@ -326,37 +341,39 @@ def api_fs_upload():
             new_rel_urls.append((rel, url))
 
         if new_rel_urls:
-            mats, assigns = _load_mats_and_assigns()
-            changed = False
-
-            for sid, arr in list(assigns.items()):
-                if not isinstance(arr, list):
-                    continue
+            with _mats_and_assigns_locked():
+                mats, assigns = _load_mats_and_assigns()
+                changed = False
 
-                dir_tokens = []
-                for v in arr:
-                    s = str(v)
-                    if s.startswith("DIR:"):
-                        d = s[4:].lstrip("/").replace("\\", "/")
-                        if d:
-                            dir_tokens.append(d)
-                if not dir_tokens:
-                    continue
-
-                arr_set = set(map(str, arr))
-                for rel, url in new_rel_urls:
-                    in_scope = any(rel == d or rel.startswith(d + "/") for d in dir_tokens)
-                    if not in_scope:
+                for sid, arr in list(assigns.items()):
+                    if not isinstance(arr, list):
                         continue
-                    if (url not in arr_set) and (rel not in arr_set):
-                        arr.append(url)
-                        arr_set.add(url)
-                        changed = True
 
-                assigns[sid] = arr
+                    dir_tokens = []
+                    for v in arr:
+                        s = str(v)
+                        if s.startswith("DIR:"):
+                            d = s[4:].lstrip("/").replace("\\", "/")
+                            if d:
+                                dir_tokens.append(d)
+                    if not dir_tokens:
+                        continue
 
-            if changed:
-                save_atomic(ASN_PATH, assigns)
+                    arr_set = set(map(str, arr))
+                    for rel, url in new_rel_urls:
+                        in_scope = any(rel == d or rel.startswith(d + "/") for d in dir_tokens)
+                        if not in_scope:
+                            continue
+                        if (url not in arr_set) and (rel not in arr_set):
+                            arr.append(url)
+                            arr_set.add(url)
+                            changed = True
+
+                    assigns[sid] = arr
+
+                if changed:
+                    save_atomic(ASN_PATH, assigns)
+                    changes.record("mat-assign")
     except Exception as e:
         print("[auto-assign DIR] error:", e, flush=True)
 
@@ -364,7 +381,7 @@ def api_fs_upload():
 
 @bp_api_fs.get("/api/fs/page-folders")
 def api_fs_get_page_folders():
-    return jsonify(load(PAGE_FOLDERS_PATH))
+    return conditional_resp(doc_signature(PAGE_FOLDERS_PATH), lambda: load(PAGE_FOLDERS_PATH))
 
 @bp_api_fs.post("/api/fs/page-folders")
 def api_fs_set_page_folders():
@@ -377,7 +394,9 @@ def api_fs_set_page_folders():
                 _safe_join(v)
             except Exception:
                 body[k] = ""
-    save_atomic(PAGE_FOLDERS_PATH, body)
+    with locks.exclusive(PAGE_FOLDERS_PATH):
+        save_atomic(PAGE_FOLDERS_PATH, body)
+    changes.record("page-folders")
     return jsonify({"ok": True})
 
 @bp_api_fs.get("/files/<path:fname>")
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from statistics import median
 import datetime as dt
 import re
 import time
@@ -8,13 +7,18 @@ from typing import Tuple
 
 from flask import Blueprint, jsonify, request
 
-from core.paths import (
-    LOGS_PATH, TESTS_PATH, STU_PATH,
-    TESTS_CFG_PATH
+from core.paths import STU_PATH, TESTS_CFG_PATH
+from core.storage import (
+    load, save_atomic, nocache_resp, conditional_resp, doc_signature, thaw, utc_now_isoz,
 )
-from core.storage import load, save_atomic, nocache_resp, utc_now_isoz
+from core.changes import changes, register_doc
+from core.datestore import get_store, parse_date_slice
+from core.locks import locks
+from core.logjournal import logs_journal
+from core.teststats import canon_test_name, cell_records, parse_score, test_stats
 
 bp_api_tests = Blueprint("api_tests", __name__)
+register_doc("tests-config", lambda: load(TESTS_CFG_PATH))
 
 TEST_LEVEL_RE = re.compile(r"""
   (?:\(|\[)?\s*
@@ -48,15 +52,6 @@ def _parse_unit_and_test_level(name: str) -> tuple[str, int | None]:
     s = re.sub(r"\s+", " ", s).strip()
     return s, lvl
 
-def _canon_test_name(name: str) -> str:
-    s = str(name or "").strip()
-    if not s:
-        return ""
-    if " / " in s:
-        s = s.split(" / ", 1)[1].strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
 def _parse_answer_spec(text: str, problems: int) -> list[str]:
     s = str(text or "").strip()
     if not s:
@@ -206,59 +201,70 @@ def submit_test():
         'createdAt': now_iso
     }
 
-    logs = load(LOGS_PATH)
-    if not isinstance(logs, dict): logs = {}
-    day = logs.setdefault(today, {})
-    entry = day.get(sid, {})
-    tests = entry.get('tests')
-    if not isinstance(tests, list): tests = []
-    tests.append(record)
-    entry['tests'] = tests
-    day[sid] = entry
-    logs[today] = day
-    save_atomic(LOGS_PATH, logs)
-
-    tests_json = load(TESTS_PATH)
-    if not isinstance(tests_json, dict): tests_json = {}
-    per_day = tests_json.setdefault(today, {})
-    arr = per_day.get(sid)
-    if not isinstance(arr, list): arr = []
-    arr.append(record)
-    per_day[sid] = arr
-    tests_json[today] = per_day
-    save_atomic(TESTS_PATH, tests_json)
+    # logs: 저널에 tests 필드만 패치 (읽기+append 를 같은 락 안에서)
+    with logs_journal.lock():
+        day = logs_journal.read().get(today)
+        entry = day.get(sid) if isinstance(day, dict) else None
+        tests = entry.get('tests') if isinstance(entry, dict) else None
+        tests = list(tests) if isinstance(tests, list) else []
+        tests.append(record)
+        logs_journal.append([(today, sid, {'tests': tests})])
+
+    tests_store = get_store("tests")
+    with tests_store.lock():
+        per_day = thaw(tests_store.read_date(today))
+        if not isinstance(per_day, dict): per_day = {}
+        arr = per_day.get(sid)
+        if not isinstance(arr, list): arr = []
+        arr.append(record)
+        per_day[sid] = arr
+        fut = changes.record_after(tests_store.write_dates({today: per_day}), "tests", [(today, sid)])
+    fut.result()
 
     return jsonify({'ok': True, 'score': score, 'wrong': record["wrong"], 'pct': pct})
 
 @bp_api_tests.route("/api/tests", methods=["GET", "POST"])
 def api_tests():
+    store = get_store("tests")
     if request.method == "GET":
-        return nocache_resp(load(TESTS_PATH))
+        try:
+            sl = parse_date_slice(request.args)
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        if sl is not None:
+            return conditional_resp((store.signature(), sl), lambda: store.read_slice(sl))
+        return conditional_resp(store.signature(), store.read_all)
     incoming = request.get_json(force=True) or {}
-    current = load(TESTS_PATH)
-    if not isinstance(current, dict): current = {}
-    for d, m in (incoming.items() if isinstance(incoming, dict) else []):
-        cur_m = current.setdefault(d, {})
-        for sid, arr in (m.items() if isinstance(m, dict) else []):
-            old = cur_m.get(sid, [])
-            if not isinstance(old, list): old = []
-            if isinstance(arr, list):
-                old += [x for x in arr if isinstance(x, dict)]
-            cur_m[sid] = old
-        current[d] = cur_m
-    save_atomic(TESTS_PATH, current)
+    with store.lock():
+        changed = {}
+        keys = []
+        for d, m in (incoming.items() if isinstance(incoming, dict) else []):
+            cur_m = thaw(store.read_date(d))
+            if not isinstance(cur_m, dict): cur_m = {}
+            for sid, arr in (m.items() if isinstance(m, dict) else []):
+                old = cur_m.get(sid, [])
+                if not isinstance(old, list): old = []
+                if isinstance(arr, list):
+                    old += [x for x in arr if isinstance(x, dict)]
+                cur_m[sid] = old
+                keys.append((d, sid))
+            changed[d] = cur_m
+        fut = changes.record_after(store.write_dates(changed), "tests", keys)
+    fut.result()
     return "", 204
 
 @bp_api_tests.get("/api/tests-config")
 def get_tests_config():
-    return nocache_resp(load(TESTS_CFG_PATH))
+    return conditional_resp(doc_signature(TESTS_CFG_PATH), lambda: load(TESTS_CFG_PATH))
 
 @bp_api_tests.post("/api/tests-config")
 def post_tests_config():
     payload = request.get_json(force=True) or {}
     if not isinstance(payload, dict):
         return jsonify({"ok": False, "error": "invalid payload"}), 400
-    save_atomic(TESTS_CFG_PATH, payload)
+    with locks.exclusive(TESTS_CFG_PATH):
+        save_atomic(TESTS_CFG_PATH, payload)
+    changes.record("tests-config")
     return jsonify({"ok": True})
 
 def _parse_date(s: str) -> dt.date | None:
@@ -281,33 +287,15 @@ def _iter_test_records(start: dt.date | None, end: dt.date | None):
                 continue
 
             for sid, val in by_sid.items():
-                if isinstance(val, list):
-                    arr = val
-                elif isinstance(val, dict):
-                    arr = val.get("tests", [])
-                    if not isinstance(arr, list):
-                        continue
-                else:
-                    continue
-
-                for rec in arr:
-                    if not isinstance(rec, dict):
-                        continue
+                for rec in cell_records(val):
                     name = str(rec.get("name", "")).strip()
-                    score = str(rec.get("score", "")).strip()
                     created_at = rec.get("createdAt") or ""
                     wrong = rec.get("wrong") if isinstance(rec.get("wrong"), list) else []
                     memo = str(rec.get("memo") or "").strip()
-                    if not name or "/" not in score:
-                        continue
-                    try:
-                        correct_s, total_s = score.split("/", 1)
-                        correct = int(str(correct_s).strip())
-                        total = int(str(total_s).strip())
-                        if total <= 0:
-                            continue
-                    except Exception:
+                    score = parse_score(rec)
+                    if not name or score is None:
                         continue
+                    correct, total = score
 
                     key = (str(sid), name, str(created_at))
                     if key in seen:
@@ -315,9 +303,11 @@ def _iter_test_records(start: dt.date | None, end: dt.date | None):
                     seen.add(key)
                     yield (str(sid), name, int(correct), int(total), wrong, str(created_at), memo, day)
 
-    for item in _walk(load(LOGS_PATH)):
+    s_iso = start.isoformat() if start else None
+    e_iso = end.isoformat() if end else None
+    for item in _walk(logs_journal.read()):
         yield item
-    for item in _walk(load(TESTS_PATH)):
+    for item in _walk(get_store("tests").read_range(s_iso, e_iso)):
         yield item
 
 @bp_api_tests.get("/api/tests-records")
@@ -354,11 +344,11 @@ def api_tests_records():
             return lv
         return ""
 
-    target = _canon_test_name(test_q)
+    target = canon_test_name(test_q)
 
     recs = []
     for sid, name, correct, total, wrong, created_at, memo, day in _iter_test_records(start, end):
-        nm = _canon_test_name(name)
+        nm = canon_test_name(name)
         if nm != target:
             continue
 
@@ -409,124 +399,8 @@ def api_tests_stats():
     if not start:
         start = end - dt.timedelta(days=29)
 
-    def level_band(level: str) -> str:
-        lv = str(level or "").strip()
-        if lv in ("상", "중상", "중", "하"):
-            return lv
-        return "하"
-
-    sid_band: dict[str, str] = {}
-    students = load(STU_PATH)
-    if isinstance(students, list):
-        for s in students:
-            sid = str(s.get("id") or "").strip()
-            if not sid:
-                continue
-            sid_band[sid] = level_band(s.get("level", ""))
-
-    def bucket(pct: float) -> str:
-        if pct < 50: return "0-49"
-        if pct < 60: return "50-59"
-        if pct < 70: return "60-69"
-        if pct < 80: return "70-79"
-        if pct < 90: return "80-89"
-        return "90-100"
-
-    def make_agg() -> dict:
-        return {
-            "count": 0,
-            "correct_list": [],
-            "total_list": [],
-            "pct_list": [],
-            "pct_hist": {k: 0 for k in ["0-49","50-59","60-69","70-79","80-89","90-100"]},
-        }
-
-    agg: dict[str, dict] = {}
-    wrong_freq: dict[str, dict[int, int]] = {}
-
-    for sid, name, correct, total, wrong, created_at, memo, day in _iter_test_records(start, end):
-        key_name = _canon_test_name(name)
-        if not key_name:
-            continue
-
-        a = agg.setdefault(key_name, make_agg())
-        a["count"] += 1
-        a["correct_list"].append(correct)
-        a["total_list"].append(total)
-
-        pct = (correct / total) * 100.0
-        a["pct_list"].append(pct)
-        a["pct_hist"][bucket(pct)] += 1
-
-        band = sid_band.get(str(sid))
-        if band:
-            bands_raw = a.setdefault("_bands_raw", {})
-            ba = bands_raw.setdefault(band, make_agg())
-            ba["count"] += 1
-            ba["correct_list"].append(correct)
-            ba["total_list"].append(total)
-            ba["pct_list"].append(pct)
-            ba["pct_hist"][bucket(pct)] += 1
-
-        if include_wrong and isinstance(wrong, list):
-            wf = wrong_freq.setdefault(key_name, {})
-            for n in wrong:
-                try:
-                    k = int(n)
-                except Exception:
-                    continue
-                wf[k] = wf.get(k, 0) + 1
-
-    out: dict[str, dict] = {}
-    for test_name, a in agg.items():
-        pct_list = a["pct_list"]
-        if not pct_list:
-            continue
-
-        pct_sorted = sorted(pct_list)
-        p90_idx = max(0, int(len(pct_sorted) * 0.9) - 1)
-
-        base = {
-            "count": a["count"],
-            "avg_pct": round(sum(pct_list) / len(pct_list), 2),
-            "median_pct": round(median(pct_list), 2),
-            "p90_pct": round(pct_sorted[p90_idx], 2),
-            "min_pct": round(min(pct_list), 2),
-            "max_pct": round(max(pct_list), 2),
-            "avg_correct": round(sum(a["correct_list"]) / len(a["correct_list"]), 2),
-            "avg_total": round(sum(a["total_list"]) / len(a["total_list"]), 2),
-            "pct_hist": a["pct_hist"],
-        }
-
-        bands_out: dict[str, dict] = {}
-        bands_raw = a.get("_bands_raw", {})
-        for band_name in ("상", "중상", "중", "하"):
-            ba = bands_raw.get(band_name)
-            if not ba or not ba["pct_list"]:
-                continue
-            bp = ba["pct_list"]
-            bp_sorted = sorted(bp)
-            bp90_idx = max(0, int(len(bp_sorted) * 0.9) - 1)
-            bands_out[band_name] = {
-                "count": ba["count"],
-                "avg_pct": round(sum(bp) / len(bp), 2),
-                "median_pct": round(median(bp), 2),
-                "p90_pct": round(bp_sorted[bp90_idx], 2),
-                "min_pct": round(min(bp), 2),
-                "max_pct": round(max(bp), 2),
-                "avg_correct": round(sum(ba["correct_list"]) / len(ba["correct_list"]), 2),
-                "avg_total": round(sum(ba["total_list"]) / len(ba["total_list"]), 2),
-                "pct_hist": ba["pct_hist"],
-            }
-
-        if bands_out:
-            base["bands"] = bands_out
-
-        if include_wrong:
-            wf = wrong_freq.get(test_name, {})
-            base["wrong_freq"] = {str(k): wf[k] for k in sorted(wf.keys())}
-
-        out[test_name] = base
+    # (시험명, 날짜, band) 집계를 기간만큼 합침 (core/teststats.py — 변경분만 갱신)
+    out = test_stats.query(start.isoformat(), end.isoformat(), include_wrong)
 
     return nocache_resp({
         "range": {"start": start.isoformat(), "end": end.isoformat()},
@@ -1,36 +1,37 @@
 # routes/api_todaymeta.py
 from __future__ import annotations
 
-import json
-import os
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Any, Dict
 
 from flask import Blueprint, request, jsonify
 
+from core.changes import changes, register_doc
+from core.datestore import get_store
+from core.locks import locks
+from core.paths import DATA_DIR
+from core.storage import conditional_resp, doc_signature, load, save_coalesced, thaw
+
 bp_api_todaymeta = Blueprint("bp_api_todaymeta", __name__)
 
-# ✅ JSON 저장 위치
-# - 환경변수 DATA_DIR 있으면 거기 사용
-# - 없으면 프로젝트 루트의 data/ 폴더 사용 (없으면 생성)
-BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = Path(os.environ.get("DATA_DIR", str(BASE_DIR / "data")))
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+# ✅ JSON 저장 위치: core.paths.DATA_DIR (환경변수 DATA_DIR 있으면 거기, 없으면 data/)
+
+# 변경 피드(/api/changes) 값 조회용
+# (attendance / contact / arrive-time 는 core.datestore 날짜키 문서로 등록됨)
+register_doc("today-order", lambda: load(DATA_DIR / "today_order.json"))
 
 
 def _read_json(path: Path, default: Any) -> Any:
-    try:
-        if not path.exists():
-            return default
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return default
+    # load(): 캐시 + 아직 flush 안 된 쓰기까지 반영된 값
+    data = load(path)
+    return thaw(data) if data else default
 
 
-def _write_json(path: Path, data: Any) -> None:
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp.replace(path)
+def _write_json(path: Path, data: Any) -> Future:
+    # 같은 파일 쓰기는 WRITE_COALESCE_MS 창 단위로 합쳐서 원자적 저장
+    # (락은 바로 풀고, 디스크 반영은 락 밖에서 .result() 로 대기)
+    return save_coalesced(path, data)
 
 
 def _get_date_arg() -> str:
@@ -38,77 +39,19 @@ def _get_date_arg() -> str:
     return (request.args.get("date") or "").strip()
 
 
-# ─────────────────────────────────────────────
-# /api/attendance
-# - GET  /api/attendance?date=YYYY-MM-DD -> { "sid": 1, ... }
-# - POST /api/attendance body: { "YYYY-MM-DD": { "sid": 1, ... } }
-# ─────────────────────────────────────────────
-@bp_api_todaymeta.route("/api/attendance", methods=["GET", "POST"])
-def api_attendance():
-    p = DATA_DIR / "attendance.json"
-    all_map: Dict[str, Dict[str, int]] = _read_json(p, {})
-
-    if request.method == "GET":
-        d = _get_date_arg()
+def _get_resp(path: Path, d: str):
+    """GET 공통: date 있으면 그 날짜 맵, 없으면 전체 (ETag 로 안 바뀌었으면 304)"""
+    def build():
+        all_map = _read_json(path, {})
         if not d:
             # date 없으면 전체 반환 (원하면 {}만 반환하게 바꿔도 됨)
-            return jsonify(all_map)
-        day = all_map.get(d, {})
-        return jsonify(day if isinstance(day, dict) else {})
-
-    payload = request.get_json(silent=True) or {}
-    # payload는 { "YYYY-MM-DD": {sid:1} } 형태 기대
-    if not isinstance(payload, dict):
-        return jsonify({"ok": False, "error": "bad body"}), 400
-
-    for d, daymap in payload.items():
-        if not isinstance(d, str):
-            continue
-        if isinstance(daymap, dict):
-            # 값은 1/true만 유지
-            cleaned = {}
-            for sid, v in daymap.items():
-                if str(v) in ("1", "true", "True") or v is True or v == 1:
-                    cleaned[str(sid)] = 1
-            all_map[d] = cleaned
-
-    _write_json(p, all_map)
-    return jsonify({"ok": True})
-
-
-# ─────────────────────────────────────────────
-# /api/contact
-# - GET  /api/contact?date=YYYY-MM-DD -> { "sid": 1, ... }
-# - POST /api/contact body: { "YYYY-MM-DD": { "sid": 1, ... } }
-# ─────────────────────────────────────────────
-@bp_api_todaymeta.route("/api/contact", methods=["GET", "POST"])
-def api_contact():
-    p = DATA_DIR / "contact.json"
-    all_map: Dict[str, Dict[str, int]] = _read_json(p, {})
-
-    if request.method == "GET":
-        d = _get_date_arg()
-        if not d:
-            return jsonify(all_map)
+            return all_map
         day = all_map.get(d, {})
-        return jsonify(day if isinstance(day, dict) else {})
+        return day if isinstance(day, dict) else {}
+    return conditional_resp((d, doc_signature(path)), build)
 
-    payload = request.get_json(silent=True) or {}
-    if not isinstance(payload, dict):
-        return jsonify({"ok": False, "error": "bad body"}), 400
 
-    for d, daymap in payload.items():
-        if not isinstance(d, str):
-            continue
-        if isinstance(daymap, dict):
-            cleaned = {}
-            for sid, v in daymap.items():
-                if str(v) in ("1", "true", "True") or v is True or v == 1:
-                    cleaned[str(sid)] = 1
-            all_map[d] = cleaned
-
-    _write_json(p, all_map)
-    return jsonify({"ok": True})
+# /api/attendance, /api/contact 는 routes/api_attend.py (core/dayflags.py 날짜별 저장)
 
 
 # ─────────────────────────────────────────────
@@ -121,15 +64,14 @@ def api_contact():
 # ─────────────────────────────────────────────
 @bp_api_todaymeta.route("/api/arrive-time", methods=["GET", "POST"])
 def api_arrive_time():
-    p = DATA_DIR / "arrive_time.json"
-    all_map: Dict[str, Dict[str, str]] = _read_json(p, {})
+    # 날짜키 저장소(core.datestore "arrive-time") → 날짜 하나만 읽고 그 날짜만 씀
+    store = get_store("arrive-time")
 
     if request.method == "GET":
         d = _get_date_arg()
-        if d:
-            day = all_map.get(d, {})
-            return jsonify(day if isinstance(day, dict) else {})
-        return jsonify(all_map)
+        if not d:
+            return conditional_resp(store.signature(), store.read_all)
+        return conditional_resp((d, store.signature()), lambda: store.read_date(d) or {})
 
     payload = request.get_json(silent=True) or {}
     if not isinstance(payload, dict):
@@ -142,21 +84,22 @@ def api_arrive_time():
 
     if looks_like_all:
         # 날짜키들만 머지/정리
-        for d, daymap in payload.items():
-            if not isinstance(d, str) or not isinstance(daymap, dict):
-                continue
-            all_map[d] = {str(sid): str(t).strip() for sid, t in daymap.items() if str(t).strip()}
-        _write_json(p, all_map)
-        return jsonify({"ok": True})
-
-    # 혹시 sid맵만 직접 보냈다면 date 파라미터로 받는 방식도 지원
-    d = _get_date_arg()
-    if d and isinstance(payload, dict):
-        all_map[d] = {str(sid): str(t).strip() for sid, t in payload.items() if str(t).strip()}
-        _write_json(p, all_map)
-        return jsonify({"ok": True})
-
-    return jsonify({"ok": False, "error": "unknown body format"}), 400
+        days = {d: daymap for d, daymap in payload.items() if isinstance(d, str) and isinstance(daymap, dict)}
+    else:
+        # 혹시 sid맵만 직접 보냈다면 date 파라미터로 받는 방식도 지원
+        d = _get_date_arg()
+        if not d:
+            return jsonify({"ok": False, "error": "unknown body format"}), 400
+        days = {d: payload}
+
+    cleaned = {
+        d: {str(sid): str(t).strip() for sid, t in daymap.items() if str(t).strip()} or None
+        for d, daymap in days.items()
+    }
+    with store.lock():
+        fut = changes.record_after(store.write_dates(cleaned), "arrive-time", list(cleaned))
+    fut.result()
+    return jsonify({"ok": True})
 
 
 # ─────────────────────────────────────────────
@@ -167,10 +110,9 @@ def api_arrive_time():
 @bp_api_todaymeta.route("/api/today_order", methods=["GET", "POST"])
 def api_today_order():
     p = DATA_DIR / "today_order.json"
-    all_map: Dict[str, list] = _read_json(p, {})
 
     if request.method == "GET":
-        return jsonify(all_map)
+        return _get_resp(p, "")
 
     payload = request.get_json(silent=True) or {}
     if not isinstance(payload, dict):
@@ -182,5 +124,7 @@ def api_today_order():
             continue
         if isinstance(arr, list):
             cleaned[d] = [str(x) for x in arr if str(x).strip()]
-    _write_json(p, cleaned)
+    with locks.exclusive(p):
+        fut = changes.record_after(_write_json(p, cleaned), "today-order")
+    fut.result()
     return jsonify({"ok": True})
@@ -3,15 +3,23 @@ from __future__ import annotations
 import time
 from flask import Blueprint, jsonify, request
 
-from core.paths import WATCH_PATH
-from core.storage import load, save_atomic, nocache_resp
+from core.changes import changes
+from core.datestore import get_store, parse_date_slice
+from core.storage import conditional_resp, thaw
 
 bp_api_watch = Blueprint("api_watch", __name__)
 
 @bp_api_watch.route("/api/watch", methods=["GET", "POST"])
 def api_watch():
+    store = get_store("watch")
     if request.method == "GET":
-        return nocache_resp(load(WATCH_PATH))
+        try:
+            sl = parse_date_slice(request.args)
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        if sl is not None:
+            return conditional_resp((store.signature(), sl), lambda: store.read_slice(sl))
+        return conditional_resp(store.signature(), store.read_all)
 
     body = request.get_json(force=True) or {}
     date = str(body.get("date") or "").strip()
@@ -28,20 +36,22 @@ def api_watch():
     except Exception:
         return jsonify({"ok": False, "error": "invalid numeric fields"}), 400
 
-    data = load(WATCH_PATH)
-    if not isinstance(data, dict):
-        data = {}
+    # 해당 날짜(파티션)만 읽고 씀 (읽기~저장 전체를 문서 락 안에서)
+    with store.lock():
+        by_date = thaw(store.read_date(date))
+        if not isinstance(by_date, dict):
+            by_date = {}
 
-    by_date = data.setdefault(date, {})
-    by_sid  = by_date.setdefault(sid, {})
-    prev    = by_sid.get(mid, {})
+        by_sid  = by_date.setdefault(sid, {})
+        prev    = by_sid.get(mid, {})
 
-    by_sid[mid] = {
-        "last": last,
-        "dur": dur,
-        "completed": completed,
-        "updatedAt": max(int(prev.get("updatedAt") or 0), updated_at)
-    }
+        by_sid[mid] = {
+            "last": last,
+            "dur": dur,
+            "completed": completed,
+            "updatedAt": max(int(prev.get("updatedAt") or 0), updated_at)
+        }
 
-    save_atomic(WATCH_PATH, data)
+        fut = changes.record_after(store.write_dates({date: by_date}), "watch", [(date, sid)])
+    fut.result()
     return jsonify({"ok": True})
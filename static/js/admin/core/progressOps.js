@@ -0,0 +1,13 @@
+// 부수효과 없는 모듈 (all/ 페이지도 import 함 — utils.js 는 전역 에러 훅을 걸어서 따로 뺌)
+// progress 부분 저장(/api/progress/patch) op 목록: prev → next 로 바뀐 mid 만 (빠진 mid 는 state:null = 삭제)
+export function progressPatchOps(date, sid, prev, next) {
+  const ops = [];
+  const a = prev || {}, b = next || {};
+  Object.keys(b).forEach(mid => {
+    if (JSON.stringify(a[mid]) !== JSON.stringify(b[mid])) ops.push({ date, sid, mid, state: b[mid] });
+  });
+  Object.keys(a).forEach(mid => {
+    if (!(mid in b)) ops.push({ date, sid, mid, state: null });
+  });
+  return ops;
+}
@@ -34,6 +34,8 @@ window.addEventListener('error', (e) => {
   if (DEBUG) console.error('[Window error]', e.message, e.error);
 });
 
+export { progressPatchOps } from './progressOps.js';
+
 // 날짜 키(로컬) 헬퍼
 export function todayLocalKey() {
   const now = new Date();
@@ -81,26 +81,18 @@ async function restoreSelected() {
   const checks = Array.from(list.querySelectorAll('.ar-chk:checked'));
   if (!checks.length) { alert('복구할 학생을 선택하세요.'); return; }
 
-  // 상태 반영: by_date / by_student 모두에서 제거
-  const byDate = { ...(state.absentByDate || {}) };
-  const byStu = { ...(state.absences || {}) };
-
-  const set = new Set((byDate[dateStr] || []).map(String));
-  const removed = [];
-  for (const chk of checks) {
-    const sid = String(chk.value);
-    if (set.has(sid)) { set.delete(sid); removed.push(sid); }
-    if (byStu[sid] === dateStr) delete byStu[sid];
-  }
-  byDate[dateStr] = Array.from(set);
-  state.absentByDate = byDate;
-  state.absences = byStu;
+  // 선택한 학생만 결석 해제 (by_date / by_student 정리는 서버가 함)
+  const ops = checks.map(chk => ({ date: dateStr, sid: String(chk.value), absent: false }));
 
   try {
-    await fetch('/api/absent', {
+    const r = await fetch('/api/absent/patch', {
       method: 'POST', headers: CT,
-      body: JSON.stringify({ by_date: byDate, by_student: byStu })
+      body: JSON.stringify({ ops })
     });
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    const j = await r.json();
+    state.absentByDate = j.by_date || {};
+    state.absences = j.by_student || {};
     toast('결석 복구됨');
     // 리스트 갱신
     renderFor(dateStr);
@@ -126,8 +126,8 @@ export function initAnnouncements() {
     try {
       // 통계와 내용 병합 (편집 프리필 위해 anns 별도 보관)
       const [stats, anns] = await Promise.all([
-        fetch('/api/announce-status', { cache:'no-store' }).then(r=>r.json()),
-        fetch('/api/announcements',   { cache:'no-store' }).then(r=>r.json())
+        fetch('/api/announce-status', { cache:'no-cache' }).then(r=>r.json()),
+        fetch('/api/announcements',   { cache:'no-cache' }).then(r=>r.json())
       ]);
       annCache = Array.isArray(anns) ? anns : [];
 
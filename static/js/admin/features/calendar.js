@@ -21,11 +21,6 @@ export function initCalendar() {
   // 슬롯 버튼 클릭 핸들러 중복 방지 플래그
   let slotClickBound = false;
 
-  // 유틸: 학생이 해당 요일 정규 등원하는지
-  function hasWeekday(s, w) {
-    return Object.keys(s).some(k => /^day\d+$/.test(k) && String(s[k]).startsWith(w));
-  }
-
   // ✅ 정규 주말 슬롯 추출(학생 스키마에서 요일 숫자 파싱)
   function getRegularWeekendSlots(stu, dateStr) {
     const w = yoil(dateStr);
@@ -41,25 +36,20 @@ export function initCalendar() {
     return Array.from(new Set(nums)).sort((a, b) => a - b);
   }
 
-  async function preloadExtraWeekend() {
-    try { EXTRA = await fetch('/api/extra-attend', { cache: 'no-store' }).then(r => r.json()); } catch { EXTRA = {}; }
-    try { WEEKEND = await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()); } catch { WEEKEND = {}; }
+  // 날짜 구간 명단 한 번에: { date: {regular, extra, absent, count, slots} } (end 포함)
+  function fetchAttendRange(startStr, endStr) {
+    return fetch(`/api/attend-range?start=${startStr}&end=${endStr}`, { cache: 'no-cache' })
+      .then(r => { if (!r.ok) throw new Error(r.status); return r.json(); })
+      .then(res => res.days || {});
   }
 
-  // 월 뷰 범위 내 날짜별 인원 카운트 계산(정규+보강 - 결석)
+  // 월 뷰 범위 내 날짜별 인원 카운트(정규+보강 - 결석) — 서버 /api/attend-range 한 번
   async function fetchCountsForRange(start, end) {
-    await preloadExtraWeekend();
-    const days = []; const cur = new Date(start);
-    while (cur < end) { days.push(ymd(cur)); cur.setDate(cur.getDate() + 1); }
+    const last = new Date(end); last.setDate(last.getDate() - 1); // FullCalendar end 는 미포함
+    let days = {};
+    try { days = await fetchAttendRange(ymd(start), ymd(last)); } catch { days = {}; }
     countMap = {};
-    for (const dateStr of days) {
-      const wchr = yoil(dateStr);
-      const regularIds = state.students.filter(s => hasWeekday(s, wchr)).map(s => String(s.id));
-      const extraIds = (EXTRA[dateStr] || []).map(String);
-      const ids = new Set([...regularIds, ...extraIds]);
-      (state.absentByDate[dateStr] || []).map(String).forEach(id => ids.delete(id));
-      countMap[dateStr] = ids.size;
-    }
+    Object.entries(days).forEach(([dateStr, day]) => { countMap[dateStr] = day.count || 0; });
   }
 
   function refreshCountBadges() {
@@ -104,14 +94,11 @@ export function initCalendar() {
     }
 
     Promise.all([
-      fetch(`/api/attend?date=${dateStr}`, { cache: 'no-store' }).then(r => r.json()),
-      fetch('/api/extra-attend', { cache: 'no-store' }).then(r => r.json()),
-      fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()).catch(() => ({}))
-    ]).then(([att, extraMap, weekendMap]) => {
-      EXTRA = extraMap || {};
-      WEEKEND = weekendMap || {};
-      const extras = (EXTRA[dateStr] || []).map(String);
-      const slotMap = WEEKEND[dateStr] || {};
+      fetch(`/api/attend?date=${dateStr}`, { cache: 'no-cache' }).then(r => r.json()),
+      fetchAttendRange(dateStr, dateStr).then(days => days[dateStr] || {}).catch(() => ({}))
+    ]).then(([att, day]) => {
+      const extras = (day.extra || []).map(String);
+      const slotMap = day.slots || {};
 
       // 리스트: 주말이면 “정규+보강” 슬롯 합쳐서 표기(예: 일2·일3)
       listEl.innerHTML = att.map(s => {
@@ -189,9 +176,9 @@ export function initCalendar() {
   function openSelectionUI(mode) {
     const dateStr = $('attendDateTitle').textContent.split(' ')[0]; // "YYYY-MM-DD (요일)" → 날짜만
     Promise.all([
-      fetch(`/api/attend?date=${dateStr}`, { cache: 'no-store' }).then(r => r.json()),
-      fetch('/api/extra-attend', { cache: 'no-store' }).then(r => r.json()),
-      fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()).catch(() => ({}))
+      fetch(`/api/attend?date=${dateStr}`, { cache: 'no-cache' }).then(r => r.json()),
+      fetch('/api/extra-attend', { cache: 'no-cache' }).then(r => r.json()),
+      fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json()).catch(() => ({}))
     ]).then(([todayAtt, extraMap, weekendMap]) => {
       EXTRA = extraMap || {};
       WEEKEND = weekendMap || {};
@@ -273,14 +260,16 @@ export function initCalendar() {
 
     // ── 결석 처리 ──
     if (mode === 'absent') {
-      selectedIds.forEach(id => { state.absences[id] = dateStr; });
-      const set = new Set([...(state.absentByDate[dateStr] || []), ...selectedIds]);
-      state.absentByDate[dateStr] = [...set];
       try {
-        await fetch('/api/absent', {
+        // 선택한 학생만 결석 처리 (문서 전체 덮어쓰기 대신 patch)
+        const r = await fetch('/api/absent/patch', {
           method: 'POST', headers: CT,
-          body: JSON.stringify({ by_date: state.absentByDate, by_student: state.absences })
+          body: JSON.stringify({ ops: selectedIds.map(sid => ({ date: dateStr, sid, absent: true })) })
         });
+        if (!r.ok) throw new Error(`HTTP ${r.status}`);
+        const j = await r.json();
+        state.absentByDate = j.by_date || {};
+        state.absences = j.by_student || {};
         alert('결석 처리 완료');
         selectionModal.style.display = 'none';
         window.recalcCalendarCounts && window.recalcCalendarCounts();
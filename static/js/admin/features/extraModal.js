@@ -7,7 +7,7 @@ import { state } from '../core/state.js';
 // (선택) 오늘 순서 캐시 삭제 → 새 보강 추가 시 하단 고정 현상 방지
 async function clearTodayOrder(dateStr) {
   try {
-    const map = await fetch('/api/today_order', { cache: 'no-store' }).then(r => r.json()).catch(() => ({}));
+    const map = await fetch('/api/today_order', { cache: 'no-cache' }).then(r => r.json()).catch(() => ({}));
     if (map && map[dateStr]) {
       delete map[dateStr];
       await fetch('/api/today_order', { method: 'POST', headers: CT, body: JSON.stringify(map) });
@@ -138,7 +138,7 @@ export function initExtraModal() {
 
   // 최신 slots 로드(엔드포인트명은 유지)
   async function loadDaySlots() {
-    try { return await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()); }
+    try { return await fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json()); }
     catch { return {}; }
   }
 
@@ -228,7 +228,7 @@ export function initExtraModal() {
 
     // 2) ✅ 요일 슬롯 저장(1,2)
     let slotMap = {};
-    try { slotMap = await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()); } catch { }
+    try { slotMap = await fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json()); } catch { }
     const perDay = slotMap[today] || {};
 
     // 해제된 학생 삭제
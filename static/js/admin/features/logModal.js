@@ -18,7 +18,7 @@
 // - ✅ (핵심) logs 저장은 /api/logs/patch(부분 저장)만 사용 => 동시 작업 날아감 방지
 /* global fetch */
 
-import { $, toast, postJSON, todayLocalKey } from '../core/utils.js';
+import { $, toast, postJSON, todayLocalKey, progressPatchOps } from '../core/utils.js';
 import { state } from '../core/state.js';
 
 console.log('[logModal] HW-TABLE v6.5 (PATCH logs to prevent overwrite)');
@@ -978,7 +978,7 @@ export function initLogModal() {
   logClose.addEventListener('click', close);
   logModal.addEventListener('click', (e) => { if (e.target === logModal) close(); });
 
-  // ✅ 저장 공통 (progress는 기존대로 /api/progress에 저장)
+  // ✅ 저장 공통 (progress는 /api/progress/patch 로 바뀐 mid 만 저장)
   async function saveBase(doneFlag) {
     const today = todayLocalKey();
 
@@ -1007,7 +1007,7 @@ export function initLogModal() {
               : null;
 
         let watchAll = {};
-        try { watchAll = await fetch('/api/watch', { cache: 'no-store' }).then(r => r.json()); } catch { watchAll = {}; }
+        try { watchAll = await fetch('/api/watch', { cache: 'no-cache' }).then(r => r.json()); } catch { watchAll = {}; }
 
         const raw = pickWatchForSid(watchAll, editingLogSid, today) || {};
         const watchByMid = {};
@@ -1027,11 +1027,14 @@ export function initLogModal() {
       console.warn('[logModal] watch merge failed:', e);
     }
 
-    // progress 저장(기존 유지)
+    // progress 저장 (바뀐 mid 만)
     if (!state.progress) state.progress = {};
     state.progress[today] = state.progress[today] || {};
+    const ops = progressPatchOps(today, editingLogSid, state.progress[today][editingLogSid], newProg);
     state.progress[today][editingLogSid] = newProg;
-    await postJSON('/api/progress', state.progress, doneFlag ? 'logLeave:progress' : 'logSave:progress');
+    if (ops.length) {
+      await postJSON('/api/progress/patch', { ops }, doneFlag ? 'logLeave:progress' : 'logSave:progress');
+    }
 
     // 진도 요약(기존 유지)
     const oldDates = Object.keys(state.progress).filter(d => d < today);
@@ -1175,7 +1178,7 @@ export function initLogModal() {
     if (!sid) return;
 
     let watchAll = {};
-    try { watchAll = await fetch(WATCH_URL, { cache: 'no-store' }).then(r => r.json()); } catch { watchAll = {}; }
+    try { watchAll = await fetch(WATCH_URL, { cache: 'no-cache' }).then(r => r.json()); } catch { watchAll = {}; }
     const raw = pickWatchForSid(watchAll, sid) || {};
 
     const watchByMid = {};
@@ -15,7 +15,7 @@ let editingSid = null;
 /* 안전 JSON 로더                  */
 /* =============================== */
 async function fetchJSONSafe(url, init = {}) {
-  const res = await fetch(url, { cache: 'no-store', ...init });
+  const res = await fetch(url, { cache: 'no-cache', ...init });
   const txt = await res.text();
   if (!res.ok) throw new Error(`[testModal] ${init.method||'GET'} ${url} -> ${res.status}\n${txt.slice(0,200)}`);
   try { return txt.trim() ? JSON.parse(txt) : {}; }
@@ -250,7 +250,7 @@ async function saveModal(){
   const prev = state.progress[today][editingSid] || {};
   state.progress[today][editingSid] = { ...prev, tests: out };
 
-  await postJSON('/api/progress', state.progress, 'tests:progress:save');
+  await postJSON('/api/progress/patch', { date: today, sid: editingSid, mid: 'tests', state: out }, 'tests:progress:save');
 
   toast('테스트 진도 저장됨');
   closeModal();
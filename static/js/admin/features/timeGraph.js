@@ -124,7 +124,7 @@ function getArriveOverride(dateKey, sid) {
 /* ✅ weekend-slots 로드 (today.js와 동일 소스) */
 async function loadWeekendSlots() {
   try {
-    WEEKEND_SLOTS = await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json());
+    WEEKEND_SLOTS = await fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json());
     if (!WEEKEND_SLOTS || typeof WEEKEND_SLOTS !== 'object') WEEKEND_SLOTS = {};
   } catch {
     WEEKEND_SLOTS = {};
@@ -219,7 +219,7 @@ function minutesFromTimeStr(str) {
 /* ✅ 최신 보강 맵 로드 (state.extra 누락/스테일 방지) */
 async function loadExtraAttendMap() {
   try {
-    const m = await fetch('/api/extra-attend', { cache: 'no-store' }).then(r => r.json());
+    const m = await fetch('/api/extra-attend', { cache: 'no-cache' }).then(r => r.json());
     return (m && typeof m === 'object') ? m : {};
   } catch {
     return {};
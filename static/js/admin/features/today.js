@@ -37,12 +37,33 @@ const ARRIVE_TIME_MAP = {
 /* ─────────────────────────────────────────────
  * ✅ 출석 체크 (서버 연동)
  *  - GET  /api/attendance?date=YYYY-MM-DD  -> { "sid": 1, ... }
- *  - POST /api/attendance  body: { "YYYY-MM-DD": { "sid": 1, ... } }
+ *  - POST /api/attendance/patch  body: { ops: [{ date, sid, on }] }  (바뀐 학생만)
  * ────────────────────────────────────────────*/
 const ATT_URL = '/api/attendance';
 const ATT_PREFIX = 'attend_check:'; // 로컬 백업
 const _attCache = new Map();        // dateKey -> { sid:1, ... }
 const _attSaveTimers = new Map();   // dateKey -> timer id
+const _attPending = new Map();      // dateKey -> Map(sid -> on)  (아직 안 보낸 변경)
+
+// 날짜별로 모아둔 켜기/끄기 변경을 patch 한 번으로 (250ms 디바운스)
+function queueFlagPatch(url, pending, timers, dateKey, sid, on, label) {
+  if (!pending.has(dateKey)) pending.set(dateKey, new Map());
+  pending.get(dateKey).set(String(sid), !!on);
+  if (timers.has(dateKey)) clearTimeout(timers.get(dateKey));
+  const t = setTimeout(async () => {
+    timers.delete(dateKey);
+    const ops = [...(pending.get(dateKey) || new Map())].map(([s, v]) => ({ date: dateKey, sid: s, on: v }));
+    pending.delete(dateKey);
+    if (!ops.length) return;
+    try {
+      const r = await fetch(`${url}/patch`, { method: 'POST', headers: CT, body: JSON.stringify({ ops }) });
+      if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    } catch (e) {
+      console.warn(`[today] ${label} save failed:`, e);
+    }
+  }, 250);
+  timers.set(dateKey, t);
+}
 
 function safeJSONParse(raw, fallback) {
   try { return raw ? JSON.parse(raw) : fallback; } catch { return fallback; }
@@ -57,7 +78,7 @@ function saveAttendMapLocal(dateKey, map) {
 async function fetchAttendDay(dateKey) {
   try {
     const qs = new URLSearchParams({ date: dateKey });
-    const obj = await fetch(`${ATT_URL}?${qs.toString()}`, { cache: 'no-store' }).then(r => r.json());
+    const obj = await fetch(`${ATT_URL}?${qs.toString()}`, { cache: 'no-cache' }).then(r => r.json());
     if (obj && typeof obj === 'object' && !Array.isArray(obj)) return obj;
   } catch { }
   return null;
@@ -77,19 +98,6 @@ function loadAttendMap(dateKey) {
   if (_attCache.has(dateKey)) return _attCache.get(dateKey);
   return loadAttendMapLocal(dateKey);
 }
-function scheduleSaveAttendRemote(dateKey) {
-  if (_attSaveTimers.has(dateKey)) clearTimeout(_attSaveTimers.get(dateKey));
-  const t = setTimeout(async () => {
-    _attSaveTimers.delete(dateKey);
-    const map = loadAttendMap(dateKey) || {};
-    try {
-      await fetch(ATT_URL, { method: 'POST', headers: CT, body: JSON.stringify({ [dateKey]: map }) });
-    } catch (e) {
-      console.warn('[today] attendance save failed:', e);
-    }
-  }, 250);
-  _attSaveTimers.set(dateKey, t);
-}
 function setAttended(dateKey, sid, checked) {
   const m = loadAttendMap(dateKey) || {};
   const k = String(sid);
@@ -97,7 +105,7 @@ function setAttended(dateKey, sid, checked) {
   else delete m[k];
   _attCache.set(dateKey, m);
   saveAttendMapLocal(dateKey, m);
-  scheduleSaveAttendRemote(dateKey);
+  queueFlagPatch(ATT_URL, _attPending, _attSaveTimers, dateKey, k, checked, 'attendance');
 }
 function isAttended(dateKey, sid) {
   const m = loadAttendMap(dateKey) || {};
@@ -107,12 +115,13 @@ function isAttended(dateKey, sid) {
 /* ─────────────────────────────────────────────
  * ✅ 연락 체크 (서버 연동)
  *  - GET  /api/contact?date=YYYY-MM-DD  -> { "sid": 1, ... }
- *  - POST /api/contact body: { "YYYY-MM-DD": { "sid": 1, ... } }
+ *  - POST /api/contact/patch  body: { ops: [{ date, sid, on }] }  (바뀐 학생만)
  * ────────────────────────────────────────────*/
 const CONTACT_URL = '/api/contact';
 const CONTACT_PREFIX = 'contact_check:'; // 로컬 백업
 const _contactCache = new Map();         // dateKey -> { sid:1, ... }
 const _contactSaveTimers = new Map();    // dateKey -> timer id
+const _contactPending = new Map();       // dateKey -> Map(sid -> on)
 
 function loadContactMapLocal(dateKey) {
   const raw = localStorage.getItem(CONTACT_PREFIX + dateKey);
@@ -124,7 +133,7 @@ function saveContactMapLocal(dateKey, map) {
 async function fetchContactDay(dateKey) {
   try {
     const qs = new URLSearchParams({ date: dateKey });
-    const obj = await fetch(`${CONTACT_URL}?${qs.toString()}`, { cache: 'no-store' }).then(r => r.json());
+    const obj = await fetch(`${CONTACT_URL}?${qs.toString()}`, { cache: 'no-cache' }).then(r => r.json());
     if (obj && typeof obj === 'object' && !Array.isArray(obj)) return obj;
   } catch { }
   return null;
@@ -144,19 +153,6 @@ function loadContactMap(dateKey) {
   if (_contactCache.has(dateKey)) return _contactCache.get(dateKey);
   return loadContactMapLocal(dateKey);
 }
-function scheduleSaveContactRemote(dateKey) {
-  if (_contactSaveTimers.has(dateKey)) clearTimeout(_contactSaveTimers.get(dateKey));
-  const t = setTimeout(async () => {
-    _contactSaveTimers.delete(dateKey);
-    const map = loadContactMap(dateKey) || {};
-    try {
-      await fetch(CONTACT_URL, { method: 'POST', headers: CT, body: JSON.stringify({ [dateKey]: map }) });
-    } catch (e) {
-      console.warn('[today] contact save failed:', e);
-    }
-  }, 250);
-  _contactSaveTimers.set(dateKey, t);
-}
 function setContacted(dateKey, sid, checked) {
   const m = loadContactMap(dateKey) || {};
   const k = String(sid);
@@ -164,7 +160,7 @@ function setContacted(dateKey, sid, checked) {
   else delete m[k];
   _contactCache.set(dateKey, m);
   saveContactMapLocal(dateKey, m);
-  scheduleSaveContactRemote(dateKey);
+  queueFlagPatch(CONTACT_URL, _contactPending, _contactSaveTimers, dateKey, k, checked, 'contact');
 }
 function isContacted(dateKey, sid) {
   const m = loadContactMap(dateKey) || {};
@@ -200,7 +196,7 @@ function normalizeDayMap(obj, dateKey) {
 async function fetchArriveDay(dateKey) {
   try {
     const qs = new URLSearchParams({ date: dateKey });
-    const obj = await fetch(`${ARRIVE_URL}?${qs.toString()}`, { cache: 'no-store' }).then(r => r.json());
+    const obj = await fetch(`${ARRIVE_URL}?${qs.toString()}`, { cache: 'no-cache' }).then(r => r.json());
     const day = normalizeDayMap(obj, dateKey);
     if (day) return day;
   } catch { }
@@ -208,7 +204,7 @@ async function fetchArriveDay(dateKey) {
 }
 async function fetchArriveAll() {
   try {
-    const obj = await fetch(ARRIVE_URL, { cache: 'no-store' }).then(r => r.json());
+    const obj = await fetch(ARRIVE_URL, { cache: 'no-cache' }).then(r => r.json());
     if (obj && typeof obj === 'object' && !Array.isArray(obj)) return obj;
   } catch { }
   return null;
@@ -367,7 +363,7 @@ async function setLogFlagRemote(dateKey, sid, field, checked) {
 // ──────────────────────────────────────────────────────────────
 async function loadWeekendSlots() {
   try {
-    WEEKEND_SLOTS = await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json());
+    WEEKEND_SLOTS = await fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json());
   } catch {
     WEEKEND_SLOTS = {};
   }
@@ -378,7 +374,7 @@ async function loadWeekendSlots() {
 // ──────────────────────────────────────────────────────────────
 async function loadOrderMap() {
   if (_orderMap) return _orderMap;
-  try { _orderMap = await fetch('/api/today_order', { cache: 'no-store' }).then(r => r.json()); }
+  try { _orderMap = await fetch('/api/today_order', { cache: 'no-cache' }).then(r => r.json()); }
   catch { _orderMap = {}; }
   return _orderMap;
 }
@@ -393,7 +389,7 @@ function applySavedOrder(list, dateKey) {
 }
 async function saveOrder(dateKey, newOrderIds) {
   let latest;
-  try { latest = await fetch('/api/today_order', { cache: 'no-store' }).then(r => r.json()); }
+  try { latest = await fetch('/api/today_order', { cache: 'no-cache' }).then(r => r.json()); }
   catch { latest = {}; }
   latest[dateKey] = newOrderIds.map(String);
   await fetch('/api/today_order', { method: 'POST', headers: CT, body: JSON.stringify(latest) });
@@ -401,7 +397,7 @@ async function saveOrder(dateKey, newOrderIds) {
 }
 async function clearTodayOrder(dateKey) {
   try {
-    const latest = await fetch('/api/today_order', { cache: 'no-store' }).then(r => r.json()).catch(() => ({}));
+    const latest = await fetch('/api/today_order', { cache: 'no-cache' }).then(r => r.json()).catch(() => ({}));
     if (latest && latest[dateKey]) {
       delete latest[dateKey];
       await fetch('/api/today_order', { method: 'POST', headers: CT, body: JSON.stringify(latest) });
@@ -677,7 +673,7 @@ async function saveWeekendSlotsFromLabel(sid, labelText) {
   if (!(w === '토' || w === '일')) return;
 
   let weekend = {};
-  try { weekend = await fetch('/api/weekend-slots', { cache: 'no-store' }).then(r => r.json()); } catch { }
+  try { weekend = await fetch('/api/weekend-slots', { cache: 'no-cache' }).then(r => r.json()); } catch { }
   const perDay = weekend[today] || {};
 
   const slots = parseSlotsFromText(labelText);
@@ -1231,22 +1227,17 @@ document.addEventListener('click', async (e) => {
   setAttended(today, sid, false);
   setContacted(today, sid, false);
 
-  const byStudent = state.absences || {};
-  const byDate = state.absentByDate || {};
-  byStudent[sid] = today;
-
-  const set = new Set([...(byDate[today] || []).map(String), sid]);
-  byDate[today] = Array.from(set);
-
   try {
-    await fetch('/api/absent', {
+    const r = await fetch('/api/absent/patch', {
       method: 'POST',
       headers: CT,
-      body: JSON.stringify({ by_date: byDate, by_student: byStudent })
+      body: JSON.stringify({ date: today, sid, absent: true })
     });
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    const j = await r.json();
 
-    state.absences = byStudent;
-    state.absentByDate = byDate;
+    state.absences = j.by_student || {};
+    state.absentByDate = j.by_date || {};
 
     toast('결석 처리됨');
     loadTodayAndRender();
@@ -112,7 +112,7 @@ export function initVideoModal() {
 
     // 최신 updates 동기화 (서버 자동배정 반영)
     try {
-      const fresh = await fetch('/api/updates', { cache: 'no-store' }).then(r => r.json());
+      const fresh = await fetch('/api/updates', { cache: 'no-cache' }).then(r => r.json());
       if (fresh && typeof fresh === 'object') state.updates = fresh;
     } catch {}
 
@@ -277,7 +277,7 @@ export function initVideoModal() {
       headers: CT,
       body: JSON.stringify(state.updates)
     })
-      .then(() => fetch('/api/updates', { cache: 'no-store' }))
+      .then(() => fetch('/api/updates', { cache: 'no-cache' }))
       .then(r => r.json())
       .then(u => {
         state.updates = u;
@@ -33,3 +33,6 @@ export const getScheduleLine = (schoolCal, schoolName) => {
   const fin  = sc.final   ?? sc['2차 지필평가'] ?? sc['기말'];
   return `개학 ${fmtDate(open)} · 중간 ${fmtDate(mid)} · 기말 ${fmtDate(fin)}`;
 };
+
+// progress 부분 저장 op 목록 — admin 과 같은 헬퍼
+export { progressPatchOps } from '../../admin/core/progressOps.js';
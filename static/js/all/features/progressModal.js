@@ -1,4 +1,4 @@
-﻿import { toast } from '../core/utils.js';
+﻿import { toast, progressPatchOps } from '../core/utils.js';
 import { state } from '../core/state.js';
 import { postJSON } from '../core/api.js';
 
@@ -84,10 +84,11 @@ function save(){
 
   state.progress = state.progress || {};
   state.progress[today] = state.progress[today] || {};
+  const ops = progressPatchOps(today, editingSid, state.progress[today][editingSid], newProg);
   state.progress[today][editingSid] = newProg;
   window.progressData = state.progress;
 
-  postJSON('/api/progress', state.progress)
+  postJSON('/api/progress/patch', { ops })
     .then(r=>{ if(!r.ok) throw new Error(r.status); toast('진도 저장됨'); modal.style.display='none'; })
     .catch(()=>alert('진도 저장 실패'));
 }
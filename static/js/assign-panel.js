@@ -45,7 +45,7 @@ function findNodeByPath(tree, rel) {
 
 // 현재 폴더의 파일 목록 가져오기 (트리 재조회)
 async function listFilesInCurrentFolder() {
-  const { tree } = await fetch('/api/fs/tree', { cache:'no-store' }).then(r => r.json());
+  const { tree } = await fetch('/api/fs/tree', { cache:'no-cache' }).then(r => r.json());
   const cur = getCurPath();
   const node = findNodeByPath(tree, cur) || tree;
   const files = (node.children || []).filter(x => x.type === 'file')
@@ -56,7 +56,7 @@ async function listFilesInCurrentFolder() {
 
 // /api/materials 로드
 async function loadMaterialsMap() {
-  try { return await fetch('/api/materials', { cache:'no-store' }).then(r => r.json()); }
+  try { return await fetch('/api/materials', { cache:'no-cache' }).then(r => r.json()); }
   catch { return {}; }
 }
 
@@ -12,7 +12,7 @@ const $  = (s, p=document) => p.querySelector(s);
 const $$ = (s, p=document) => Array.from(p.querySelectorAll(s));
 
 async function jget(url) {
-  const r = await fetch(url, { cache:'no-store' });
+  const r = await fetch(url, { cache:'no-cache' });
   if (!r.ok) throw new Error(await r.text());
   return r.json();
 }
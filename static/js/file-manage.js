@@ -24,7 +24,7 @@ let MOVE_SRC_PATHS = [];
 
 /* ---------------- helpers ---------------- */
 async function jget(url){
-  const r = await fetch(url, { cache:"no-store" });
+  const r = await fetch(url, { cache:"no-cache" });
   const t = await r.text();
   if (!r.ok) throw new Error(t);
   return t ? JSON.parse(t) : {};
@@ -260,7 +260,7 @@
   // ── 초기 로드 ──
   (async function init(){
     try{
-      const j = await fetch('/api/school-calendar', {cache:'no-store'}).then(r=>r.json());
+      const j = await fetch('/api/school-calendar', {cache:'no-cache'}).then(r=>r.json());
       calMap = (j && typeof j==='object') ? j : {};
     }catch{ calMap = {}; }
     render();   // 기본 'mid'
@@ -931,8 +931,8 @@ window.todayLocalKey = function () {
 
   function loadAnnouncements() {
     Promise.all([
-      fetch('/api/announcements', { cache: 'no-store' }).then(r => r.json()),
-      fetch(`/api/announce-status?sid=${encodeURIComponent(SID)}`, { cache: 'no-store' }).then(r => r.json())
+      fetch('/api/announcements', { cache: 'no-cache' }).then(r => r.json()),
+      fetch(`/api/announce-status?sid=${encodeURIComponent(SID)}`, { cache: 'no-cache' }).then(r => r.json())
     ]).then(([anns, stat]) => {
       statusMap = stat || {};
 
@@ -1162,7 +1162,7 @@ window.todayLocalKey = function () {
   })();
 
   async function fetchJSONSafe(url, init = {}) {
-    const res = await fetch(url, { cache: "no-store", ...init });
+    const res = await fetch(url, { cache: "no-cache", ...init });
     const body = await res.text();
     if (!res.ok) throw new Error(`[student tests] ${init.method || "GET"} ${url} -> ${res.status}\n${body.slice(0, 300)}`);
     try { return body.trim() ? JSON.parse(body) : {}; }
@@ -1564,7 +1564,7 @@ window.todayLocalKey = function () {
         // 마지막 백업: logs.json 직접 머지
         try {
           const today = todayLocalKey();
-          const logs = await fetch('/api/logs', { cache: 'no-store' }).then(r => r.json()).catch(() => ({}));
+          const logs = await fetch('/api/logs', { cache: 'no-cache' }).then(r => r.json()).catch(() => ({}));
           logs[today] = logs[today] || {};
           const entry = logs[today][sid] || {};
           const tests = Array.isArray(entry.tests) ? entry.tests : [];
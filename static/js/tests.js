@@ -5,7 +5,7 @@ const $ = (sel) => document.querySelector(sel);
 const CT = { "Content-Type": "application/json" };
 
 async function fetchJSONSafe(url, init = {}) {
-  const res = await fetch(url, { cache: "no-store", ...init });
+  const res = await fetch(url, { cache: "no-cache", ...init });
   const body = await res.text();
   if (!res.ok) throw new Error(`[tests] ${init.method || "GET"} ${url} -> ${res.status}\n${body.slice(0, 500)}`);
   try { return body.trim() ? JSON.parse(body) : {}; }
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 쓰기 합치기 창을 짧게 (테스트가 Future.result() 로 기다리는 시간)
+os.environ.setdefault("WRITE_COALESCE_MS", "20")
+
+# 데이터 루트를 임시 폴더로 (core.paths import 전에) → 라우트 테스트가 repo 의 json 을 안 건드림
+# 세션 전체가 같은 폴더를 쓰므로 테스트마다 날짜/sid 를 따로 잡을 것
+os.environ["BASE_DIR"] = tempfile.mkdtemp(prefix="app-test-")
+os.environ["DATA_DIR"] = os.path.join(os.environ["BASE_DIR"], "data")
+for _k in ("SQLITE_PATH", "STORAGE_BACKEND", "PROGRESS_MODE"):
+    os.environ.pop(_k, None)
+
+
+@pytest.fixture
+def feed(tmp_path, monkeypatch):
+    """저장소 쓰기가 기록하는 변경 피드를 임시 파일로 (repo 의 changes.jsonl 안 건드림)"""
+    import core.changes
+    import core.dayflags
+    import core.logjournal
+    f = core.changes.ChangeFeed(tmp_path / "changes.jsonl")
+    # `from core.changes import changes` 한 모듈 전부 (라우트 포함, 이미 import 된 것)
+    for name, mod in list(sys.modules.items()):
+        if name.split(".")[0] in ("core", "routes") and isinstance(getattr(mod, "changes", None), core.changes.ChangeFeed):
+            monkeypatch.setattr(mod, "changes", f)
+    return f
+
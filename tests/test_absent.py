@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from routes.api_attend import bp_api_attend
+
+
+@pytest.fixture
+def client(feed):
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_attend)
+    return app.test_client()
+
+
+def _patch(client, *ops):
+    return client.post("/api/absent/patch", json={"ops": list(ops)})
+
+
+def test_patch_marks_and_clears(client):
+    r = _patch(client, {"date": "2031-03-02", "sid": "ab1"}, {"date": "2031-03-05", "sid": "ab1"})
+    body = r.get_json()
+    assert r.status_code == 200 and body["ok"] and body["applied"] == 2
+    assert body["by_date"]["2031-03-02"] == ["ab1"]
+    assert body["by_student"]["ab1"] == "2031-03-05"
+
+    # 최근 결석 해제 → by_student 는 남은 결석 중 가장 최근으로
+    body = _patch(client, {"date": "2031-03-05", "sid": "ab1", "absent": False}).get_json()
+    assert "2031-03-05" not in body["by_date"]
+    assert body["by_student"]["ab1"] == "2031-03-02"
+
+
+@pytest.mark.parametrize("off", [False, 0, "0", "false"])
+def test_string_false_clears(client, off):
+    _patch(client, {"date": "2031-03-09", "sid": "ab2"})
+    body = _patch(client, {"date": "2031-03-09", "sid": "ab2", "absent": off}).get_json()
+    assert body["results"][0]["absent"] is False
+    assert "ab2" not in body["by_date"].get("2031-03-09", [])
+
+
+def test_unparseable_value_is_400_and_writes_nothing(client):
+    r = _patch(client, {"date": "2031-03-12", "sid": "ab3"}, {"date": "2031-03-12", "sid": "ab4", "absent": "maybe"})
+    assert r.status_code == 400
+    assert "2031-03-12" not in client.get("/api/absent").get_json()["by_date"]
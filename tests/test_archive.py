@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+import core.archive
+from core.archive import ArchivedDateStore, archive_old
+from core.datestore import JsonDateStore
+from core.storage import thaw
+
+
+@pytest.fixture
+def archived(tmp_path, monkeypatch):
+    hot = JsonDateStore("t-arch", tmp_path / "hot.json")
+    store = ArchivedDateStore(hot, tmp_path / "archive")
+    monkeypatch.setattr(core.archive, "get_store", lambda name: store)
+    return hot, store
+
+
+def test_archive_read_through(archived):
+    hot, store = archived
+    store.write_dates({"2020-01-02": {"a": 1}, "2099-01-01": {"b": 1}}).result()
+
+    assert archive_old("t-arch", horizon_days=30) == 1
+    assert "2020-01-02" not in thaw(hot.read_all())
+    assert thaw(store.read_all()) == {"2020-01-02": {"a": 1}, "2099-01-01": {"b": 1}}
+    assert thaw(store.read_date("2020-01-02")) == {"a": 1}
+
+    # 아카이브된 날짜를 다시 쓰면 핫 값이 이김 / 삭제도 반영
+    store.write_dates({"2020-01-02": {"a": 2}}).result()
+    assert thaw(store.read_date("2020-01-02")) == {"a": 2}
+    store.write_dates({"2020-01-02": None}).result()
+    assert store.read_date("2020-01-02") is None
+
+
+def test_ranges_and_students_span_hot_and_archive(archived):
+    hot, store = archived
+    store.write_dates({
+        "2020-01-02": {"a": 1}, "2020-03-04": {"b": 1}, "2099-01-01": {"a": 2},
+    }).result()
+    assert archive_old("t-arch", horizon_days=30) == 2
+
+    assert thaw(store.read_range("2020-02-01", None)) == {"2020-03-04": {"b": 1}, "2099-01-01": {"a": 2}}
+    assert thaw(store.read_student("a")) == {"2020-01-02": {"a": 1}, "2099-01-01": {"a": 2}}
+    sig = store.signature()
+    store.write_dates({"2020-03-04": None}).result()
+    assert store.signature() != sig
+    assert "2020-03-04" not in store.read_all()
+    # 다시 돌려도 이미 옮긴 날짜는 그대로
+    assert archive_old("t-arch", horizon_days=30) == 0
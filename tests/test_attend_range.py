@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.paths import EXTRA_PATH, STU_PATH, WEEKEND_SLOTS_PATH
+from core.storage import load_copy, save_atomic
+from routes.api_attend import bp_api_attend
+
+MON, TUE = "2031-07-07", "2031-07-08"
+
+
+@pytest.fixture
+def client(feed):
+    students = [s for s in load_copy(STU_PATH) if s.get("id") not in ("ar1", "ar2")]
+    save_atomic(STU_PATH, students + [{"id": "ar1", "name": "월요일", "day1": "월"}, {"id": "ar2", "name": "화요일", "day2": "화"}])
+    save_atomic(EXTRA_PATH, dict(load_copy(EXTRA_PATH), **{TUE: ["ar1"]}))
+    save_atomic(WEEKEND_SLOTS_PATH, dict(load_copy(WEEKEND_SLOTS_PATH), **{MON: {"ar1": "10:00"}}))
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_attend)
+    app.test_client().post("/api/absent/patch", json={"date": TUE, "sid": "ar2"})
+    return app.test_client()
+
+
+def test_range_days(client):
+    r = client.get(f"/api/attend-range?start={MON}&end={TUE}")
+    assert r.status_code == 200
+    body = r.get_json()
+    assert (body["start"], body["end"], sorted(body["days"])) == (MON, TUE, [MON, TUE])
+
+    mon, tue = body["days"][MON], body["days"][TUE]
+    assert "ar1" in mon["regular"] and "ar2" not in mon["regular"]
+    assert mon["slots"] == {"ar1": "10:00"} and tue["slots"] == {}
+    # 화: ar2 정규지만 결석, ar1 보강
+    assert "ar2" in tue["regular"] and tue["extra"] == ["ar1"] and "ar2" in tue["absent"]
+    assert tue["count"] == len(tue["regular"]) - 1 + len(tue["extra"])
+
+
+def test_range_etag(client):
+    url = f"/api/attend-range?start={MON}&end={TUE}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize("qs", [
+    "", f"start={MON}", f"start={TUE}&end={MON}", f"start=2031-07-01&end=2031-09-01", "start=x&end=y",
+])
+def test_bad_range_is_400(client, qs):
+    assert client.get(f"/api/attend-range?{qs}").status_code == 400
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import core.autoassign
+from core.autoassign import AutoAssigner
+from core.datestore import get_store
+from core.locks import LockManager
+from core.paths import STU_PATH, VID_PATH
+from core.storage import load_copy, save_atomic, thaw
+
+CUR = "자동배정-테스트"
+
+
+@pytest.fixture
+def assigner(feed, monkeypatch):
+    stu = [s for s in load_copy(STU_PATH) if s.get("curriculum") != CUR]
+    save_atomic(STU_PATH, stu + [{"id": "aa1", "name": "배정", "curriculum": CUR, "subCurriculum": ""}])
+    vids = [v for v in load_copy(VID_PATH) if v.get("curriculum") != CUR]
+    save_atomic(VID_PATH, vids + [
+        {"mid": f"aa-m{i}", "chapter": i, "curriculum": CUR, "subCurriculum": ""} for i in (1, 2, 3)
+    ])
+    today = {"value": "2032-01-05"}
+    monkeypatch.setattr(core.autoassign, "today_kst_iso", lambda: today["value"])
+    return AutoAssigner(), today
+
+
+def test_run_assigns_today_and_is_idempotent(assigner):
+    aa, today = assigner
+    assert aa.run("test")
+    assert thaw(get_store("updates").read_date("2032-01-05"))["aa1"] == ["aa-m1", "aa-m2"]
+    # 입력이 그대로면 아무것도 안 함
+    assert not aa.run("test")
+    assert aa.stats()["skipped"] == 1
+
+
+def test_rollover_assigns_the_new_day(assigner):
+    aa, today = assigner
+    aa.run("test")
+    assert aa.done_date == "2032-01-05"
+
+    today["value"] = "2032-01-06"
+    assert aa.run("rollover")
+    assert aa.done_date == "2032-01-06"
+    assert thaw(get_store("updates").read_date("2032-01-06"))["aa1"] == ["aa-m1", "aa-m2"]
+    # 전날 배정은 그대로
+    assert thaw(get_store("updates").read_date("2032-01-05"))["aa1"] == ["aa-m1", "aa-m2"]
+
+
+def test_try_claim_is_sticky_per_process(tmp_path):
+    locks = LockManager(tmp_path)
+    assert locks.try_claim("leader")
+    assert locks.try_claim("leader")
+    # 다른 프로세스는 못 잡음 (flock 은 프로세스 단위)
+    code = (
+        "import sys; from core.locks import LockManager; "
+        f"sys.exit(0 if LockManager({str(tmp_path)!r}).try_claim('leader') else 3)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 3
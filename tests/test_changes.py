@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import core.changes
+from core.changes import ChangeFeed
+
+
+def test_since_returns_keys_after_seq(tmp_path):
+    feed = ChangeFeed(tmp_path / "changes.jsonl")
+    start = feed.last_seq()
+    feed.record("attendance", [("2026-10-18", "a")])
+    mid = feed.record("attendance", [("2026-10-18", "b"), ("2026-10-19", None)])
+
+    out = feed.since(start)
+    assert not out["reset"]
+    assert out["seq"] == mid
+    assert [(c["doc"], c["date"], c["sid"]) for c in out["changes"]] == [
+        ("attendance", "2026-10-18", "a"), ("attendance", "2026-10-18", "b"), ("attendance", "2026-10-19", None),
+    ]
+    assert feed.since(mid)["changes"] == []
+
+
+def test_same_key_reported_once(tmp_path):
+    feed = ChangeFeed(tmp_path / "changes.jsonl")
+    start = feed.last_seq()
+    feed.record("logs", [("2026-10-18", "a")])
+    last = feed.record("logs", [("2026-10-18", "a")])
+    changes = feed.since(start)["changes"]
+    assert len(changes) == 1 and changes[0]["seq"] == last
+
+
+def test_since_below_floor_resets_after_trim(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.changes, "CHANGES_MAX_BYTES", 2000)
+    feed = ChangeFeed(tmp_path / "changes.jsonl")
+    start = feed.last_seq()
+    for i in range(100):
+        feed.record("logs", [("2026-10-18", f"s{i}")])
+
+    out = feed.since(start)
+    assert out["reset"] and out["changes"] == []
+    last, reset, keys = feed.keys_since(start)
+    assert reset and keys == []
+    # 새 seq 부터는 다시 정상
+    assert not feed.since(out["seq"])["reset"]
+
+
+def test_seq_survives_reopen(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    last = ChangeFeed(path).record("logs", [("2026-10-18", "a")])
+    again = ChangeFeed(path)
+    assert again.last_seq() == last
+    assert again.record("logs", [("2026-10-18", "b")]) == last + 1
+
+
+def test_whole_document_posts_record_changed_keys_only(feed):
+    from flask import Flask
+    from routes.api_attend import bp_api_attend
+    from routes.api_basic import bp_api_basic
+
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_basic)
+    app.register_blueprint(bp_api_attend)
+    client = app.test_client()
+
+    prog = client.get("/api/progress").get_json()
+    prog["2031-07-01"] = {"p1": {"m1": "done"}, "p2": {"m1": "done"}}
+    client.post("/api/progress", json=prog)
+    start = feed.last_seq()
+    prog["2031-07-01"]["p2"] = {"m1": "skip"}
+    prog["2031-07-02"] = {"p3": {"m2": "done"}}
+    assert client.post("/api/progress", json=prog).status_code == 204
+
+    absent = client.get("/api/absent").get_json()
+    absent["by_date"]["2031-07-03"] = ["p1"]
+    client.post("/api/absent", json=absent)
+
+    # 라우트가 깨운 자동배정 스케줄러의 updates 기록은 빼고 봄
+    out = [c for c in feed.since(start)["changes"] if c["doc"] in ("progress", "absent")]
+    assert [(c["doc"], c["date"], c["sid"]) for c in out] == [
+        ("progress", "2031-07-01", "p2"), ("progress", "2031-07-02", "p3"), ("absent", "2031-07-03", None),
+    ]
+    assert out[0]["value"] == {"m1": "skip"}
+    assert out[2]["value"] == ["p1"]
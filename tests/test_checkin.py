@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.paths import STU_PATH
+from core.storage import load_copy, save_atomic
+from routes.api_attend import bp_api_attend
+from routes.api_todaymeta import bp_api_todaymeta
+
+D = "2031-08-04"
+
+
+@pytest.fixture
+def client(feed):
+    students = [s for s in load_copy(STU_PATH) if not str(s.get("id")).startswith("ci")]
+    save_atomic(STU_PATH, students + [{"id": f"ci{i}", "name": f"체크{i}"} for i in range(1, 5)])
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_attend)
+    app.register_blueprint(bp_api_todaymeta)
+    return app.test_client()
+
+
+def _get(client, doc, date):
+    return client.get(f"/api/{doc}?date={date}").get_json()
+
+
+def test_checkin_marks_attendance_and_first_time(client):
+    r = client.post("/api/checkin", json={"sid": "ci1", "ts": f"{D}T15:02:00"})
+    body = r.get_json()
+    assert r.status_code == 200 and body["ok"]
+    assert body["results"] == [{"ok": True, "sid": "ci1", "date": D, "time": "15:02", "status": "checked_in"}]
+    assert body["days"][D]["checkedIn"] == ["ci1"] and body["days"][D]["offRoster"] == ["ci1"]
+
+    # 다시 찍어도 등원시간은 첫 체크인 그대로
+    again = client.post("/api/checkin", json={"sid": "ci1", "ts": f"{D}T15:40:00"}).get_json()
+    assert again["results"][0]["status"] == "duplicate" and again["results"][0]["time"] == "15:02"
+    assert _get(client, "attendance", D)["ci1"] == 1
+    assert _get(client, "arrive-time", D)["ci1"] == "15:02"
+
+
+def test_offline_batch_uses_earliest_time(client):
+    d = "2031-08-05"
+    r = client.post("/api/checkin", json={"items": [
+        {"sid": "ci2", "ts": f"{d}T16:30:00"}, {"sid": "ci2", "ts": f"{d}T16:05:00"}, {"sid": "ci3", "ts": f"{d}T16:10:00"},
+    ]})
+    results = r.get_json()["results"]
+    assert [x["status"] for x in results] == ["duplicate", "checked_in", "checked_in"]
+    assert _get(client, "arrive-time", d) == {"ci2": "16:05", "ci3": "16:10"}
+
+
+def test_already_present_gets_arrive_time(client):
+    d = "2031-08-06"
+    client.post("/api/attendance/patch", json={"date": d, "sid": "ci4"})
+    r = client.post("/api/checkin", json=[{"sid": "ci4", "ts": f"{d}T17:00:00"}])
+    assert r.get_json()["results"][0]["status"] == "duplicate"
+    assert _get(client, "arrive-time", d) == {"ci4": "17:00"}
+
+
+def test_bad_items_are_reported(client):
+    body = client.post("/api/checkin", json={"items": [
+        {"sid": "nobody", "ts": f"{D}T15:00:00"}, {"sid": "ci1", "ts": "not a time"}, {"ts": f"{D}T15:00:00"},
+    ]}).get_json()
+    assert not body["ok"]
+    assert [x["error"] for x in body["results"]] == ["unknown sid", "bad ts", "missing sid"]
+
+
+def test_non_list_body_is_400(client):
+    assert client.post("/api/checkin", json="ci1").status_code == 400
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from core.datestore import DateStore, JsonDateStore, PartitionedDateStore, parse_date_slice
+from core.storage import thaw
+
+
+def _json(tmp_path):
+    return JsonDateStore("t-json", tmp_path / "doc.json")
+
+
+def _partitioned(tmp_path):
+    (tmp_path / "parts").mkdir()
+    return PartitionedDateStore("t-parts", tmp_path / "parts")
+
+
+BACKENDS = [_json, _partitioned]
+
+
+@pytest.fixture(params=BACKENDS, ids=lambda f: f.__name__.strip("_"))
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def test_write_dates_round_trip(store):
+    days = {
+        "2026-09-30": {"a": {"notes": "x"}},
+        "2026-10-01": {"a": {"notes": "y"}, "b": {"done": True}},
+        "2026-10-18": {"b": {"notes": "z"}},
+    }
+    store.write_dates(days).result()
+    assert thaw(store.read_all()) == days
+    assert thaw(store.read_date("2026-10-01")) == days["2026-10-01"]
+    assert thaw(store.read_range("2026-10-01", "2026-10-31")) == {
+        d: v for d, v in days.items() if d >= "2026-10-01"
+    }
+    assert thaw(store.read_student("b")) == {
+        "2026-10-01": {"b": {"done": True}}, "2026-10-18": {"b": {"notes": "z"}},
+    }
+    sl = parse_date_slice({"start": "2026-10-01", "sids": "a"})
+    assert thaw(store.read_slice(sl)) == {"2026-10-01": {"a": {"notes": "y"}}}
+
+
+def test_write_dates_replaces_only_given_dates(store):
+    store.write_dates({"2026-10-01": {"a": 1}, "2026-10-02": {"a": 1}}).result()
+    sig = store.signature()
+    store.write_dates({"2026-10-02": {"b": 1}, "2026-10-01": None}).result()
+    assert thaw(store.read_all()) == {"2026-10-02": {"b": 1}}
+    assert store.signature() != sig
+
+
+def test_replace_all(store):
+    store.write_dates({"2026-10-01": {"a": 1}}).result()
+    store.replace_all({"2026-11-05": {"c": 1}})
+    assert thaw(store.read_all()) == {"2026-11-05": {"c": 1}}
+
+
+def test_read_views_are_frozen(store):
+    store.write_dates({"2026-10-01": {"a": 1}}).result()
+    with pytest.raises(TypeError):
+        store.read_all()["2026-10-01"]["a"] = 2
+
+
+def test_incomplete_store_fails_at_construction():
+    class Half(DateStore):
+        def signature(self):
+            return None
+
+    with pytest.raises(TypeError):
+        Half()
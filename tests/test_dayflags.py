@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.dayflags import norm_day
+from routes.api_attend import bp_api_attend
+
+
+@pytest.fixture
+def client(feed):
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_attend)
+    return app.test_client()
+
+
+def test_norm_day_keeps_present_keys():
+    day = {"a": 1, "b": "Y", "c": 2, "d": "2031-06-01T09:00", "e": False, "f": "0", "g": None, " ": 1}
+    assert norm_day(day) == {"a": 1, "b": 1, "c": 1, "d": 1}
+
+
+def test_post_keeps_legacy_truthy_values(client):
+    r = client.post("/api/attendance", json={"2031-06-01": {"a": "Y", "b": 2, "c": "false"}})
+    assert r.status_code == 200
+    assert client.get("/api/attendance?date=2031-06-01").get_json() == {"a": 1, "b": 1}
+
+
+def test_patch_on_off(client):
+    r = client.post("/api/attendance/patch", json={"ops": [
+        {"date": "2031-06-02", "sid": "a"}, {"date": "2031-06-02", "sid": "b", "on": True},
+    ]})
+    assert r.status_code == 200
+    client.post("/api/attendance/patch", json={"date": "2031-06-02", "sid": "a", "off": True})
+    assert client.get("/api/attendance?date=2031-06-02").get_json() == {"b": 1}
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import types
+
+import pytest
+from flask import Flask
+
+import core.dayflags
+import routes.api_attend
+from core.datestore import JsonDateStore
+
+
+class _Today:
+    value = dt.date(2026, 10, 17)
+
+
+class _FakeDate(dt.date):
+    @classmethod
+    def today(cls):
+        return _Today.value
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / "attendance.json"
+    path.write_text(json.dumps({"2026-10-17": {"a": 1}, "2026-10-18": {"b": 1}}), "utf-8")
+    store = JsonDateStore("t-attendance", path)
+    monkeypatch.setattr(routes.api_attend, "get_store", lambda doc: store)
+    monkeypatch.setattr(core.dayflags, "get_store", lambda doc: store)
+    monkeypatch.setattr(routes.api_attend, "dt", types.SimpleNamespace(
+        date=_FakeDate, datetime=dt.datetime, timedelta=dt.timedelta,
+    ))
+    monkeypatch.setattr(_Today, "value", dt.date(2026, 10, 17))
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_attend.bp_api_attend)
+    return app.test_client()
+
+
+def test_unchanged_doc_answers_304(client):
+    r = client.get("/api/attendance?date=2026-10-17")
+    assert r.status_code == 200 and r.get_json() == {"a": 1}
+    again = client.get("/api/attendance?date=2026-10-17", headers={"If-None-Match": r.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_default_date_etag_goes_stale_after_midnight(client):
+    r = client.get("/api/attendance")
+    assert r.get_json() == {"a": 1}
+    tag = r.headers["ETag"]
+    assert client.get("/api/attendance", headers={"If-None-Match": tag}).status_code == 304
+
+    # 저장소는 그대로, 날짜만 넘어감 → 같은 URL 이라도 어제 ETag 로 304 나면 안 됨
+    _Today.value = dt.date(2026, 10, 18)
+    r2 = client.get("/api/attendance", headers={"If-None-Match": tag})
+    assert r2.status_code == 200
+    assert r2.get_json() == {"b": 1}
+    assert r2.headers["ETag"] != tag
+
+
+def test_dates_do_not_share_etags(client):
+    a = client.get("/api/contact?date=2026-10-17").headers["ETag"]
+    b = client.get("/api/contact?date=2026-10-18").headers["ETag"]
+    assert a != b
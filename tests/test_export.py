@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.logjournal import logs_journal
+from core.paths import STU_PATH
+from core.storage import load_copy, save_atomic
+from routes.api_export import bp_api_export
+
+
+@pytest.fixture
+def client(feed):
+    students = [s for s in load_copy(STU_PATH) if s.get("id") != "ex1"]
+    save_atomic(STU_PATH, students + [{"id": "ex1", "name": "홍길동", "curriculum": "중2"}])
+    logs_journal.append([("2031-05-06", "ex1", {"done": True, "notes": "집중 잘함"})])
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_export)
+    return app.test_client()
+
+
+def test_txt_export_for_date(client):
+    r = client.get("/api/logs/export?date=2031-05-06")
+    assert r.status_code == 200
+    text = r.get_data(as_text=True)
+    assert "(5/6) 홍길동" in text and "특이사항 : 집중 잘함" in text
+
+
+def test_custom_template(client):
+    r = client.get("/api/logs/export", query_string={"date": "2031-05-06", "template": "{name}|{md}\n"})
+    assert r.get_data(as_text=True) == "홍길동|5/6\n"
+
+
+@pytest.mark.parametrize("template", [
+    "{name.__class__}", "{homework[0]}", "{name!r}", "{name:>40}", "{}", "{nope}", "{name",
+])
+def test_template_rejects_anything_but_plain_fields(client, template):
+    r = client.get("/api/logs/export", query_string={"date": "2031-05-06", "template": template})
+    assert r.status_code == 400
+
+
+def test_csv_export(client):
+    r = client.get("/api/logs/export?date=2031-05-06&format=csv")
+    lines = r.get_data(as_text=True).lstrip("\ufeff").splitlines()
+    assert lines[0].startswith("date,sid,name")
+    assert lines[1].startswith("2031-05-06,ex1,홍길동")
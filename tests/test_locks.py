@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core.locks import LockManager
+
+
+@pytest.fixture
+def locks(tmp_path):
+    return LockManager(tmp_path)
+
+
+def test_reentrant_exclusive_and_shared(locks):
+    with locks.exclusive("doc"):
+        with locks.exclusive("doc"):
+            with locks.shared("doc"):
+                assert locks.held("doc")
+        assert locks.held("doc")
+    assert not locks.held("doc")
+
+
+def test_shared_to_exclusive_upgrade_raises(locks):
+    with locks.shared("doc"):
+        with pytest.raises(RuntimeError, match="upgrade"):
+            with locks.exclusive("doc"):
+                pass
+        # 실패한 승격이 보유 상태를 망가뜨리지 않음
+        assert locks.held("doc")
+    assert not locks.held("doc")
+
+
+def test_exclusive_blocks_other_threads(locks):
+    order = []
+
+    def other():
+        with locks.exclusive("doc"):
+            order.append("other")
+
+    with locks.exclusive("doc"):
+        t = threading.Thread(target=other)
+        t.start()
+        time.sleep(0.1)
+        order.append("owner")
+    t.join(2)
+    assert order == ["owner", "other"]
+
+
+def test_shared_holders_overlap(locks):
+    inside = threading.Barrier(2, timeout=2)
+
+    def reader():
+        with locks.shared("doc"):
+            inside.wait()
+
+    ts = [threading.Thread(target=reader) for _ in range(2)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join(3)
+    assert not inside.broken
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+
+from core.datestore import JsonDateStore
+from core.logjournal import LogJournal
+
+
+@pytest.fixture
+def journal(tmp_path, feed):
+    (tmp_path / "journal").mkdir()
+    return LogJournal(JsonDateStore("t-logs", tmp_path / "logs.json"), tmp_path / "journal")
+
+
+def test_submit_group_commit(journal):
+    futs = [journal.submit([("2026-10-18", f"s{i}", {"n": i})]) for i in range(20)]
+    assert sum(f.result(5) for f in futs) == 20
+    assert len(journal.read()["2026-10-18"]) == 20
+    st = journal.commit_stats()
+    assert st["ops"] == 20 and st["commits"] >= 1
+
+
+def test_short_os_write_keeps_lines_whole(journal, monkeypatch):
+    real = os.write
+    monkeypatch.setattr(os, "write", lambda fd, b: real(fd, bytes(b[:5])))
+    journal.append([("2026-10-18", "a", {"notes": "long enough to need several writes"})])
+    monkeypatch.setattr(os, "write", real)
+    assert journal.read()["2026-10-18"]["a"]["notes"].startswith("long")
+
+
+def test_concurrent_submits_share_commits(journal):
+    futs = []
+    mu = threading.Lock()
+
+    def worker(k):
+        for i in range(10):
+            f = journal.submit([("2026-10-19", f"w{k}-{i}", {"n": i})])
+            with mu:
+                futs.append(f)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(f.result(5) for f in futs) == 40
+    assert len(journal.read()["2026-10-19"]) == 40
+    st = journal.commit_stats()
+    assert st["ops"] == 40 and st["commits"] <= 40
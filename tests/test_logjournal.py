@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from core.datestore import JsonDateStore
+from core.logjournal import LogJournal, merge_entry_safe
+from core.storage import thaw
+
+
+@pytest.fixture
+def journal(tmp_path, feed):
+    (tmp_path / "journal").mkdir()
+    return LogJournal(JsonDateStore("t-logs", tmp_path / "logs.json"), tmp_path / "journal")
+
+
+def _segments(journal):
+    return [name for _, name in journal._segments()]
+
+
+def test_append_and_fold(journal, feed):
+    start = feed.last_seq()
+    assert journal.append([("2026-10-18", "a", {"notes": "hi"})]) == 1
+    journal.append([("2026-10-18", "a", {"done": True}), ("2026-10-17", "b", {"notes": "x"})])
+
+    view = journal.read()
+    assert thaw(view) == {
+        "2026-10-18": {"a": {"notes": "hi", "done": True}},
+        "2026-10-17": {"b": {"notes": "x"}},
+    }
+    # 체크포인트(logs.json)는 그대로 — 쓰기는 세그먼트에만
+    assert thaw(journal.store.read_all()) == {}
+    _, _, keys = feed.keys_since(start, ["t-logs"])
+    assert set(keys) == {("t-logs", ("2026-10-18", "a")), ("t-logs", ("2026-10-17", "b"))}
+
+
+def test_fold_is_incremental_and_safe_merge(journal):
+    journal.append([("2026-10-18", "a", {"notes": "keep"})])
+    first = journal.read()
+    journal.append([("2026-10-18", "a", {"notes": ""})])  # 빈 값은 기존 값을 못 덮음
+    journal.append([("2026-10-18", "a", {"__clear": ["notes"], "topic": "t"})])
+    assert thaw(journal.read()) == {"2026-10-18": {"a": {"topic": "t"}}}
+    assert thaw(first) == {"2026-10-18": {"a": {"notes": "keep"}}}
+
+
+def test_partial_trailing_line_is_deferred(journal):
+    journal.append([("2026-10-18", "a", {"n": 1})])
+    seg = journal._seg_path(_segments(journal)[-1])
+    with open(seg, "ab") as f:
+        f.write(b'{"d":"2026-10-18","s":"b","e":{"n"')
+    assert "b" not in journal.read()["2026-10-18"]
+
+
+def test_compaction_folds_segments_into_checkpoint(journal):
+    journal.append([("2026-10-18", "a", {"notes": "one"})])
+    journal.append([("2026-10-18", "b", {"notes": "two"})])
+    before = thaw(journal.read())
+
+    assert journal.compact(force=True) == 2
+    assert thaw(journal.store.read_all()) == before
+    assert thaw(journal.read()) == before
+    # 닫힌 세그먼트는 지워지고 새 (빈) 세그먼트만 남음
+    segs = _segments(journal)
+    assert len(segs) == 1 and os.path.getsize(journal._seg_path(segs[0])) == 0
+    assert journal.commit_stats()["compactions"] == 1
+
+    journal.append([("2026-10-18", "a", {"done": True})])
+    assert thaw(journal.read())["2026-10-18"]["a"] == {"notes": "one", "done": True}
+    assert journal.compact(force=True) == 1
+
+
+def test_compaction_replay_is_idempotent():
+    entry = {"notes": "x", "done": True}
+    assert merge_entry_safe(merge_entry_safe({}, entry), entry) == entry
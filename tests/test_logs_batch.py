@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.logjournal import logs_journal
+from routes.api_basic import bp_api_basic
+
+
+@pytest.fixture
+def client(feed):
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_basic)
+    return app.test_client()
+
+
+def test_batch_applies_in_order_and_reports_each_op(client, feed):
+    start = feed.last_seq()
+    r = client.post("/api/logs/patch-batch", json={"ops": [
+        {"date": "2031-04-01", "sid": "lb1", "entry": {"notes": "a"}},
+        {"date": "2031-04-01", "sid": "lb1", "entry": {"done": True}},
+        {"date": "bad", "sid": "lb1", "entry": {}},
+        {"date": "2031-04-02", "sid": "lb2", "entry": {"notes": "b"}},
+    ]})
+    body = r.get_json()
+    assert r.status_code == 200 and body["ok"] is False and body["applied"] == 3
+    assert [x["ok"] for x in body["results"]] == [True, True, False, True]
+    assert body["results"][2]["error"] == "bad date"
+
+    logs = logs_journal.read()
+    assert logs["2031-04-01"]["lb1"] == {"notes": "a", "done": True}
+    assert logs["2031-04-02"]["lb2"] == {"notes": "b"}
+    keys = {(c["date"], c["sid"]) for c in feed.since(start)["changes"] if c["doc"] == "logs"}
+    assert keys == {("2031-04-01", "lb1"), ("2031-04-02", "lb2")}
+
+
+def test_unchanged_ops_are_not_written(client):
+    client.post("/api/logs/patch-batch", json=[{"date": "2031-04-03", "sid": "lb3", "entry": {"notes": "x"}}])
+    sig = logs_journal.signature()
+    body = client.post("/api/logs/patch-batch", json=[
+        {"date": "2031-04-03", "sid": "lb3", "entry": {"notes": "x"}},
+        {"date": "2031-04-03", "sid": "lb3", "entry": {"notes": ""}},  # 빈 값은 기존 값을 못 덮음
+    ]).get_json()
+    assert body["applied"] == 0 and [x["changed"] for x in body["results"]] == [False, False]
+    assert logs_journal.signature() == sig
+
+
+def test_clear_and_bad_body(client):
+    client.post("/api/logs/patch-batch", json=[{"date": "2031-04-04", "sid": "lb4", "entry": {"notes": "x", "topic": "t"}}])
+    client.post("/api/logs/patch-batch", json=[{"date": "2031-04-04", "sid": "lb4", "__clear": ["notes"]}])
+    assert logs_journal.read()["2031-04-04"]["lb4"] == {"topic": "t"}
+    assert client.post("/api/logs/patch-batch", json={"nope": 1}).status_code == 400
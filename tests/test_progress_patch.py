@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.datestore import get_store
+from core.progressview import latest_progress
+from core.storage import etag_of, thaw
+from routes.api_basic import bp_api_basic
+
+
+@pytest.fixture
+def client(feed):
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_basic)
+    return app.test_client()
+
+
+def _patch(client, *ops):
+    return client.post("/api/progress/patch", json={"ops": list(ops)}).get_json()
+
+
+def test_patch_merges_into_the_date(client, feed):
+    start = feed.last_seq()
+    body = _patch(
+        client,
+        {"date": "2031-08-01", "sid": "pp1", "mid": "m1", "state": "done"},
+        {"date": "2031-08-01", "sid": "pp1", "mid": "m2", "state": "interrupted"},
+        {"date": "2031-08-01", "sid": "pp2", "mid": "m1", "state": "done"},
+    )
+    assert body["ok"] and body["applied"] == 3
+    assert body["version"] == etag_of(get_store("progress").signature())
+    assert thaw(get_store("progress").read_date("2031-08-01")) == {
+        "pp1": {"m1": "done", "m2": "interrupted"}, "pp2": {"m1": "done"},
+    }
+    keys = {(c["date"], c["sid"]) for c in feed.since(start)["changes"] if c["doc"] == "progress"}
+    assert keys == {("2031-08-01", "pp1"), ("2031-08-01", "pp2")}
+
+
+def test_same_state_is_not_a_change_and_null_deletes(client):
+    _patch(client, {"date": "2031-08-02", "sid": "pp3", "mid": "m1", "state": "done"},
+           {"date": "2031-08-02", "sid": "pp3", "mid": "m2", "state": "done"})
+    body = _patch(client, {"date": "2031-08-02", "sid": "pp3", "mid": "m1", "state": "done"})
+    assert body["applied"] == 0 and body["results"][0]["changed"] is False
+
+    _patch(client, {"date": "2031-08-02", "sid": "pp3", "mid": "m2", "state": None})
+    assert thaw(get_store("progress").read_date("2031-08-02")) == {"pp3": {"m1": "done"}}
+
+
+def test_latest_view_follows_patches(client):
+    _patch(client, {"date": "2031-08-03", "sid": "pp4", "mid": "m1", "state": "done"})
+    _patch(client, {"date": "2031-08-04", "sid": "pp4", "mid": "m1", "state": "interrupted"})
+    assert latest_progress.student("pp4")["m1"] == "interrupted"
+    # 최신 날짜 값을 지우면 그 전 날짜 값으로
+    _patch(client, {"date": "2031-08-04", "sid": "pp4", "mid": "m1", "state": None})
+    assert latest_progress.student("pp4")["m1"] == "done"
+
+
+def test_bad_ops(client):
+    body = _patch(client, {"date": "2031-08-05", "sid": "pp5", "mid": "m1"}, {"date": "x", "sid": "a", "mid": "b", "state": "done"})
+    assert body["ok"] is False and [r["error"] for r in body["results"]] == ["missing date/sid/mid/state", "bad date"]
+    assert client.post("/api/progress/patch", json={"ops": "nope"}).status_code == 400
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from core.datestore import JsonDateStore
+from core.progressevents import TransitionDateStore, TransitionIndex, dedup_days
+from core.progressview import LatestProgress
+from core.storage import thaw
+
+D1, D2, D3, D4 = "2031-09-01", "2031-09-02", "2031-09-03", "2031-09-04"
+
+
+@pytest.fixture
+def store(tmp_path, feed):
+    return TransitionDateStore(JsonDateStore("t-progress", tmp_path / "progress.json"))
+
+
+@pytest.fixture
+def view(store, tmp_path):
+    lp = LatestProgress(store, tmp_path / "latest.json")
+    lp.get()
+    return lp
+
+
+def _write(store, view, days):
+    with store.lock():
+        before, old = store.signature(), store.read_all()
+        store.write_dates(days).result()
+        view.apply(before, old, store.read_all())
+
+
+def _as_of(store, date):
+    return TransitionIndex(store.read_all()).snapshot(date)
+
+
+def _rebuilt(store, tmp_path):
+    return thaw(LatestProgress(store, tmp_path / "rebuilt.json").get())
+
+
+@pytest.fixture
+def history(store, view):
+    # 예전 클라이언트처럼 날짜마다 학생 상태 전체를 저장 (b 는 D4 에만)
+    _write(store, view, {D1: {"a": {"m1": "done", "m2": "none"}}})
+    _write(store, view, {D2: {"a": {"m1": "done", "m2": "done"}}})
+    _write(store, view, {D3: {"a": {"m1": "done", "m2": "done"}}})
+    _write(store, view, {D4: {"b": {"m1": "done"}}})
+    return store
+
+
+def test_only_transitions_are_stored(history):
+    assert thaw(history.read_all()) == {
+        D1: {"a": {"m1": "done", "m2": "none"}}, D2: {"a": {"m2": "done"}}, D3: {"a": {}}, D4: {"b": {"m1": "done"}},
+    }
+
+
+def test_edit_past_date_keeps_later_dates(history, view, tmp_path):
+    _write(history, view, {D1: {"a": {"m1": "interrupted", "m2": "none"}}})
+
+    assert _as_of(history, D1)["a"] == {"m1": "interrupted", "m2": "none"}
+    # D2/D3 스냅샷엔 m1=done 이 있었음 → 그대로
+    assert _as_of(history, D2)["a"] == {"m1": "done", "m2": "done"}
+    assert _as_of(history, D3)["a"] == {"m1": "done", "m2": "done"}
+    assert thaw(history.read_date(D2)) == {"a": {"m1": "done", "m2": "done"}}
+    assert thaw(view.get()) == _rebuilt(history, tmp_path) == {"a": {"m1": "done", "m2": "done"}, "b": {"m1": "done"}}
+
+
+def test_delete_past_date_keeps_later_dates(history, view, tmp_path):
+    _write(history, view, {D2: None})
+
+    assert D2 not in history.read_all()
+    assert _as_of(history, D3)["a"] == {"m1": "done", "m2": "done"}
+    assert thaw(view.get()) == _rebuilt(history, tmp_path)
+
+
+def test_edit_without_later_record_carries_forward(store, view, tmp_path):
+    _write(store, view, {D1: {"a": {"m1": "none"}}})
+    _write(store, view, {D3: {"b": {"m1": "done"}}})
+    _write(store, view, {D1: {"a": {"m1": "done"}}})
+
+    # D3 에 a 기록이 없으니 옛 값을 다시 적을 날짜도 없음
+    assert thaw(store.read_date(D3)) == {"b": {"m1": "done"}}
+    assert thaw(view.get()) == _rebuilt(store, tmp_path) == {"a": {"m1": "done"}, "b": {"m1": "done"}}
+
+
+def test_later_dates_get_change_feed_keys(history, view, feed):
+    start = feed.last_seq()
+    _write(history, view, {D1: {"a": {"m1": "interrupted", "m2": "none"}}})
+    # 라우트는 자기가 고친 D1 키를 기록, 옛 값을 다시 적은 D2 는 저장소가 기록
+    assert [(c["doc"], c["date"], c["sid"]) for c in feed.since(start)["changes"]] == [("t-progress", D2, "a")]
+
+
+def test_dedup_days_keeps_student_marker():
+    days = {D1: {"a": {"m1": "done"}}, D2: {"a": {"m1": "done"}}}
+    assert dedup_days(days) == {D1: {"a": {"m1": "done"}}, D2: {"a": {}}}
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from flask import Flask
+
+from core.paths import EXTRA_PATH, STU_PATH
+from core.roster import RosterIndex
+from core.storage import load_copy, save_atomic
+from routes.api_attend import bp_api_attend
+
+WED = "2031-11-05"
+
+
+@pytest.fixture
+def client(feed):
+    students = [s for s in load_copy(STU_PATH) if not str(s.get("id")).startswith("rs")]
+    save_atomic(STU_PATH, students + [
+        {"id": "rs3", "name": "보강"},
+        {"id": "rs1", "name": "수1", "day1": "수 16:00"},
+        {"id": "rs4", "name": "결석", "day3": "수"},
+        {"id": "rs2", "name": "수2", "day1": "월", "day2": "수"},
+    ])
+    save_atomic(EXTRA_PATH, dict(load_copy(EXTRA_PATH), **{WED: ["rs3", "rs1"]}))
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_attend)
+    app.test_client().post("/api/absent/patch", json={"date": WED, "sid": "rs4"})
+    return app.test_client()
+
+
+def test_attend_is_regular_then_extra_minus_absent(client):
+    r = client.get(f"/api/attend?date={WED}")
+    assert r.status_code == 200
+    # 정규(students 순서) 다음 보강, 정규이면서 보강인 rs1 은 한 번만
+    assert [s["id"] for s in r.get_json() if s["id"].startswith("rs")] == ["rs1", "rs2", "rs3"]
+
+
+def test_index_rebuilt_only_when_docs_change(client):
+    index = RosterIndex()
+    day = dt.date.fromisoformat(WED)
+    index.sids_for_date(day)
+    built = index.rebuilds
+    index.sids_for_date(day)
+    assert index.rebuilds == built
+
+    save_atomic(EXTRA_PATH, dict(load_copy(EXTRA_PATH), **{WED: ["rs3"]}))
+    assert "rs3" in index.sids_for_date(day)
+    assert index.rebuilds == built + 1
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from core.sqlstore import SqliteDateStore, _Db
+from core.storage import thaw
+# DateStore 공통 동작은 test_datestore 케이스를 sqlite 로 한 번 더
+from test_datestore import (  # noqa: F401
+    test_read_views_are_frozen,
+    test_replace_all,
+    test_write_dates_replaces_only_given_dates,
+    test_write_dates_round_trip,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteDateStore("t-sql", _Db(str(tmp_path / "t.db")))
+
+
+def test_progress_goes_to_progress_table(tmp_path):
+    db = _Db(str(tmp_path / "t.db"))
+    store = SqliteDateStore("progress", db)
+    store.write_dates({"2026-10-01": {"a": {"m1": "done", "m2": "skip"}, "b": {}}}).result()
+
+    rows = db.conn().execute("SELECT student_id, video_id, status FROM progress ORDER BY video_id").fetchall()
+    assert rows == [("a", "m1", "done"), ("a", "m2", "skip")]
+    # 빈 학생 기록({}) 도 그대로 돌아옴
+    assert thaw(store.read_date("2026-10-01")) == {"a": {"m1": "done", "m2": "skip"}, "b": {}}
+    assert thaw(store.read_student("a")) == {"2026-10-01": {"a": {"m1": "done", "m2": "skip"}}}
+
+
+def test_signature_changes_per_write(tmp_path):
+    store = SqliteDateStore("t-sql", _Db(str(tmp_path / "t.db")))
+    sig = store.signature()
+    store.write_dates({"2026-10-01": {"a": 1}}).result()
+    assert store.signature() != sig
+    # 같은 파일을 여는 다른 연결(다른 워커)도 같은 값
+    other = SqliteDateStore("t-sql", _Db(str(tmp_path / "t.db")))
+    assert other.signature()[1] == store.signature()[1]
+    assert thaw(other.read_all()) == {"2026-10-01": {"a": 1}}
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+
+from core.storage import FrozenDict, load, save_atomic, thaw
+
+
+def test_cached_value_matches_disk_after_save(tmp_path):
+    path = tmp_path / "doc.json"
+    save_atomic(path, {1: ("a", "b"), "k": [1, 2]})
+
+    cached = load(path)
+    assert isinstance(cached, FrozenDict)
+    # 캐시 값도 JSON 으로 다시 읽은 것과 같아야 함 (int 키 → str, tuple → list)
+    assert thaw(cached) == {"1": ["a", "b"], "k": [1, 2]}
+
+
+def test_load_sees_external_write(tmp_path):
+    path = tmp_path / "doc.json"
+    save_atomic(path, {"a": 1})
+    assert load(path)["a"] == 1
+
+    path.write_text('{"a": 2, "b": 3}', encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    assert thaw(load(path)) == {"a": 2, "b": 3}
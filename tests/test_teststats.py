@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.logjournal import logs_journal
+from core.paths import STU_PATH
+from core.storage import load_copy, save_atomic
+from core import teststats
+from routes.api_tests import bp_api_tests
+
+D1, D2 = "2031-10-06", "2031-10-07"
+
+
+@pytest.fixture
+def client(feed):
+    students = [s for s in load_copy(STU_PATH) if not str(s.get("id")).startswith("ts")]
+    save_atomic(STU_PATH, students + [{"id": "ts1", "name": "통계1", "level": "상"}, {"id": "ts2", "name": "통계2"}])
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_tests)
+    return app.test_client()
+
+
+def _rec(name, score, created, wrong=()):
+    return {"name": name, "score": score, "createdAt": created, "wrong": list(wrong)}
+
+
+def test_stats_follow_feed_updates(client):
+    index = teststats.TestStatsIndex()
+    client.post("/api/tests", json={D1: {"ts1": [_rec("중2 / 일차방정식", "8/10", "t1", [3, 7])]}})
+    first = index.query(D1, D2, include_wrong=True)["일차방정식"]
+    assert (first["count"], first["avg_pct"], first["wrong_freq"]) == (1, 80.0, {"3": 1, "7": 1})
+    assert first["bands"]["상"]["count"] == 1
+
+    client.post("/api/tests", json={D2: {"ts2": [_rec("일차방정식", "6/10", "t2", [3])]}})
+    out = index.query(D1, D2, include_wrong=True)["일차방정식"]
+    assert (out["count"], out["median_pct"], out["min_pct"], out["max_pct"]) == (2, 70.0, 60.0, 80.0)
+    assert out["wrong_freq"] == {"3": 2, "7": 1}
+    assert {b: v["count"] for b, v in out["bands"].items()} == {"상": 1, "하": 1}  # 레벨 없음 → 하
+    # 두 번째 조회는 바뀐 칸만 다시 읽음
+    assert index.stats()["rebuilds"] == 1 and index.stats()["cellUpdates"] >= 1
+
+    assert index.query(D2, D2)["일차방정식"]["count"] == 1
+
+
+def test_same_record_in_logs_and_tests_counted_once(client):
+    d = "2031-10-08"
+    rec = _rec("연립방정식", "9/10", "t3")
+    index = teststats.TestStatsIndex()
+    client.post("/api/tests", json={d: {"ts2": [rec]}})
+    logs_journal.append([(d, "ts2", {"tests": [rec]})])
+    assert index.query(d, d)["연립방정식"]["count"] == 1
+
+
+def test_stats_route_shape(client):
+    d = "2031-10-09"
+    client.post("/api/tests", json={d: {"ts1": [_rec("인수분해", "5/10", "t4")]}})
+    body = client.get(f"/api/tests-stats?start={d}&end={d}").get_json()
+    assert body["range"] == {"start": d, "end": d}
+    assert body["by_test"]["인수분해"]["pct_hist"]["50-59"] == 1
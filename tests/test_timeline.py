@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from core.logjournal import logs_journal
+from routes.api_basic import bp_api_basic
+
+SID = "tl1"
+DATES = [f"2031-02-{d:02d}" for d in range(1, 8)]
+
+
+@pytest.fixture(scope="module")
+def client():
+    logs_journal.append([(d, SID, {"notes": d}) for d in DATES] + [("2031-02-03", "tl-other", {"notes": "x"})])
+    app = Flask(__name__)
+    app.register_blueprint(bp_api_basic)
+    return app.test_client()
+
+
+def test_newest_first_with_cursor(client):
+    page = client.get(f"/api/students/{SID}/timeline?limit=3").get_json()
+    assert [x["date"] for x in page["items"]] == DATES[:-4:-1]
+    assert page["items"][0]["entry"] == {"notes": DATES[-1]}
+
+    seen = [x["date"] for x in page["items"]]
+    while page["next"]:
+        page = client.get(f"/api/students/{SID}/timeline?limit=3&before={page['next']}").get_json()
+        seen += [x["date"] for x in page["items"]]
+    assert seen == DATES[::-1]
+
+
+def test_new_entry_shows_up_and_etag_changes(client):
+    r = client.get(f"/api/students/{SID}/timeline?limit=1")
+    assert client.get(f"/api/students/{SID}/timeline?limit=1",
+                      headers={"If-None-Match": r.headers["ETag"]}).status_code == 304
+    logs_journal.append([("2031-02-20", SID, {"notes": "new"})])
+    r2 = client.get(f"/api/students/{SID}/timeline?limit=1", headers={"If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 200 and r2.get_json()["items"][0]["date"] == "2031-02-20"
+
+
+def test_unknown_student_and_bad_args(client):
+    assert client.get("/api/students/nobody/timeline").get_json() == {"sid": "nobody", "items": [], "next": None}
+    assert client.get(f"/api/students/{SID}/timeline?before=yesterday").status_code == 400
+    assert client.get(f"/api/students/{SID}/timeline?limit=x").status_code == 400
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+from core.videoindex import VideoIndexCache
+
+
+def _cache(tmp_path):
+    path = tmp_path / "videos.json"
+    videos = [{"mid": f"m{i}", "chapter": i, "curriculum": "중2", "subCurriculum": ""} for i in (3, 1, 2, 10)]
+    path.write_text(json.dumps(videos), "utf-8")
+    return VideoIndexCache(path)
+
+
+def test_index_orders_by_chapter(tmp_path):
+    cache = _cache(tmp_path)
+    assert cache.get().mids("중2", "") == ("m1", "m2", "m3", "m10")
+    assert cache.get() is cache.get()
+
+
+def test_cursor_reused_only_for_same_progress_signature(tmp_path):
+    cache = _cache(tmp_path)
+    idx = cache.get()
+    done = {"m1": "done", "m2": "skip"}
+    assert cache.pick(idx, "s1", "중2", "", done, 2, progress_sig=("p", 1)) == ["m3", "m10"]
+    assert cache.stats()["cursors"] == 1
+
+    # 같은 시그니처 → 커서(앞쪽 done/skip 건너뛴 위치)부터 봄
+    assert cache.pick(idx, "s1", "중2", "", {}, 1, progress_sig=("p", 1)) == ["m3"]
+    # 진도가 바뀌면(시그니처 다름) 처음부터 다시
+    assert cache.pick(idx, "s1", "중2", "", {}, 1, progress_sig=("p", 2)) == ["m1"]
+    # 시그니처 없으면 커서 안 씀
+    assert cache.pick(idx, "s1", "중2", "", {}, 1) == ["m1"]
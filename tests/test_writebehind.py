@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from core.storage import all_done, flush_pending, load, save_coalesced, thaw
+
+
+def test_coalesced_writes_keep_last_value(tmp_path):
+    path = tmp_path / "doc.json"
+    futs = [save_coalesced(path, {"n": i}) for i in range(5)]
+    for f in futs:
+        f.result(timeout=5)
+    assert thaw(load(path)) == {"n": 4}
+
+
+def test_pending_value_is_visible_before_flush(tmp_path):
+    path = tmp_path / "doc.json"
+    fut = save_coalesced(path, {"n": 1})
+    # 디스크 반영 전에도 같은 프로세스의 load() 는 새 값
+    assert thaw(load(path)) == {"n": 1}
+    flush_pending(path)
+    fut.result(timeout=5)
+    assert path.exists()
+
+
+def test_failed_write_reaches_every_future(tmp_path):
+    bad = tmp_path / "missing-dir" / "doc.json"
+    futs = [save_coalesced(bad, {"n": i}) for i in range(3)]
+    both = all_done(futs + [save_coalesced(tmp_path / "ok.json", {})])
+    for f in futs:
+        with pytest.raises(OSError):
+            f.result(timeout=5)
+    with pytest.raises(OSError):
+        both.result(timeout=5)
+
+
+def test_all_done_of_nothing_is_done():
+    assert all_done([]).result(timeout=0) is True